@@ -0,0 +1,32 @@
+"""add user_sessions expires_at index
+
+Revision ID: 4c8e2f1a9b73
+Revises: d91eb8885793
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8e2f1a9b73'
+down_revision: Union[str, None] = 'd91eb8885793'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 期限切れセッションの一括削除（expires_at < now）を高速化
+    op.create_index(
+        op.f('ix_user_sessions_expires_at'),
+        'user_sessions',
+        ['expires_at'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_user_sessions_expires_at'), table_name='user_sessions')
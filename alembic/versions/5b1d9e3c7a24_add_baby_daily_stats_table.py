@@ -0,0 +1,85 @@
+"""add baby_daily_stats table
+
+Revision ID: 5b1d9e3c7a24
+Revises: 4c8e2f1a9b73
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1d9e3c7a24'
+down_revision: Union[str, None] = '4c8e2f1a9b73'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _to_date(value):
+    # SQLite は日時を文字列で返す
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.date()
+
+
+def upgrade() -> None:
+    # 授乳・睡眠・おむつの (赤ちゃん, 日付) 単位の集計（ダッシュボード統計用）
+    stats = op.create_table(
+        'baby_daily_stats',
+        sa.Column('baby_id', sa.Integer(), nullable=False),
+        sa.Column('stat_date', sa.Date(), nullable=False),
+        sa.Column('feeding_count', sa.Integer(), nullable=False),
+        sa.Column('feeding_amount_count', sa.Integer(), nullable=False),
+        sa.Column('feeding_amount_ml', sa.Float(), nullable=False),
+        sa.Column('sleep_count', sa.Integer(), nullable=False),
+        sa.Column('sleep_seconds', sa.Integer(), nullable=False),
+        sa.Column('diaper_wet', sa.Integer(), nullable=False),
+        sa.Column('diaper_dirty', sa.Integer(), nullable=False),
+        sa.Column('diaper_both', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['baby_id'], ['babies.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('baby_id', 'stat_date')
+    )
+
+    # 既存の記録からバックフィル（以降はアプリのフラッシュ時に差分更新）
+    conn = op.get_bind()
+    rows = defaultdict(lambda: defaultdict(float))
+    for baby_id, at, amount_ml in conn.execute(sa.text(
+        "SELECT baby_id, feeding_time, amount_ml FROM feedings"
+    )):
+        row = rows[(baby_id, _to_date(at))]
+        row['feeding_count'] += 1
+        if amount_ml is not None:
+            row['feeding_amount_count'] += 1
+            row['feeding_amount_ml'] += amount_ml
+    for baby_id, start_time, end_time in conn.execute(sa.text(
+        "SELECT baby_id, start_time, end_time FROM sleeps WHERE end_time IS NOT NULL"
+    )):
+        if isinstance(start_time, str):
+            start_time, end_time = datetime.fromisoformat(start_time), datetime.fromisoformat(end_time)
+        row = rows[(baby_id, start_time.date())]
+        row['sleep_count'] += 1
+        row['sleep_seconds'] += int((end_time - start_time).total_seconds())
+    for baby_id, at, diaper_type in conn.execute(sa.text(
+        "SELECT baby_id, change_time, diaper_type FROM diapers"
+    )):
+        rows[(baby_id, _to_date(at))]['diaper_' + str(diaper_type).lower()] += 1
+
+    columns = [c.name for c in stats.columns if c.name not in ('baby_id', 'stat_date')]
+    if rows:
+        op.bulk_insert(stats, [
+            {
+                'baby_id': baby_id,
+                'stat_date': stat_date,
+                **{c: (values[c] if c == 'feeding_amount_ml' else int(values[c])) for c in columns},
+            }
+            for (baby_id, stat_date), values in rows.items()
+        ])
+
+
+def downgrade() -> None:
+    op.drop_table('baby_daily_stats')
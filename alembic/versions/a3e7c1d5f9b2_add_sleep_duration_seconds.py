@@ -0,0 +1,62 @@
+"""add sleep duration_seconds
+
+Revision ID: a3e7c1d5f9b2
+Revises: 5b1d9e3c7a24
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e7c1d5f9b2'
+down_revision: Union[str, None] = '5b1d9e3c7a24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _to_datetime(value):
+    # SQLite は日時を文字列で返す
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def upgrade() -> None:
+    # 睡眠時間（秒）を保存し、集計をどの方言でも SUM で行えるようにする
+    op.add_column('sleeps', sa.Column('duration_seconds', sa.Integer(), nullable=True))
+
+    # 既存の完了した睡眠をバックフィル（アプリと同じく秒未満は切り捨て）
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        "SELECT id, start_time, end_time FROM sleeps WHERE end_time IS NOT NULL"
+    )).all()
+    if rows:
+        conn.execute(
+            sa.text("UPDATE sleeps SET duration_seconds = :duration WHERE id = :id"),
+            [
+                {
+                    'id': sleep_id,
+                    'duration': int((_to_datetime(end_time) - _to_datetime(start_time)).total_seconds()),
+                }
+                for sleep_id, start_time, end_time in rows
+            ]
+        )
+
+    # 継続中の睡眠（end_time IS NULL）の検索用部分インデックス
+    op.create_index(
+        'ix_sleeps_ongoing_baby',
+        'sleeps',
+        ['baby_id'],
+        unique=False,
+        postgresql_where=sa.text('end_time IS NULL'),
+        sqlite_where=sa.text('end_time IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sleeps_ongoing_baby', table_name='sleeps')
+    with op.batch_alter_table('sleeps') as batch_op:
+        batch_op.drop_column('duration_seconds')
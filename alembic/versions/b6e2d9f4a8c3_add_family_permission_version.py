@@ -0,0 +1,31 @@
+"""add permission_version to families
+
+Revision ID: b6e2d9f4a8c3
+Revises: f1c3a5e7b9d2
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e2d9f4a8c3'
+down_revision: Union[str, None] = 'f1c3a5e7b9d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 権限キャッシュの家族バージョン（全ワーカー・インスタンスで共有する）
+    with op.batch_alter_table('families', schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column('permission_version', sa.Integer(), server_default='0', nullable=False)
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('families', schema=None) as batch_op:
+        batch_op.drop_column('permission_version')
@@ -0,0 +1,93 @@
+"""unique ongoing sleep per baby
+
+Revision ID: c8f2a6e4d1b7
+Revises: a3e7c1d5f9b2
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f2a6e4d1b7'
+down_revision: Union[str, None] = 'a3e7c1d5f9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_STAT_COLUMNS = (
+    'feeding_count', 'feeding_amount_count', 'feeding_amount_ml',
+    'sleep_count', 'sleep_seconds',
+    'diaper_wet', 'diaper_dirty', 'diaper_both',
+)
+
+
+def _to_datetime(value):
+    # SQLite は日時を文字列で返す
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _close_duplicate_ongoing_sleeps(conn) -> None:
+    """赤ちゃんごとに最新の継続中の睡眠だけを残し、古いものは次の睡眠の開始時刻で終了させる"""
+    ongoing = defaultdict(list)
+    for sleep_id, baby_id, start_time in conn.execute(sa.text(
+        "SELECT id, baby_id, start_time FROM sleeps WHERE end_time IS NULL ORDER BY baby_id, start_time, id"
+    )):
+        ongoing[baby_id].append((sleep_id, _to_datetime(start_time)))
+
+    for baby_id, sleeps in ongoing.items():
+        for (sleep_id, start_time), (_, next_start) in zip(sleeps, sleeps[1:]):
+            duration = int((next_start - start_time).total_seconds())
+            conn.execute(
+                sa.text("UPDATE sleeps SET end_time = :end_time, duration_seconds = :duration WHERE id = :id"),
+                {'id': sleep_id, 'end_time': next_start, 'duration': duration}
+            )
+            # 完了した睡眠として日次集計に加算（行がなければ作成）
+            params = {'baby_id': baby_id, 'stat_date': start_time.date(), 'duration': duration}
+            updated = conn.execute(sa.text(
+                "UPDATE baby_daily_stats SET sleep_count = sleep_count + 1, "
+                "sleep_seconds = sleep_seconds + :duration "
+                "WHERE baby_id = :baby_id AND stat_date = :stat_date"
+            ), params)
+            if updated.rowcount == 0:
+                columns = ', '.join(_STAT_COLUMNS)
+                values = ', '.join(
+                    '1' if c == 'sleep_count' else ':duration' if c == 'sleep_seconds' else '0'
+                    for c in _STAT_COLUMNS
+                )
+                conn.execute(sa.text(
+                    f"INSERT INTO baby_daily_stats (baby_id, stat_date, {columns}) "
+                    f"VALUES (:baby_id, :stat_date, {values})"
+                ), params)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    _close_duplicate_ongoing_sleeps(conn)
+
+    # 継続中の睡眠は赤ちゃんごとに1件（睡眠開始を1文の INSERT ... ON CONFLICT で行うため）
+    op.drop_index('ix_sleeps_ongoing_baby', table_name='sleeps')
+    op.create_index(
+        'uq_sleeps_ongoing_baby',
+        'sleeps',
+        ['baby_id'],
+        unique=True,
+        postgresql_where=sa.text('end_time IS NULL'),
+        sqlite_where=sa.text('end_time IS NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_sleeps_ongoing_baby', table_name='sleeps')
+    op.create_index(
+        'ix_sleeps_ongoing_baby',
+        'sleeps',
+        ['baby_id'],
+        unique=False,
+        postgresql_where=sa.text('end_time IS NULL'),
+        sqlite_where=sa.text('end_time IS NULL')
+    )
@@ -0,0 +1,52 @@
+"""add revoked_sessions table
+
+Revision ID: e4b7d2a9c610
+Revises: c8f2a6e4d1b7
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7d2a9c610'
+down_revision: Union[str, None] = 'c8f2a6e4d1b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 以前は失効記録をこの接頭辞付きのトークンとして user_sessions に保存していた
+_REVOKED_PREFIX = 'revoked:'
+
+
+def upgrade() -> None:
+    # 署名付きセッションの失効記録を user_sessions から分離（db モードのセッション検索に混ざらないように）
+    op.create_table(
+        'revoked_sessions',
+        sa.Column('digest', sa.String(length=32), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('digest')
+    )
+    op.create_index(op.f('ix_revoked_sessions_expires_at'), 'revoked_sessions', ['expires_at'], unique=False)
+
+    op.execute(sa.text(
+        "INSERT INTO revoked_sessions (digest, user_id, expires_at) "
+        "SELECT substr(token, :start), user_id, expires_at FROM user_sessions "
+        "WHERE token LIKE :pattern"
+    ).bindparams(start=len(_REVOKED_PREFIX) + 1, pattern=_REVOKED_PREFIX + '%'))
+    op.execute(sa.text(
+        "DELETE FROM user_sessions WHERE token LIKE :pattern"
+    ).bindparams(pattern=_REVOKED_PREFIX + '%'))
+
+
+def downgrade() -> None:
+    op.execute(sa.text(
+        "INSERT INTO user_sessions (token, user_id, created_at, expires_at) "
+        "SELECT :prefix || digest, user_id, CURRENT_TIMESTAMP, expires_at FROM revoked_sessions"
+    ).bindparams(prefix=_REVOKED_PREFIX))
+    op.drop_index(op.f('ix_revoked_sessions_expires_at'), table_name='revoked_sessions')
+    op.drop_table('revoked_sessions')
@@ -0,0 +1,33 @@
+"""add app_settings table
+
+Revision ID: f1c3a5e7b9d2
+Revises: e4b7d2a9c610
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c3a5e7b9d2'
+down_revision: Union[str, None] = 'e4b7d2a9c610'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # プロセス・インスタンス間で共有する値（bcrypt のコストなど）
+    op.create_table(
+        'app_settings',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('value', sa.String(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('app_settings')
@@ -0,0 +1,152 @@
+"""高速起動（スリープからの復帰向け）
+
+`python -m app.boot` で起動する。従来の `alembic upgrade head && uvicorn ...` と比べて、
+- alembic_version を1回のクエリで確認し、head と一致すればマイグレーション処理を省略
+- アプリの import 済みモジュールを同一プロセスの uvicorn でそのまま使う
+起動後のウォームアップ（warm_up）は lifespan から呼ばれ、完了するまで /api/ready は503を返す。
+各フェーズの所要時間はログに出力する。
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Set
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+
+from app.config import settings
+from app.database import engine
+from app.utils.serialization import get_type_adapter
+
+logger = logging.getLogger(__name__)
+
+ALEMBIC_INI = "alembic.ini"
+
+
+@contextmanager
+def boot_phase(name: str, timings: Optional[Dict[str, float]] = None) -> Iterator[None]:
+    """フェーズの所要時間を計測してログに出力"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+        if timings is not None:
+            timings[name] = elapsed_ms
+        logger.info("boot phase %s: %.1fms", name, elapsed_ms)
+
+
+# ===== マイグレーション =====
+
+def _alembic_config():
+    """alembic.ini の設定（env.py でロガー設定を上書きさせない）"""
+    from alembic.config import Config
+
+    config = Config(ALEMBIC_INI)
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def get_head_revisions(config) -> Set[str]:
+    """マイグレーションスクリプトの head（DBには接続しない）"""
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+def get_current_revisions() -> Set[str]:
+    """DBに適用済みのリビジョン（alembic_version がなければ空）"""
+    try:
+        with engine.connect() as conn:
+            return {row[0] for row in conn.execute(text("SELECT version_num FROM alembic_version"))}
+    except Exception:
+        # 未作成のDB（テーブルなし）はマイグレーション対象
+        logger.info("alembic_version not found; migrations will run")
+        return set()
+
+
+def migrate_if_needed() -> bool:
+    """head でなければ alembic upgrade head を実行し、実行したかどうかを返す"""
+    config = _alembic_config()
+    heads = get_head_revisions(config)
+    current = get_current_revisions()
+    if current == heads:
+        logger.info("database is at head (%s); skipping migrations", ", ".join(sorted(heads)))
+        return False
+
+    from alembic import command
+
+    logger.info("migrating database: %s -> %s", ", ".join(sorted(current)) or "(empty)", ", ".join(sorted(heads)))
+    command.upgrade(config, "head")
+    return True
+
+
+# ===== ウォームアップ =====
+
+def prebuild_schemas(app: FastAPI) -> int:
+    """OpenAPIスキーマとレスポンス型の TypeAdapter を事前構築し、構築した型の数を返す"""
+    app.openapi()
+    count = 0
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.response_model is not None:
+            get_type_adapter(route.response_model)
+            count += 1
+    return count
+
+
+def warm_pool(connections: int) -> int:
+    """接続プールに接続を確立しておき、確立した数を返す"""
+    conns = []
+    try:
+        for _ in range(connections):
+            conn = engine.connect()
+            conns.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in conns:
+            conn.close()
+    return len(conns)
+
+
+def warm_up(app: FastAPI) -> Dict[str, float]:
+    """ウォームアップを実行してフェーズごとの所要時間(ms)を返す（同期処理）"""
+    timings: Dict[str, float] = {}
+    with boot_phase("mappers", timings):
+        configure_mappers()
+    with boot_phase("schemas", timings):
+        prebuild_schemas(app)
+    with boot_phase("pool", timings):
+        warm_pool(settings.BOOT_WARM_CONNECTIONS)
+    return timings
+
+
+# ===== エントリポイント =====
+
+def main() -> None:
+    """マイグレーション確認後、同一プロセスで uvicorn を起動"""
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    started = time.perf_counter()
+
+    with boot_phase("import"):
+        import uvicorn
+        from app.main import app
+
+    with boot_phase("migrations"):
+        migrate_if_needed()
+
+    logger.info("boot completed before serving: %.1fms", (time.perf_counter() - started) * 1000)
+    uvicorn.run(
+        app,
+        host=os.environ.get("HOST", "0.0.0.0"),
+        port=int(os.environ.get("PORT", "8000")),
+        # Render のプロキシを信頼し request.client を実際のクライアントIPにする（ログインのレート制限）
+        forwarded_allow_ips="*",
+        log_config=None,
+    )
+
+
+if __name__ == "__main__":
+    main()
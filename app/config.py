@@ -11,6 +11,56 @@ class Settings(BaseSettings):
     TIMEZONE: str = "Asia/Tokyo"
     FRONTEND_URL: str = ""
 
+    # セッションキャッシュ（get_current_user のDB往復削減）
+    SESSION_CACHE_TTL_SECONDS: int = 60
+    SESSION_CACHE_MAX_SIZE: int = 1024
+
+    # 赤ちゃん選択で POST フォームの baby_id も参照する互換モード（ボディを解析する）
+    BABY_SELECTION_FORM_FALLBACK: bool = False
+
+    # バッチAPI（POST /api/batch）で1回に実行できるリクエスト数
+    BATCH_MAX_REQUESTS: int = 20
+
+    # 権限マトリクスキャッシュ（ユーザー・家族単位、0で無効）
+    PERMISSION_CACHE_MAX_SIZE: int = 4096
+
+    # ダッシュボードレスポンスのキャッシュ（赤ちゃん・権限単位、0で無効）
+    DASHBOARD_CACHE_MAX_SIZE: int = 1024
+    DASHBOARD_CACHE_TTL_SECONDS: int = 60
+
+    # セッション方式: "db"（user_sessions テーブル）または "signed"（署名付きトークン）
+    SESSION_MODE: str = "db"
+    SESSION_DENYLIST_SYNC_SECONDS: int = 60
+
+    # パスワードハッシュ用プロセスプール（0でスレッドプール実行）
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+
+    # ログイン・登録のレート制限（ユーザー名・IPごと、0で無効）
+    LOGIN_RATE_LIMIT_BURST: int = 10
+    LOGIN_RATE_LIMIT_PER_MINUTE: int = 5
+
+    # bcrypt コストの起動時キャリブレーション（目標ms、0で無効）と、保存した値を使う日数（0で無期限）
+    BCRYPT_TARGET_MS: int = 250
+    BCRYPT_MIN_ROUNDS: int = 10
+    BCRYPT_MAX_ROUNDS: int = 14
+    BCRYPT_CALIBRATION_MAX_AGE_DAYS: int = 30
+
+    # 期限切れセッションの定期削除（0で無効）
+    SESSION_REAP_INTERVAL_SECONDS: int = 3600
+    SESSION_REAP_BATCH_SIZE: int = 500
+
+    # 同期エンドポイント用スレッドプールのサイズと、レーンごとの受付制御（同時実行数・待ち行列）
+    THREADPOOL_SIZE: int = 40
+    ADMISSION_DEFAULT_CONCURRENCY: int = 24
+    ADMISSION_HEAVY_CONCURRENCY: int = 8
+    ADMISSION_QUEUE_SIZE: int = 64
+    ADMISSION_QUEUE_TIMEOUT_MS: int = 3000
+    ADMISSION_RETRY_AFTER_SECONDS: int = 1
+
+    # 起動時のウォームアップで確立しておくDB接続数
+    BOOT_WARM_CONNECTIONS: int = 2
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -2,6 +2,7 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
 
 from app.config import settings
 
@@ -30,8 +31,20 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
-def get_db():
-    """データベースセッション依存性"""
+# バッチAPIの内部リクエストで共有するセッションを scope["state"] に保持するキー
+SHARED_DB_STATE_KEY = "shared_db"
+
+
+def get_db(request: Request):
+    """データベースセッション依存性
+
+    バッチAPIの内部リクエストでは親リクエストのセッションを共有する（クローズは親が行う）。
+    """
+    shared = request.scope.get("state", {}).get(SHARED_DB_STATE_KEY)
+    if shared is not None:
+        yield shared
+        return
+
     db = SessionLocal()
     try:
         yield db
@@ -1,14 +1,19 @@
 """依存性注入モジュール"""
-import secrets
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Tuple
 from fastapi import Cookie, Depends, Request, Response, HTTPException, status, Query
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
+from app.config import settings
 from app.database import get_db
+from app.middleware.baby_selection import STATE_KEY as BABY_SELECTION_KEY, resolve_baby_selection
+from app.middleware.csrf import CSRF_COOKIE_NAME, FORM_CONTENT_TYPES, UNSAFE_METHODS, tokens_match
 from app.models.user import User
 from app.models.session import UserSession
+from app.services.session_cache import session_cache
+from app.services.signed_session import signed_sessions
 
 
 from app.models.family import Family
@@ -26,108 +31,194 @@ class PermissionDenied(Exception):
     pass
 
 
-def get_current_user(
+@dataclass(frozen=True)
+class AuthContext:
+    """リクエスト単位で解決済みの認証コンテキスト（不変）
+
+    セッション → ユーザー → 最初の FamilyUser → Family → Baby を
+    1回のクエリで読み込んだ結果を保持する。
+    """
+    user: User
+    family_user: Optional[FamilyUser]
+    family: Optional[Family]
+    babies: Tuple[Baby, ...]
+
+
+# ユーザーから家族・赤ちゃんまでを JOIN で一括ロードするオプション
+_AUTH_CONTEXT_LOAD = joinedload(User.families).joinedload(FamilyUser.family).joinedload(Family.babies)
+
+
+def _load_auth_context(db: Session, session_token: str) -> Optional[AuthContext]:
+    """セッショントークンから認証コンテキストを1クエリで構築"""
+    user_id = None
+    if settings.SESSION_MODE == "signed":
+        # 署名付きトークンはDBアクセスなしで検証できる
+        claims = signed_sessions.verify(session_token)
+        if claims is None:
+            return None
+        user_id = claims.user_id
+    cached = session_cache.get(session_token)
+    if cached:
+        user_id = cached.user.id
+
+    if user_id is not None:
+        # セッションは検証済みのため、ユーザー起点で家族・赤ちゃんのみ取得
+        user = db.query(User).options(_AUTH_CONTEXT_LOAD).filter(
+            User.id == user_id
+        ).first()
+        if not user:
+            session_cache.invalidate(session_token)
+            return None
+        if settings.SESSION_MODE == "signed" and not cached:
+            session_cache.put(session_token, user, claims.expires_at)
+    else:
+        row = db.query(User, UserSession).join(
+            UserSession, UserSession.user_id == User.id
+        ).options(_AUTH_CONTEXT_LOAD).filter(
+            UserSession.token == session_token
+        ).first()
+
+        if not row:
+            return None
+
+        user, user_session = row
+
+        # 有効期限チェック（削除は SessionReaper に任せ、読み取り経路では書き込まない）
+        if user_session.is_expired:
+            return None
+
+        session_cache.put(session_token, user, user_session.expires_at)
+
+    family_user = user.families[0] if user.families else None
+    family = family_user.family if family_user else None
+    return AuthContext(
+        user=user,
+        family_user=family_user,
+        family=family,
+        babies=tuple(family.babies) if family else (),
+    )
+
+
+def get_auth_context(
     request: Request,
     session_token: Optional[str] = Cookie(None),
     db: Session = Depends(get_db)
-) -> User:
-    """現在のログインユーザーを取得（必須）
+) -> AuthContext:
+    """認証コンテキストを取得（必須）
 
+    同一リクエスト内では request.state に保持した結果を再利用する。
     未認証の場合は AuthenticationRequired を発生させる。
     """
+    state = getattr(request, "state", None)
+    context = getattr(state, "auth_context", None)
+    if context is not None:
+        return context
+
     if not session_token:
         raise AuthenticationRequired()
 
-    # DBからセッション検索
-    user_session = db.query(UserSession).filter(
-        UserSession.token == session_token
-    ).first()
-
-    if not user_session:
+    context = _load_auth_context(db, session_token)
+    if context is None:
         raise AuthenticationRequired()
 
-    # 有効期限チェック
-    if user_session.is_expired:
-        db.delete(user_session)
-        db.commit()
-        raise AuthenticationRequired()
+    if state is not None:
+        state.auth_context = context
+    return context
 
-    # ユーザー取得
-    user = db.query(User).filter(User.id == user_session.user_id).first()
-    if not user:
-        db.delete(user_session)
-        db.commit()
-        raise AuthenticationRequired()
 
-    return user
+def get_current_user(
+    request: Request,
+    session_token: Optional[str] = Cookie(None),
+    db: Session = Depends(get_db)
+) -> User:
+    """現在のログインユーザーを取得（必須）
+
+    未認証の場合は AuthenticationRequired を発生させる。
+    セッションキャッシュにヒットした場合はDBアクセスなしで返す（家族・赤ちゃんが必要な
+    依存性のみ get_auth_context で読み込む）。SESSION_MODE=signed では先に署名を検証する。
+    """
+    state = getattr(request, "state", None)
+    if session_token and getattr(state, "auth_context", None) is None:
+        if settings.SESSION_MODE == "signed" and signed_sessions.verify(session_token) is None:
+            raise AuthenticationRequired()
+        cached = session_cache.get(session_token)
+        if cached:
+            return session_cache.attach(db, cached)
+    return get_auth_context(request, session_token, db).user
 
 
 def get_current_family(
-    user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    context: AuthContext = Depends(get_auth_context),
 ) -> Family:
     """現在ユーザーが所属している最初の家族を取得（単一家族前提）
     
     複数家族に対応する場合は、セッションやクッキーで active_family_id を管理する。
     """
-    if not user.families:
+    if context.family is None:
         # どの家族にも属していない場合
         raise PermissionDenied("家族に所属していません。作成または参加してください。")
-    return user.families[0].family
+    return context.family
 
 
-async def get_current_baby(
-    request: Request,
-    user: User = Depends(get_current_user),
-    family: Family = Depends(get_current_family),
-    baby_id: Optional[int] = Query(None),  # URLクエリパラメータ
-    selected_baby_id: Optional[str] = Cookie(None),  # クッキーから選択中の赤ちゃんID
-    db: Session = Depends(get_db)
-) -> Baby:
-    """現在操作対象の赤ちゃんを取得
+async def get_selected_baby_id(request: Request) -> Optional[int]:
+    """選択中の赤ちゃんIDを取得（ボディは読まない）
 
     優先順位:
-    1. URLクエリパラメータの baby_id
-    2. POSTフォームデータの baby_id
-    3. クッキーの selected_baby_id
-    4. 家族の最初の赤ちゃん（デフォルト）
+    1. X-Baby-Id ヘッダー
+    2. URLクエリパラメータの baby_id
+    3. POSTフォームデータの baby_id（BABY_SELECTION_FORM_FALLBACK 有効時のみ）
+    4. クッキーの selected_baby_id
     """
-    if not family.babies:
-        raise PermissionDenied("赤ちゃんが登録されていません。")
-
-    # まずURLクエリパラメータから取得
-    if not baby_id:
-        # POSTリクエストの場合、フォームデータから取得を試みる
-        if request.method == "POST":
+    selection = request.scope.get("state", {}).get(BABY_SELECTION_KEY)
+    if selection is None:
+        # ミドルウェアを経由しない呼び出し（テスト等）
+        selection = resolve_baby_selection(request.scope)
+    if selection.explicit:
+        return selection.explicit
+
+    # 旧フォーム送信向けの互換モード
+    if settings.BABY_SELECTION_FORM_FALLBACK and request.method == "POST":
+        content_type = request.headers.get("content-type", "")
+        if content_type.startswith(("multipart/form-data", "application/x-www-form-urlencoded")):
             try:
                 form = await request.form()
                 baby_id_str = form.get("baby_id")
                 if baby_id_str:
-                    baby_id = int(baby_id_str)
+                    return int(baby_id_str)
             except Exception:
                 pass
 
-        # クエリパラメータもフォームデータもない場合、クッキーから取得
-        if not baby_id and selected_baby_id:
-            try:
-                baby_id = int(selected_baby_id)
-            except (ValueError, TypeError):
-                pass
+    return selection.cookie
+
+
+def get_current_baby(
+    user: User = Depends(get_current_user),
+    family: Family = Depends(get_current_family),
+    baby_id: Optional[int] = Depends(get_selected_baby_id),
+    db: Session = Depends(get_db)
+) -> Baby:
+    """現在操作対象の赤ちゃんを取得
+
+    指定がない場合は、基本情報の閲覧権限がある最初の赤ちゃん。
+    """
+    from app.services.permission_service import PermissionService
+
+    if not family.babies:
+        raise PermissionDenied("赤ちゃんが登録されていません。")
 
     if baby_id:
-        baby = db.query(Baby).filter(Baby.id == baby_id, Baby.family_id == family.id).first()
+        # 家族の赤ちゃんは認証コンテキストでロード済み
+        baby = next((b for b in family.babies if b.id == baby_id), None)
         if not baby:
             raise PermissionDenied("指定された赤ちゃんが見つかりません。")
-        
+
         # 権限チェック (基本情報閲覧)
-        from app.services.permission_service import PermissionService
         if not PermissionService.can_view_baby_record(db, user.id, family.id, baby.id, "basic_info"):
             raise PermissionDenied("この赤ちゃんの情報を閲覧する権限がありません。")
-            
+
         return baby
 
     # 指定がない場合は、権限のある最初の赤ちゃんを返す
-    from app.services.permission_service import PermissionService
     for b in family.babies:
         if PermissionService.can_view_baby_record(db, user.id, family.id, b.id, "basic_info"):
             return b
@@ -137,7 +228,7 @@ async def get_current_baby(
 
 def check_record_permission(record_type: str):
     """特定の記録タイプに対する閲覧権限をチェックする依存性ファクトリ"""
-    async def _check(
+    def _check(
         db: Session = Depends(get_db),
         user: User = Depends(get_current_user),
         family: Family = Depends(get_current_family),
@@ -150,15 +241,10 @@ def check_record_permission(record_type: str):
 
 
 def admin_required(
-    user: User = Depends(get_current_user),
-    family: Family = Depends(get_current_family),
-    db: Session = Depends(get_db)
+    context: AuthContext = Depends(get_auth_context),
 ):
     """家族の管理者権限を要求する"""
-    fu = db.query(FamilyUser).filter(
-        FamilyUser.family_id == family.id,
-        FamilyUser.user_id == user.id
-    ).first()
+    fu = context.family_user
     if not fu or fu.role != "admin":
         raise PermissionDenied("管理者権限が必要です。")
     return fu
@@ -172,6 +258,22 @@ def get_current_user_optional(
     if not session_token:
         return None
 
+    claims = None
+    if settings.SESSION_MODE == "signed":
+        claims = signed_sessions.verify(session_token)
+        if claims is None:
+            return None
+
+    cached = session_cache.get(session_token)
+    if cached:
+        return session_cache.attach(db, cached)
+
+    if claims is not None:
+        user = db.query(User).filter(User.id == claims.user_id).first()
+        if user:
+            session_cache.put(session_token, user, claims.expires_at)
+        return user
+
     user_session = db.query(UserSession).filter(
         UserSession.token == session_token
     ).first()
@@ -179,41 +281,35 @@ def get_current_user_optional(
     if not user_session or user_session.is_expired:
         return None
 
-    return db.query(User).filter(User.id == user_session.user_id).first()
+    user = db.query(User).filter(User.id == user_session.user_id).first()
+    if user:
+        session_cache.put(session_token, user, user_session.expires_at)
+    return user
 
 
 async def check_csrf(request: Request):
-    """CSRF対策の共通依存関係"""
-    csrf_token = getattr(request.state, "csrf_token", None)
-    if not csrf_token:
-        # Fallback if middleware is missing or cookie not set
-        csrf_token = request.cookies.get("csrf_token")
-        if not csrf_token:
-             # Generate new token if missing
-            csrf_token = secrets.token_urlsafe(32)
-            request.state.csrf_token = csrf_token
-
-    if request.method in ("POST", "PUT", "DELETE", "PATCH"):
-        header_token = request.headers.get("X-CSRF-Token")
-        form_token = None
-
-        # Check form data if header is missing
-        content_type = request.headers.get("content-type", "")
-        if not header_token and (
-            content_type.startswith("multipart/form-data") or
-            content_type.startswith("application/x-www-form-urlencoded")
-        ):
-            try:
-                # Using await request.form() inside dependency is safe as it uses cached data
-                form = await request.form()
-                form_token = form.get("csrf_token")
-            except Exception:
-                pass
+    """CSRF対策の共通依存関係
 
-        submitted_token = header_token or form_token
-
-        if not submitted_token or not secrets.compare_digest(submitted_token, csrf_token):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="CSRF token missing or incorrect"
-            )
+    トークンの発行とヘッダーの照合は CSRFCookieMiddleware が行う。
+    ここではボディを読む必要がある、ヘッダーのないフォーム送信のみを照合する。
+    """
+    if request.method not in UNSAFE_METHODS or getattr(request.state, "csrf_verified", False):
+        return
+
+    csrf_token = getattr(request.state, "csrf_token", None) or request.cookies.get(CSRF_COOKIE_NAME)
+    submitted_token = request.headers.get("X-CSRF-Token")
+
+    # Check form data if header is missing
+    if not submitted_token and request.headers.get("content-type", "").startswith(FORM_CONTENT_TYPES):
+        try:
+            # Using await request.form() inside dependency is safe as it uses cached data
+            form = await request.form()
+            submitted_token = form.get("csrf_token")
+        except Exception:
+            pass
+
+    if not csrf_token or not tokens_match(submitted_token, csrf_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="CSRF token missing or incorrect"
+        )
@@ -1,28 +1,145 @@
 """FastAPI アプリケーションエントリポイント"""
+import asyncio
+import logging
+from datetime import timedelta
+import anyio.to_thread
+from contextlib import asynccontextmanager
 from typing import Optional
 from fastapi import FastAPI, Request, Depends
 from fastapi.responses import RedirectResponse, JSONResponse, HTMLResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 
 from fastapi.exceptions import RequestValidationError
+from app import boot
 from app.config import settings
-from app.routers import auth, dashboard, feeding, sleep, diaper, growth, contraction, schedule, family, baby
+from app.database import SessionLocal
+from app.routers import auth, dashboard, feeding, sleep, diaper, growth, contraction, schedule, family, baby, batch, stats
+from app.middleware.admission import AdmissionControlMiddleware, admission_controller
+from app.middleware.baby_selection import BabySelectionMiddleware
 from app.middleware.csrf import CSRFCookieMiddleware
 from app.dependencies import get_current_user_optional, AuthenticationRequired, PermissionDenied, check_csrf
 from app.models.user import User
+from app.services.auth_service import AuthService
+from app.services.bcrypt_rounds import BcryptRoundsService
+from app.services.password_hasher import password_hasher, PasswordHasherBusy
+from app.services.session_reaper import SessionReaper
+from app.services.signed_session import signed_sessions
+from app.utils.serialization import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+
+
+def _resolve_bcrypt_rounds():
+    """専用のDBセッションで共有の bcrypt コストを決める"""
+    max_age_days = settings.BCRYPT_CALIBRATION_MAX_AGE_DAYS
+    db = SessionLocal()
+    try:
+        return BcryptRoundsService.resolve(
+            db, settings.BCRYPT_TARGET_MS, settings.BCRYPT_MIN_ROUNDS, settings.BCRYPT_MAX_ROUNDS,
+            max_age=timedelta(days=max_age_days) if max_age_days > 0 else None,
+        )
+    finally:
+        db.close()
+
+
+async def _calibrate_bcrypt() -> None:
+    """bcrypt コストを全プロセス共通の値に設定（失敗時は例外を送出し、rounds_settled は False のまま）"""
+    with boot.boot_phase("bcrypt"):
+        rounds, timings = await run_in_threadpool(_resolve_bcrypt_rounds)
+    AuthService.rounds = rounds
+    AuthService.rounds_settled = True
+    if timings is None:
+        # 計測結果は保存したプロセスが1度だけ記録する
+        logger.debug("bcrypt rounds=%d (shared)", rounds)
+        return
+    logger.info(
+        "bcrypt calibration: rounds=%d budget=%dms timings=%s",
+        rounds, settings.BCRYPT_TARGET_MS,
+        ", ".join(f"{r}={ms}ms" for r, ms in timings.items()),
+    )
+
+
+async def _warm_up(app: FastAPI, retry: bool) -> None:
+    """bcrypt コストの決定とウォームアップを実行し、完了したら ready にする（retry=True なら成功するまで再試行）"""
+    delay = 1
+    while True:
+        try:
+            if not AuthService.rounds_settled:
+                # 計測がログインと CPU を取り合わないよう、提供開始前に行う
+                # （保存済みのコストがあれば1クエリで読むだけ）
+                await _calibrate_bcrypt()
+            timings = await run_in_threadpool(boot.warm_up, app)
+        except Exception:
+            if not retry:
+                raise
+            logger.exception("warm-up failed; retrying in %ds", delay)
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+            continue
+        app.state.ready = True
+        logger.info(
+            "warm-up completed: %s",
+            ", ".join(f"{name}={ms}ms" for name, ms in timings.items()),
+        )
+        return
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """起動・終了時の処理"""
+    app.state.ready = False
+    background_tasks = []
+
+    # 受付制御のレーン上限の合計より大きくし、軽いエンドポイント用の余裕を残す
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+
+    # 共有の bcrypt コストが決まるまでは既定の rounds を使い、再ハッシュしない
+    AuthService.rounds_settled = settings.BCRYPT_TARGET_MS <= 0
+
+    # 最初のリクエストが温まった状態で処理されるよう、ウォームアップ後に提供を開始する。
+    # DBに接続できない場合は起動を止めず、/api/ready が503のまま再試行する
+    try:
+        await _warm_up(app, retry=False)
+    except Exception:
+        logger.exception("warm-up failed; serving without readiness")
+        background_tasks.append(asyncio.create_task(_warm_up(app, retry=True)))
+
+    if settings.SESSION_REAP_INTERVAL_SECONDS > 0:
+        background_tasks.append(asyncio.create_task(
+            SessionReaper.run_forever(settings.SESSION_REAP_INTERVAL_SECONDS)
+        ))
+    if settings.SESSION_MODE == "signed":
+        background_tasks.append(asyncio.create_task(
+            signed_sessions.run_sync_forever(settings.SESSION_DENYLIST_SYNC_SECONDS)
+        ))
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    password_hasher.shutdown()
+
 
 # FastAPIアプリケーション作成
 app = FastAPI(
     title="Baby-App",
     description="総合育児管理アプリケーション",
     version="1.0.0",
-    default_response_class=JSONResponse,
+    default_response_class=FastJSONResponse,
     dependencies=[Depends(check_csrf)],
+    lifespan=lifespan,
 )
 
 # CSRF Cookie Middleware
 app.add_middleware(CSRFCookieMiddleware)
 
+# 選択中の赤ちゃんIDをボディを読まずに解決
+app.add_middleware(BabySelectionMiddleware)
+
+# レーンごとの同時実行数制限（混雑時は即座に503。CORSヘッダーを付けるためCORSの内側に置く）
+app.add_middleware(AdmissionControlMiddleware)
+
 # CORS Middleware (for production frontend)
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -46,6 +163,32 @@ app.add_middleware(
 
 # ===== エラーハンドラー =====
 
+def _find_viewable_baby_id(request: Request) -> Optional[int]:
+    """閲覧可能な最初の赤ちゃんIDを探す（同期DBアクセスのためスレッドプールで実行）"""
+    from app.database import SessionLocal
+    from app.dependencies import _load_auth_context
+    from app.services.permission_service import PermissionService
+
+    session_token = request.cookies.get("session_token")
+    if not session_token:
+        return None
+
+    db = SessionLocal()
+    try:
+        context = _load_auth_context(db, session_token)
+        if context is None or context.family is None:
+            return None
+
+        family = context.family
+        baby_ids = [b.id for b in context.babies]
+        perms_map = PermissionService.get_user_permissions_batch(
+            db, context.user.id, baby_ids, family.id, "basic_info"
+        )
+        return next((baby_id for baby_id in baby_ids if perms_map.get(baby_id, False)), None)
+    finally:
+        db.close()
+
+
 @app.exception_handler(PermissionDenied)
 async def permission_denied_handler(request: Request, exc: PermissionDenied):
     """権限不足時のハンドラー（改善版）"""
@@ -55,51 +198,22 @@ async def permission_denied_handler(request: Request, exc: PermissionDenied):
     if "この赤ちゃんの情報を閲覧する権限がありません" in msg:
         # 閲覧可能な赤ちゃんを探してリダイレクト
         try:
-            from sqlalchemy.orm import Session
-            from app.database import SessionLocal
-            from app.models.session import UserSession  # 正しいインポートパス
-            from app.models.user import User
-            from app.services.permission_service import PermissionService
-
-            # セッショントークンからユーザーを取得
-            session_token = request.cookies.get("session_token")
-            if session_token:
-                db = SessionLocal()
-                try:
-                    user_session = db.query(UserSession).filter(
-                        UserSession.token == session_token
-                    ).first()
-
-                    if user_session and not user_session.is_expired:
-                        user = db.query(User).filter(User.id == user_session.user_id).first()
-                        if user and user.families:
-                            family = user.families[0].family
-
-                            # 閲覧可能な赤ちゃんを探す
-                            baby_ids = [b.id for b in family.babies]
-                            perms_map = PermissionService.get_user_permissions_batch(
-                                db, user.id, baby_ids, family.id, "basic_info"
-                            )
-                            viewable_babies = [b for b in family.babies if perms_map.get(b.id, False)]
-
-                            if viewable_babies:
-                                # 閲覧可能な最初の赤ちゃんのダッシュボードにリダイレクト
-                                redirect_url = f"/dashboard?baby_id={viewable_babies[0].id}&permission_denied=1"
-
-                                if request.headers.get("HX-Request"):
-                                    response = HTMLResponse(content="", status_code=200)
-                                    response.headers["HX-Redirect"] = redirect_url
-                                    return response
-
-                                return RedirectResponse(url=redirect_url, status_code=303)
-                finally:
-                    db.close()
-        except Exception as e:
-            # デバッグ用にログ出力
-            print(f"[DEBUG] Permission redirect failed: {e}")
-            import traceback
-            traceback.print_exc()
-            pass  # エラーが発生した場合はデフォルト処理へ
+            viewable_baby_id = await run_in_threadpool(_find_viewable_baby_id, request)
+        except Exception:
+            # エラーが発生した場合はデフォルト処理へ
+            logger.exception("Permission redirect failed")
+            viewable_baby_id = None
+
+        if viewable_baby_id:
+            # 閲覧可能な最初の赤ちゃんのダッシュボードにリダイレクト
+            redirect_url = f"/dashboard?baby_id={viewable_baby_id}&permission_denied=1"
+
+            if request.headers.get("HX-Request"):
+                response = HTMLResponse(content="", status_code=200)
+                response.headers["HX-Redirect"] = redirect_url
+                return response
+
+            return RedirectResponse(url=redirect_url, status_code=303)
 
     # 既存のロジック（その他のエラーケース）
     if request.headers.get("HX-Request"):
@@ -137,6 +251,16 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    """ハッシュ処理が混雑している場合のハンドラー: 即座に503を返す"""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "現在混み合っています。しばらくしてから再度お試しください。"},
+        headers={"Retry-After": "1"},
+    )
+
+
 @app.exception_handler(AuthenticationRequired)
 async def auth_required_handler(request: Request, exc: AuthenticationRequired):
     """未認証時のハンドラー: ログインページへリダイレクト"""
@@ -164,6 +288,8 @@ app.include_router(diaper.router, prefix="/api")
 app.include_router(growth.router, prefix="/api")
 app.include_router(contraction.router, prefix="/api")
 app.include_router(schedule.router, prefix="/api")
+app.include_router(stats.router, prefix="/api")
+app.include_router(batch.router, prefix="/api")
 
 
 @app.get("/api/health")
@@ -171,6 +297,14 @@ async def health_check():
     """ヘルスチェックエンドポイント"""
     return {"status": "healthy"}
 
+
+@app.get("/api/ready")
+async def readiness_check(request: Request):
+    """レディネスチェック（起動時のウォームアップ完了まで503、完了後は受付制御のレーン統計も返す）"""
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse(status_code=503, content={"status": "warming"}, headers={"Retry-After": "1"})
+    return {"status": "ready", "admission": admission_controller.stats()}
+
 # Frontend Static Files (Must be last)
 import os
 frontend_path = "frontend/out"
@@ -0,0 +1,200 @@
+"""受付制御ミドルウェア（純粋なASGI実装）
+
+同期エンドポイントは anyio の共有スレッドプールで実行されるため、DBが遅くなると
+リクエストが見えないところで積み上がり、クライアントのタイムアウトまで待たされる。
+APIリクエストをレーンに分け、レーンごとに同時実行数と待ち行列を制限する。
+
+- cheap: ヘルスチェック・/api/me など軽いエンドポイント（制限なし）
+- heavy: ダッシュボード・統計など集計を伴うエンドポイントと、それらをまとめて実行するバッチ
+- default: その他のAPI
+待ち行列が満杯、または待ち時間が上限を超えた場合は即座に503（Retry-After付き）を返す。
+待ち時間は Server-Timing ヘッダー（queue）と、/api/ready が返すレーンの統計で確認できる。
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHEAP_PATHS = frozenset({"/api/health", "/api/ready", "/api/me"})
+HEAVY_PREFIXES = ("/api/dashboard", "/api/stats", "/api/batch")
+
+_BUSY_BODY = json.dumps(
+    {"detail": "現在混み合っています。しばらくしてから再度お試しください。"}, ensure_ascii=False
+).encode("utf-8")
+
+
+class Lane:
+    """同時実行数と待ち行列を制限するレーン（イベントループ上でのみ使用）
+
+    limit=0 は無制限。空きができると待ち行列の先頭に実行枠を直接引き渡す。
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, timeout: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+
+    async def acquire(self) -> Optional[float]:
+        """実行枠を取得して待ち時間（秒）を返す。拒否した場合は None"""
+        if self.limit <= 0 or (self.in_flight < self.limit and not self._waiters):
+            self.in_flight += 1
+            self.admitted += 1
+            return 0.0
+
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            return None
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait({waiter}, timeout=self.timeout)
+        except BaseException:
+            self._abandon(waiter)
+            raise
+
+        if not waiter.done():
+            self._abandon(waiter)
+            self.rejected += 1
+            self.timed_out += 1
+            return None
+
+        waited = time.perf_counter() - started
+        self.admitted += 1
+        self.queue_time_total += waited
+        self.queue_time_max = max(self.queue_time_max, waited)
+        return waited
+
+    def release(self) -> None:
+        """実行枠を返す（待っているリクエストがあれば引き渡す）"""
+        if self.limit <= 0:
+            self.in_flight -= 1
+            return
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def _abandon(self, waiter: asyncio.Future) -> None:
+        """待機をやめたリクエストの後始末（引き渡し済みの枠は返す）"""
+        if waiter.done() and not waiter.cancelled():
+            self.release()
+            return
+        waiter.cancel()
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def stats(self) -> Dict[str, float]:
+        """レーンの統計"""
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "queue_ms_avg": round(self.queue_time_total / self.admitted * 1000, 2) if self.admitted else 0.0,
+            "queue_ms_max": round(self.queue_time_max * 1000, 2),
+        }
+
+
+class AdmissionController:
+    """パスからレーンを選ぶ"""
+
+    def __init__(self, lanes: Dict[str, Lane]):
+        self.lanes = lanes
+
+    @classmethod
+    def from_settings(cls) -> "AdmissionController":
+        """設定値からレーンを構築"""
+        queue = settings.ADMISSION_QUEUE_SIZE
+        timeout = settings.ADMISSION_QUEUE_TIMEOUT_MS / 1000
+        return cls({
+            "cheap": Lane("cheap", 0, 0, timeout),
+            "heavy": Lane("heavy", settings.ADMISSION_HEAVY_CONCURRENCY, queue, timeout),
+            "default": Lane("default", settings.ADMISSION_DEFAULT_CONCURRENCY, queue, timeout),
+        })
+
+    def lane_for(self, path: str) -> Optional[Lane]:
+        """APIパスのレーン（API以外は対象外）"""
+        if not path.startswith("/api/"):
+            return None
+        if path in CHEAP_PATHS:
+            return self.lanes["cheap"]
+        if path.startswith(HEAVY_PREFIXES):
+            return self.lanes["heavy"]
+        return self.lanes["default"]
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """全レーンの統計"""
+        return {name: lane.stats() for name, lane in self.lanes.items()}
+
+
+admission_controller = AdmissionController.from_settings()
+
+
+class AdmissionControlMiddleware:
+    """レーンごとの受付制御"""
+
+    def __init__(self, app: ASGIApp, controller: Optional[AdmissionController] = None):
+        self.app = app
+        self.controller = controller or admission_controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        lane = self.controller.lane_for(scope["path"]) if scope["type"] == "http" else None
+        if lane is None or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        waited = await lane.acquire()
+        if waited is None:
+            logger.warning("Admission rejected: lane=%s path=%s", lane.name, scope["path"])
+            await self._busy(send)
+            return
+
+        timing = f"queue;dur={waited * 1000:.1f}".encode("latin-1")
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"server-timing", timing)]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            lane.release()
+
+    @staticmethod
+    async def _busy(send: Send) -> None:
+        """503 レスポンスを返す"""
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(_BUSY_BODY)).encode("latin-1")),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": _BUSY_BODY})
@@ -0,0 +1,61 @@
+"""操作対象の赤ちゃん選択ミドルウェア
+
+リクエストボディを読まずに、ヘッダー・クエリ・クッキーから選択中の赤ちゃんIDを
+1回だけ解決して scope["state"] に保持する（純粋なASGIミドルウェア）。
+"""
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import parse_qsl
+
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# scope["state"] に保持するキー
+STATE_KEY = "baby_selection"
+
+
+@dataclass(frozen=True)
+class BabySelection:
+    """ボディを読まずに得られる赤ちゃんの選択情報"""
+    explicit: Optional[int] = None  # X-Baby-Id ヘッダー、またはクエリの baby_id
+    cookie: Optional[int] = None  # クッキーの selected_baby_id
+
+
+def _to_id(value: Optional[str]) -> Optional[int]:
+    """正の整数として解釈できる値のみ採用"""
+    try:
+        baby_id = int(value) if value else None
+    except ValueError:
+        return None
+    return baby_id if baby_id and baby_id > 0 else None
+
+
+def resolve_baby_selection(scope: Scope) -> BabySelection:
+    """ヘッダー → クエリ → クッキーの順で赤ちゃんIDを解決"""
+    header_id = None
+    cookie_header = None
+    for name, value in scope.get("headers", ()):
+        if name == b"x-baby-id":
+            header_id = _to_id(value.decode("latin-1"))
+        elif name == b"cookie":
+            cookie_header = value.decode("latin-1")
+
+    explicit = header_id
+    if explicit is None and scope.get("query_string"):
+        query = dict(parse_qsl(scope["query_string"].decode("latin-1")))
+        explicit = _to_id(query.get("baby_id"))
+
+    cookie = _to_id(cookie_parser(cookie_header).get("selected_baby_id")) if cookie_header else None
+    return BabySelection(explicit=explicit, cookie=cookie)
+
+
+class BabySelectionMiddleware:
+    """選択中の赤ちゃんIDを scope["state"] に設定する"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            scope.setdefault("state", {})[STATE_KEY] = resolve_baby_selection(scope)
+        await self.app(scope, receive, send)
@@ -1,26 +1,95 @@
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+"""CSRF対策ミドルウェア（純粋なASGI実装）
+
+BaseHTTPMiddleware はリクエストごとにタスクとメモリストリームを追加するため、
+scope / send のみを扱うASGIミドルウェアとして実装する。
+
+- csrf_token クッキーがなければ発行し、レスポンス開始時に Set-Cookie を付与
+- 更新系メソッドは X-CSRF-Token ヘッダーとクッキーを照合
+- ヘッダーのないフォーム送信のみ、ボディの csrf_token を dependencies.check_csrf で照合
+"""
+import json
 import secrets
+from http.cookies import SimpleCookie
+from typing import Optional
+
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CSRF_COOKIE_NAME = "csrf_token"
+UNSAFE_METHODS = frozenset({"POST", "PUT", "DELETE", "PATCH"})
+FORM_CONTENT_TYPES = ("multipart/form-data", "application/x-www-form-urlencoded")
+
+_FORBIDDEN_BODY = json.dumps({"detail": "CSRF token missing or incorrect"}).encode("utf-8")
+
+
+def _cookie_header(token: str) -> bytes:
+    """Set-Cookie ヘッダー値（JSから読めるよう HttpOnly なし）"""
+    cookie: SimpleCookie = SimpleCookie()
+    cookie[CSRF_COOKIE_NAME] = token
+    cookie[CSRF_COOKIE_NAME]["path"] = "/"
+    cookie[CSRF_COOKIE_NAME]["samesite"] = "lax"
+    return cookie.output(header="").strip().encode("latin-1")
+
+
+def tokens_match(submitted: Optional[str], expected: str) -> bool:
+    """送信されたトークンとクッキーのトークンを定数時間で比較"""
+    return bool(submitted) and secrets.compare_digest(submitted, expected)
+
+
+class CSRFCookieMiddleware:
+    """CSRFトークンの発行と検証"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        cookie_token = None
+        header_token = None
+        content_type = ""
+        for name, value in scope["headers"]:
+            if name == b"cookie":
+                cookie_token = cookie_parser(value.decode("latin-1")).get(CSRF_COOKIE_NAME)
+            elif name == b"x-csrf-token":
+                header_token = value.decode("latin-1")
+            elif name == b"content-type":
+                content_type = value.decode("latin-1")
 
-class CSRFCookieMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        csrf_token = request.cookies.get("csrf_token")
-        new_token = False
-        if not csrf_token:
-            csrf_token = secrets.token_urlsafe(32)
-            new_token = True
+        csrf_token = cookie_token or secrets.token_urlsafe(32)
+        state = scope.setdefault("state", {})
+        state["csrf_token"] = csrf_token
+        state["csrf_verified"] = False
 
-        request.state.csrf_token = csrf_token
+        send_wrapper = send
+        if not cookie_token:
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    message.setdefault("headers", [])
+                    message["headers"] = [*message["headers"], (b"set-cookie", _cookie_header(csrf_token))]
+                await send(message)
 
-        response = await call_next(request)
+        if scope["method"] in UNSAFE_METHODS:
+            if header_token is not None or not content_type.startswith(FORM_CONTENT_TYPES):
+                if not tokens_match(header_token, csrf_token):
+                    await self._forbidden(send_wrapper)
+                    return
+                state["csrf_verified"] = True
+            # ヘッダーのないフォーム送信はボディを読む check_csrf に任せる
 
-        if new_token:
-            response.set_cookie(
-                key="csrf_token",
-                value=csrf_token,
-                httponly=False,
-                samesite="lax",
-                secure=False  # Modify this based on environment if needed
-            )
+        await self.app(scope, receive, send_wrapper)
 
-        return response
+    @staticmethod
+    async def _forbidden(send: Send) -> None:
+        """403 レスポンスを返す"""
+        await send({
+            "type": "http.response.start",
+            "status": 403,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(_FORBIDDEN_BODY)).encode("latin-1")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": _FORBIDDEN_BODY})
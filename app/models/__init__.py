@@ -5,9 +5,12 @@ from app.models.family_user import FamilyUser
 from app.models.baby import Baby
 from app.models.baby_permission import BabyPermission
 from app.models.session import UserSession
+from app.models.revoked_session import RevokedSession
+from app.models.app_setting import AppSetting
 from app.models.feeding import Feeding
 from app.models.sleep import Sleep
 from app.models.diaper import Diaper
 from app.models.growth import Growth
 from app.models.schedule import Schedule
-from app.models.contraction import Contraction
\ No newline at end of file
+from app.models.contraction import Contraction
+from app.models.daily_stats import BabyDailyStats
@@ -0,0 +1,14 @@
+"""共有設定モデル"""
+from sqlalchemy import Column, String, DateTime
+
+from app.database import Base
+from app.utils.time import get_now_naive
+
+
+class AppSetting(Base):
+    """プロセス・インスタンス間で共有する値（起動時に1度だけ決める値など）"""
+    __tablename__ = "app_settings"
+
+    key = Column(String(64), primary_key=True)
+    value = Column(String, nullable=False)
+    updated_at = Column(DateTime, default=get_now_naive, nullable=False)
@@ -0,0 +1,171 @@
+"""日次集計モデル
+
+授乳・睡眠・おむつ記録を (赤ちゃん, 日付) 単位で集計した行。
+記録の追加・更新・削除はフラッシュ時に検出し、同じトランザクション内で差分を加算する
+（ルーター以外のスクリプト・テストからの書き込みも対象）。
+Query.delete() などの一括操作は検出できないため、rebuild_daily_stats.py で再構築する。
+
+日付は記録時刻（ローカル時刻で保存）の日付。睡眠は開始日に計上し、継続中の睡眠は含めない。
+"""
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import Column, Integer, Float, Date, ForeignKey, event, select, delete
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.baby import Baby
+from app.models.diaper import Diaper, DiaperType
+from app.models.feeding import Feeding
+from app.models.sleep import Sleep
+from app.utils.sql import increment_rows
+
+
+class BabyDailyStats(Base):
+    """日次集計テーブル"""
+    __tablename__ = "baby_daily_stats"
+
+    baby_id = Column(Integer, ForeignKey("babies.id", ondelete="CASCADE"), primary_key=True)
+    stat_date = Column(Date, primary_key=True)
+
+    feeding_count = Column(Integer, default=0, nullable=False)
+    feeding_amount_count = Column(Integer, default=0, nullable=False)  # 量が記録された授乳の回数
+    feeding_amount_ml = Column(Float, default=0, nullable=False)
+    sleep_count = Column(Integer, default=0, nullable=False)  # 完了した睡眠の回数
+    sleep_seconds = Column(Integer, default=0, nullable=False)
+    diaper_wet = Column(Integer, default=0, nullable=False)
+    diaper_dirty = Column(Integer, default=0, nullable=False)
+    diaper_both = Column(Integer, default=0, nullable=False)
+
+
+STAT_COLUMNS = (
+    "feeding_count", "feeding_amount_count", "feeding_amount_ml",
+    "sleep_count", "sleep_seconds",
+    "diaper_wet", "diaper_dirty", "diaper_both",
+)
+
+StatsKey = Tuple[int, date]
+Deltas = Dict[StatsKey, Dict[str, float]]
+
+# 集計対象のモデルと、集計に使う列
+TRACKED_COLUMNS = {
+    Feeding: (Feeding.id, Feeding.baby_id, Feeding.feeding_time, Feeding.amount_ml),
+    Sleep: (Sleep.id, Sleep.baby_id, Sleep.start_time, Sleep.duration_seconds),
+    Diaper: (Diaper.id, Diaper.baby_id, Diaper.change_time, Diaper.diaper_type),
+}
+
+_DIAPER_COLUMNS = {
+    DiaperType.WET: "diaper_wet",
+    DiaperType.DIRTY: "diaper_dirty",
+    DiaperType.BOTH: "diaper_both",
+}
+
+_PENDING_KEY = "daily_stats_pending"
+
+
+def contribution(model, row) -> Optional[Tuple[StatsKey, Dict[str, float]]]:
+    """記録1件が集計行に加える値（集計対象外なら None）"""
+    if model is Feeding:
+        _, baby_id, at, amount_ml = row
+        values = {"feeding_count": 1}
+        if amount_ml is not None:
+            values["feeding_amount_count"] = 1
+            values["feeding_amount_ml"] = amount_ml
+    elif model is Sleep:
+        _, baby_id, at, duration_seconds = row
+        if duration_seconds is None:
+            return None
+        values = {"sleep_count": 1, "sleep_seconds": duration_seconds}
+    else:
+        _, baby_id, at, diaper_type = row
+        values = {_DIAPER_COLUMNS[DiaperType(diaper_type)]: 1}
+    return (baby_id, _to_date(at)), values
+
+
+def _to_date(value) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+def accumulate(deltas: Deltas, model, rows: Iterable, sign: int) -> None:
+    """記録の寄与を符号付きで deltas に加算"""
+    for row in rows:
+        item = contribution(model, row)
+        if item is None:
+            continue
+        key, values = item
+        target = deltas[key]
+        for column, value in values.items():
+            target[column] = target.get(column, 0) + sign * value
+
+
+def load_rows(connection, model, ids: Iterable[int]) -> List:
+    """記録の現在の値をDBから読み込む"""
+    ids = list(ids)
+    if not ids:
+        return []
+    return connection.execute(select(*TRACKED_COLUMNS[model]).where(model.id.in_(ids))).all()
+
+
+def apply_deltas(connection, deltas: Deltas, skip_babies: Set[int] = frozenset()) -> None:
+    """差分を集計行に加算（行がなければ作成）"""
+    rows = []
+    for (baby_id, stat_date), values in deltas.items():
+        if baby_id in skip_babies or not any(values.values()):
+            continue
+        rows.append({
+            "baby_id": baby_id,
+            "stat_date": stat_date,
+            **{column: values.get(column, 0) for column in STAT_COLUMNS},
+        })
+    increment_rows(connection, BabyDailyStats, rows, ("baby_id", "stat_date"), STAT_COLUMNS)
+
+
+@event.listens_for(Session, "before_flush")
+def _capture_previous_values(session, flush_context, instances):
+    """更新・削除される記録の変更前の値を読み込み、寄与を差し引く"""
+    session.info.pop(_PENDING_KEY, None)
+    removed: Dict[type, Set[int]] = defaultdict(set)
+    updated: Dict[type, Set[int]] = defaultdict(set)
+    deleted_babies = set()
+    for obj in session.deleted:
+        if type(obj) in TRACKED_COLUMNS and obj.id is not None:
+            removed[type(obj)].add(obj.id)
+        elif isinstance(obj, Baby) and obj.id is not None:
+            deleted_babies.add(obj.id)
+    for obj in session.dirty:
+        if type(obj) in TRACKED_COLUMNS and session.is_modified(obj, include_collections=False):
+            updated[type(obj)].add(obj.id)
+    has_new = any(type(obj) in TRACKED_COLUMNS for obj in session.new)
+    if not (removed or updated or deleted_babies or has_new):
+        return
+
+    deltas: Deltas = defaultdict(dict)
+    if removed or updated:
+        connection = session.connection()
+        for model in TRACKED_COLUMNS:
+            accumulate(deltas, model, load_rows(connection, model, removed[model] | updated[model]), -1)
+    session.info[_PENDING_KEY] = (deltas, updated, deleted_babies)
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_new_values(session, flush_context):
+    """追加・更新された記録の変更後の値を加算し、差分を集計行に反映"""
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending is None:
+        return
+    deltas, updated, deleted_babies = pending
+
+    current: Dict[type, Set[int]] = defaultdict(set, {model: set(ids) for model, ids in updated.items()})
+    for obj in session.new:
+        if type(obj) in TRACKED_COLUMNS:
+            current[type(obj)].add(obj.id)
+
+    connection = session.connection()
+    for model, ids in current.items():
+        accumulate(deltas, model, load_rows(connection, model, ids), 1)
+
+    apply_deltas(connection, deltas, skip_babies=deleted_babies)
+    if deleted_babies:
+        # 外部キー制約のないDB（SQLite）でも削除された赤ちゃんの集計を残さない
+        connection.execute(delete(BabyDailyStats).where(BabyDailyStats.baby_id.in_(deleted_babies)))
@@ -16,6 +16,8 @@ class Family(Base):
     name = Column(String, nullable=False)
     invite_code = Column(String, unique=True, index=True, nullable=False)
     created_at = Column(DateTime, default=get_now_naive, nullable=False)
+    # 権限・メンバー・赤ちゃんの変更ごとに進める（プロセスをまたいだ権限キャッシュの無効化に使用）
+    permission_version = Column(Integer, default=0, server_default="0", nullable=False)
 
     # リレーション
     members = relationship("FamilyUser", back_populates="family", cascade="all, delete-orphan")
@@ -0,0 +1,16 @@
+"""失効セッションモデル"""
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+
+from app.database import Base
+
+
+class RevokedSession(Base):
+    """署名付きセッションの失効記録（SESSION_MODE=signed のログアウト）
+
+    user_sessions とは別のテーブルに保存し、db モードのセッション検索に混ざらないようにする。
+    """
+    __tablename__ = "revoked_sessions"
+
+    digest = Column(String(32), primary_key=True)  # トークンの SHA-256 先頭16バイト（16進）
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)  # 元のトークンの有効期限
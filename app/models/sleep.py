@@ -1,6 +1,7 @@
 """睡眠記録モデル"""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from typing import Optional
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, event, text
 from sqlalchemy.orm import relationship
 from app.utils.time import get_now_naive
 
@@ -16,21 +17,48 @@ class Sleep(Base):
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     start_time = Column(DateTime, default=get_now_naive, nullable=False, index=True)
     end_time = Column(DateTime, nullable=True)  # 継続中の場合はNull
+    # 睡眠時間（秒）。終了・更新時に保存時のイベントで設定（継続中はNull）
+    duration_seconds = Column(Integer, nullable=True)
     notes = Column(String, nullable=True)
 
+    __table_args__ = (
+        # 継続中の睡眠（end_time IS NULL）は赤ちゃんごとに1件まで（検索にも使う部分インデックス）
+        Index(
+            "uq_sleeps_ongoing_baby", "baby_id",
+            unique=True,
+            postgresql_where=text("end_time IS NULL"),
+            sqlite_where=text("end_time IS NULL"),
+        ),
+    )
+
     # リレーション
     baby = relationship("Baby", back_populates="sleeps")
     user = relationship("User")
 
+    @staticmethod
+    def compute_duration_seconds(start_time: datetime, end_time: Optional[datetime]) -> Optional[int]:
+        """開始・終了時刻から睡眠時間（秒）を計算"""
+        if end_time is None or start_time is None:
+            return None
+        return int((end_time - start_time).total_seconds())
+
     @property
     def duration_minutes(self) -> int:
-        """睡眠時間（分）を計算"""
-        if not self.end_time:
-            return 0
-        delta = self.end_time - self.start_time
-        return int(delta.total_seconds() / 60)
+        """睡眠時間（分）"""
+        seconds = self.duration_seconds
+        if seconds is None:
+            # 保存前の記録
+            seconds = Sleep.compute_duration_seconds(self.start_time, self.end_time) or 0
+        return int(seconds / 60)
 
     @property
     def is_ongoing(self) -> bool:
         """継続中かどうか"""
         return self.end_time is None
+
+
+@event.listens_for(Sleep, "before_insert")
+@event.listens_for(Sleep, "before_update")
+def _set_duration_seconds(mapper, connection, target: Sleep) -> None:
+    """保存時に睡眠時間を開始・終了時刻に合わせる"""
+    target.duration_seconds = Sleep.compute_duration_seconds(target.start_time, target.end_time)
@@ -3,6 +3,7 @@ import secrets
 from fastapi import APIRouter, Depends, Request, Form, Response, HTTPException, status
 from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.database import get_db
 from typing import Optional
@@ -11,6 +12,10 @@ from app.models.family import Family
 from app.models.family_user import FamilyUser
 from app.models.session import UserSession, SESSION_MAX_AGE_DAYS
 from app.services.auth_service import AuthService
+from app.services.password_hasher import password_hasher, PasswordHasherBusy
+from app.services.rate_limiter import TokenBucketLimiter
+from app.services.session_cache import session_cache
+from app.services.signed_session import signed_sessions
 from app.dependencies import get_current_user_optional
 from app.config import settings
 from app.schemas.user import UserLogin, UserRegisterRequest, UserResponse
@@ -20,6 +25,27 @@ router = APIRouter(tags=["auth"])
 # Cookie設定
 COOKIE_MAX_AGE = 86400 * SESSION_MAX_AGE_DAYS
 
+# ログイン・登録のレート制限（ユーザー名とクライアントIPの両方で判定）
+login_rate_limiter = TokenBucketLimiter(
+    capacity=settings.LOGIN_RATE_LIMIT_BURST,
+    refill_per_second=settings.LOGIN_RATE_LIMIT_PER_MINUTE / 60,
+)
+
+
+def _enforce_rate_limit(request: Request, username: str) -> None:
+    """レート制限を超えていれば DB検索・ハッシュ計算の前に 429 を返す"""
+    client_ip = request.client.host if request.client else "unknown"
+    retry_after = max(
+        login_rate_limiter.acquire(f"ip:{client_ip}"),
+        login_rate_limiter.acquire(f"user:{username.lower()}"),
+    )
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="試行回数が多すぎます。しばらくしてから再度お試しください。",
+            headers={"Retry-After": str(int(retry_after) + 1)},
+        )
+
 
 def _set_session_cookie(response: Response, token: str) -> None:
     """セッションCookieを設定"""
@@ -34,7 +60,13 @@ def _set_session_cookie(response: Response, token: str) -> None:
 
 
 def _create_session(db: Session, user_id: int) -> str:
-    """DBにセッションレコードを作成し、トークンを返す"""
+    """DBにセッションレコードを作成し、トークンを返す
+
+    SESSION_MODE=signed の場合はDBに書き込まず署名付きトークンを発行する。
+    """
+    if settings.SESSION_MODE == "signed":
+        return signed_sessions.issue(user_id)
+
     token = secrets.token_urlsafe(32)
     user_session = UserSession(
         token=token,
@@ -48,44 +80,21 @@ def _create_session(db: Session, user_id: int) -> str:
 
 
 
-@router.post("/login", response_model=dict)
-def login(
-    request: Request,
-    login_data: UserLogin,
-    response: Response,
-    db: Session = Depends(get_db),
-):
-    """ログイン処理"""
-    user = db.query(User).filter(User.username == login_data.username).first()
-
-    if not user or not AuthService.verify_password(login_data.password, user.hashed_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="ユーザー名またはパスワードが正しくありません",
-        )
-
-    # セッション作成
-    token = _create_session(db, user.id)
-
-    _set_session_cookie(response, token)
-    return {"message": "Login successful", "user": UserResponse.model_validate(user)}
-
+def _get_user_by_username(db: Session, username: str) -> Optional[User]:
+    """ユーザー名でユーザーを検索"""
+    return db.query(User).filter(User.username == username).first()
 
 
+def _update_password_hash(db: Session, user: User, hashed_password: str) -> None:
+    """パスワードハッシュを更新"""
+    user.hashed_password = hashed_password
+    db.commit()
+    db.refresh(user)
 
-@router.post("/register", response_model=dict)
-def register(
-    request: Request,
-    register_data: UserRegisterRequest,
-    response: Response,
-    db: Session = Depends(get_db),
-):
-    """ユーザー登録処理"""
-    # 1. ハニーポットチェック
-    if register_data.email_confirm_hidden:
-        raise HTTPException(status_code=400, detail="Bot detected")
 
-    # 2. 招待コード検証
+def _validate_registration(db: Session, register_data: UserRegisterRequest) -> Optional[Family]:
+    """招待コードとユーザー名を検証し、参加先の家族を返す"""
+    # 招待コード検証
     invite_code = register_data.invite_code
     is_valid_system_code = (invite_code == settings.SYSTEM_INVITE_CODE)
     family = db.query(Family).filter(Family.invite_code == invite_code.upper()).first()
@@ -96,21 +105,22 @@ def register(
             detail="無効な招待コードです。管理者からコードを取得してください。",
         )
 
-    # 3. ユーザー名の重複チェック
-    existing_user = db.query(User).filter(User.username == register_data.username).first()
-    if existing_user:
+    # ユーザー名の重複チェック
+    if _get_user_by_username(db, register_data.username):
         raise HTTPException(
             status_code=400,
             detail="このユーザー名は既に使用されています",
         )
 
-    # 4. ユーザー作成
-    hashed_password = AuthService.get_password_hash(register_data.password)
-    new_user = User(username=register_data.username, hashed_password=hashed_password)
+    return family
+
+
+def _create_user(db: Session, username: str, hashed_password: str, family: Optional[Family]) -> User:
+    """ユーザーを作成し、家族招待コードの場合は自動参加させる"""
+    new_user = User(username=username, hashed_password=hashed_password)
     db.add(new_user)
     db.flush()
 
-    # 5. 家族招待コードの場合は自動参加
     if family:
         family_user = FamilyUser(
             family_id=family.id,
@@ -121,12 +131,76 @@ def register(
 
     db.commit()
     db.refresh(new_user)
+    return new_user
+
+
+# bcrypt はプロセスプールで実行し、DBアクセスのみスレッドプールに渡す
+@router.post("/login", response_model=dict)
+async def login(
+    request: Request,
+    login_data: UserLogin,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    """ログイン処理"""
+    _enforce_rate_limit(request, login_data.username)
+
+    user = await run_in_threadpool(_get_user_by_username, db, login_data.username)
+
+    if not user or not await password_hasher.verify(login_data.password, user.hashed_password):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="ユーザー名またはパスワードが正しくありません",
+        )
+
+    # コストが現在の設定と異なるハッシュは透過的に再ハッシュ
+    if AuthService.needs_rehash(user.hashed_password):
+        try:
+            new_hash = await password_hasher.hash(login_data.password)
+        except PasswordHasherBusy:
+            new_hash = None  # 混雑時は次回ログインに持ち越す
+        if new_hash:
+            await run_in_threadpool(_update_password_hash, db, user, new_hash)
+
+    # コミットで属性が期限切れになる前にレスポンスを構築
+    user_response = UserResponse.model_validate(user)
+
+    # セッション作成
+    token = await run_in_threadpool(_create_session, db, user.id)
+
+    _set_session_cookie(response, token)
+    return {"message": "Login successful", "user": user_response}
+
+
+@router.post("/register", response_model=dict)
+async def register(
+    request: Request,
+    register_data: UserRegisterRequest,
+    response: Response,
+    db: Session = Depends(get_db),
+):
+    """ユーザー登録処理"""
+    _enforce_rate_limit(request, register_data.username)
+
+    # 1. ハニーポットチェック
+    if register_data.email_confirm_hidden:
+        raise HTTPException(status_code=400, detail="Bot detected")
+
+    # 2. 招待コード検証・ユーザー名の重複チェック
+    family = await run_in_threadpool(_validate_registration, db, register_data)
+
+    # 3. ユーザー作成（家族招待コードの場合は自動参加）
+    hashed_password = await password_hasher.hash(register_data.password)
+    new_user = await run_in_threadpool(
+        _create_user, db, register_data.username, hashed_password, family
+    )
+    user_response = UserResponse.model_validate(new_user)
 
-    # 6. 自動ログイン
-    token = _create_session(db, new_user.id)
+    # 4. 自動ログイン
+    token = await run_in_threadpool(_create_session, db, new_user.id)
 
     _set_session_cookie(response, token)
-    return {"message": "Registration successful", "user": UserResponse.model_validate(new_user)}
+    return {"message": "Registration successful", "user": user_response}
 
 
 @router.get("/me", response_model=UserResponse)
@@ -152,14 +226,18 @@ def logout(
     # Cookieからトークンを取得
     session_token = request.cookies.get("session_token")
 
-    # DBからセッション削除
+    # キャッシュとDBからセッション削除
     if session_token:
-        user_session = db.query(UserSession).filter(
-            UserSession.token == session_token
-        ).first()
-        if user_session:
-            db.delete(user_session)
-            db.commit()
+        session_cache.invalidate(session_token)
+        if settings.SESSION_MODE == "signed":
+            signed_sessions.revoke(db, session_token)
+        else:
+            user_session = db.query(UserSession).filter(
+                UserSession.token == session_token
+            ).first()
+            if user_session:
+                db.delete(user_session)
+                db.commit()
 
     response.delete_cookie(key="session_token")
     return {"message": "Logout successful"}
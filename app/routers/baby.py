@@ -1,5 +1,5 @@
 """赤ちゃん管理ルーター（JSON API専用）"""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from datetime import date
 from typing import List
@@ -10,6 +10,8 @@ from app.models.baby import Baby
 from app.models.family import Family
 from app.dependencies import get_current_user, get_current_family, admin_required
 from app.services.permission_service import PermissionService
+from app.schemas.responses import BabyBasicInfo
+from app.services.viewable_babies import ViewableBabiesService
 
 router = APIRouter(prefix="/babies", tags=["baby"])
 
@@ -34,6 +36,11 @@ class BabiesListResponse(BaseModel):
     family_name: str
 
 
+class ViewableBabiesResponse(BaseModel):
+    """閲覧可能な赤ちゃん一覧レスポンス（ナビゲーション用）"""
+    babies: List[BabyBasicInfo]
+
+
 class BabyCreateRequest(BaseModel):
     """赤ちゃん作成リクエスト"""
     name: str
@@ -49,7 +56,7 @@ class BabyBornRequest(BaseModel):
 # ===== JSON API エンドポイント =====
 
 @router.get("", response_model=BabiesListResponse)
-async def list_babies(
+def list_babies(
     db: Session = Depends(get_db),
     user = Depends(get_current_user),
     family: Family = Depends(get_current_family)
@@ -73,8 +80,31 @@ async def list_babies(
     )
 
 
+@router.get("/viewable", response_model=ViewableBabiesResponse)
+def list_viewable_babies(
+    request: Request,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user),
+    family: Family = Depends(get_current_family)
+):
+    """
+    閲覧可能な赤ちゃん一覧を取得（JSON専用）
+
+    記録一覧APIの viewable_babies と同じ内容。シリアライズ済みの結果をキャッシュし、
+    If-None-Match が一致する場合は 304 を返す。
+    """
+    viewable = ViewableBabiesService.get(db, user.id, family)
+    headers = {"ETag": viewable.etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if viewable.etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=viewable.body, media_type="application/json", headers=headers)
+
+
 @router.post("", response_model=BabyResponse)
-async def create_baby(
+def create_baby(
     baby_data: BabyCreateRequest,
     db: Session = Depends(get_db),
     family = Depends(get_current_family),
@@ -94,7 +124,7 @@ async def create_baby(
 
 
 @router.post("/{baby_id}/born", response_model=BabyResponse)
-async def baby_born(
+def baby_born(
     baby_id: int,
     born_data: BabyBornRequest,
     db: Session = Depends(get_db),
@@ -114,7 +144,7 @@ async def baby_born(
 
 
 @router.delete("/{baby_id}", response_model=dict)
-async def delete_baby(
+def delete_baby(
     baby_id: int,
     db: Session = Depends(get_db),
     family = Depends(get_current_family),
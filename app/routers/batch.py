@@ -0,0 +1,235 @@
+"""バッチAPIルーター（JSON API専用）
+
+画面表示に必要な複数のGET APIを1回のリクエストでまとめて実行する。
+内部リクエストは親リクエストで解決済みの認証コンテキストとDBセッションを共有するため、
+セッション検索・家族の解決・権限の読み込みは1回で済む。
+
+実行できるのは BATCH_ALLOWED_PATHS の読み取り専用GETのみ。バッチ自体は受付制御の heavy レーンで
+1枠を使い、内部リクエストはその枠の中で1件ずつ実行する（同時実行数の上限を超えない）。
+"""
+import logging
+import re
+import time
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.exceptions import ExceptionMiddleware
+from starlette.types import ASGIApp
+
+from app.config import settings
+from app.database import get_db, SHARED_DB_STATE_KEY
+from app.dependencies import AuthContext, get_auth_context
+from app.middleware.baby_selection import STATE_KEY as BABY_SELECTION_KEY, resolve_baby_selection
+from app.utils.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["batch"])
+
+# 内部リクエストに引き継ぐヘッダー（X-Baby-Id は各パスのクエリを優先するため引き継がない）
+_FORWARDED_HEADERS = frozenset({b"cookie", b"accept", b"accept-language", b"user-agent", b"host"})
+
+# バッチで実行できる読み取り専用のGETパス（{...} はIDの数字）
+BATCH_ALLOWED_PATHS = (
+    "/api/me",
+    "/api/families/me",
+    "/api/families/members",
+    "/api/families/members/{target_user_id}/permissions",
+    "/api/babies",
+    "/api/babies/viewable",
+    "/api/dashboard/data",
+    "/api/dashboard/family",
+    "/api/feedings",
+    "/api/feedings/{feeding_id}",
+    "/api/sleeps",
+    "/api/sleeps/{sleep_id}",
+    "/api/diapers",
+    "/api/diapers/{diaper_id}",
+    "/api/growths",
+    "/api/growths/{growth_id}",
+    "/api/schedules",
+    "/api/contractions",
+    "/api/contractions/list",
+    "/api/stats/histogram",
+    "/api/stats/trends",
+)
+
+
+def _path_pattern(template: str) -> str:
+    """パステンプレートを正規表現にする"""
+    return "".join(
+        "[0-9]+" if part.startswith("{") else re.escape(part)
+        for part in re.split(r"(\{[^}]+\})", template)
+    )
+
+
+_ALLOWED_PATH_RE = re.compile("|".join(_path_pattern(template) for template in BATCH_ALLOWED_PATHS))
+
+
+# ===== スキーマ =====
+
+class BatchRequestItem(BaseModel):
+    """バッチ内の1リクエスト"""
+    path: str  # BATCH_ALLOWED_PATHS のGETパス（クエリ文字列を含めてよい）
+    key: Optional[str] = None  # レスポンスのキー（省略時は path）
+
+
+class BatchRequest(BaseModel):
+    """バッチリクエスト"""
+    requests: List[BatchRequestItem]
+
+
+class BatchResponseItem(BaseModel):
+    """バッチ内の1レスポンス"""
+    status: int
+    duration_ms: float
+    body: Any = None
+
+
+class BatchResponse(BaseModel):
+    """バッチレスポンス（キーごとの結果）"""
+    responses: Dict[str, BatchResponseItem]
+
+
+# ===== 内部リクエストの実行 =====
+
+def _inner_app(request: Request) -> ASGIApp:
+    """ミドルウェアを通さず、例外ハンドラーのみを適用したルーター"""
+    app = request.app
+    inner = getattr(app.state, "batch_inner_app", None)
+    if inner is None:
+        handlers = {
+            key: handler for key, handler in app.exception_handlers.items()
+            if key not in (500, Exception)
+        }
+        inner = ExceptionMiddleware(app.router, handlers=handlers)
+        app.state.batch_inner_app = inner
+    return inner
+
+
+async def _run_subrequest(
+    request: Request,
+    path: str,
+    context: AuthContext,
+    db: Session,
+) -> Tuple[int, bytes, bool]:
+    """内部GETリクエストを実行し、(ステータス, ボディ, JSONかどうか) を返す"""
+    url = urlsplit(path)
+    parent = request.scope
+    scope = {
+        "type": "http",
+        "asgi": parent.get("asgi", {"version": "3.0"}),
+        "http_version": parent.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": parent.get("scheme", "http"),
+        "server": parent.get("server"),
+        "client": parent.get("client"),
+        "root_path": "",
+        "path": url.path,
+        "raw_path": url.path.encode("latin-1"),
+        "query_string": url.query.encode("latin-1"),
+        "headers": [(k, v) for k, v in parent["headers"] if k in _FORWARDED_HEADERS],
+        "app": request.app,
+        "state": {"auth_context": context, SHARED_DB_STATE_KEY: db},
+    }
+    # BabySelectionMiddleware と同じ解決（パスに指定がなければバッチリクエストの選択を引き継ぐ）
+    selection = resolve_baby_selection(scope)
+    parent_selection = parent.get("state", {}).get(BABY_SELECTION_KEY)
+    if selection.explicit is None and parent_selection is not None:
+        selection = replace(selection, explicit=parent_selection.explicit)
+    scope["state"][BABY_SELECTION_KEY] = selection
+
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        return {"type": "http.disconnect"}
+
+    status = 500
+    chunks: List[bytes] = []
+    is_json = False
+
+    async def send(message):
+        nonlocal status, is_json
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+            is_json = content_type.startswith(b"application/json")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await _inner_app(request)(scope, receive, send)
+    return status, b"".join(chunks), is_json
+
+
+def _validate(batch_data: BatchRequest) -> List[Tuple[str, str]]:
+    """件数・パス・キーを検証して (キー, パス) のリストを返す"""
+    if len(batch_data.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"一度に実行できるリクエストは{settings.BATCH_MAX_REQUESTS}件までです"
+        )
+
+    items = []
+    for item in batch_data.requests:
+        path = urlsplit(item.path).path
+        if not _ALLOWED_PATH_RE.fullmatch(path):
+            raise HTTPException(status_code=400, detail=f"実行できないパスです: {item.path}")
+        items.append((item.key or item.path, item.path))
+
+    if len({key for key, _ in items}) != len(items):
+        raise HTTPException(status_code=400, detail="キーが重複しています")
+    return items
+
+
+# ===== JSON API エンドポイント =====
+
+@router.post("/batch", response_model=BatchResponse)
+async def batch(
+    request: Request,
+    batch_data: BatchRequest,
+    context: AuthContext = Depends(get_auth_context),
+    db: Session = Depends(get_db),
+):
+    """
+    複数のGET APIをまとめて実行（JSON専用）
+
+    内部リクエストは順番に実行し、キーごとにステータス・所要時間・ボディを返す。
+    各ボディはシリアライズ済みのJSONをそのまま埋め込む。
+    """
+    items = _validate(batch_data)
+
+    parts = []
+    for key, path in items:
+        started = time.perf_counter()
+        try:
+            status, body, is_json = await _run_subrequest(request, path, context, db)
+        except Exception:
+            logger.exception("Batch sub-request failed: %s", path)
+            await run_in_threadpool(db.rollback)
+            status, body, is_json = 500, b"", False
+        duration_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        if not body:
+            body_json = b"null"
+        elif is_json:
+            body_json = body
+        else:
+            body_json = dumps(body.decode("utf-8", "replace"))
+        parts.append(
+            dumps(key) + b':{"status":' + dumps(status)
+            + b',"duration_ms":' + dumps(duration_ms)
+            + b',"body":' + body_json + b"}"
+        )
+
+    content = b'{"responses":{' + b",".join(parts) + b"}}"
+    return Response(content=content, media_type="application/json")
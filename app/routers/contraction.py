@@ -1,7 +1,7 @@
 """陣痛タイマールーター（JSON API専用）"""
 from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.utils.time import get_now_naive
 
@@ -11,21 +11,22 @@ from app.models.user import User
 from app.models.baby import Baby
 from app.models.family import Family
 from app.models.contraction import Contraction
-from app.schemas.contraction import ContractionUpdate, ContractionCreate, ContractionResponse
-from app.schemas.responses import BabyBasicInfo
+from app.schemas.contraction import ContractionUpdate, ContractionCreate, ContractionResponse, ContractionListResponse
 from app.services.contraction_service import ContractionService
-from app.services.permission_service import PermissionService
+from app.services.viewable_babies import ViewableBabiesService
+from app.utils.serialization import validated_response
 
 router = APIRouter(prefix="/contractions", tags=["contractions"])
 
 
-@router.get("", response_model=dict)
-async def contraction_timer(
+@router.get("", response_model=ContractionListResponse)
+def contraction_timer(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
     family: Family = Depends(get_current_family),
     baby: Baby = Depends(get_current_baby),
-    _ = Depends(check_record_permission("contraction"))
+    _ = Depends(check_record_permission("contraction")),
+    include_viewable: bool = Query(True, description="false の場合 viewable_babies を省略"),
 ):
     """陣痛タイマーページ / 陣痛一覧API（JSON専用）"""
     # 継続中の陣痛を取得
@@ -43,23 +44,22 @@ async def contraction_timer(
     stats = ContractionService.get_statistics(db, baby.id, hours=1)
 
     # 閲覧可能な赤ちゃんリストを取得（グローバルナビゲーション用）
-    baby_ids = [b.id for b in family.babies]
-    perms_map = PermissionService.get_user_permissions_batch(
-        db, user.id, baby_ids, family.id, "basic_info"
+    viewable_babies = (
+        list(ViewableBabiesService.get(db, user.id, family).babies) if include_viewable else None
     )
-    viewable_babies = [b for b in family.babies if perms_map.get(b.id, False)]
 
-    return {
-        "items": [ContractionResponse.model_validate(c) for c in contractions],
-        "ongoing": ContractionResponse.model_validate(ongoing_contraction) if ongoing_contraction else None,
+    # ORM 行を1回だけ検証してそのままJSONにする
+    return validated_response(ContractionListResponse, {
+        "items": contractions,
+        "ongoing": ongoing_contraction,
         "stats": stats,
-        "baby": BabyBasicInfo.model_validate(baby),
-        "viewable_babies": [BabyBasicInfo.model_validate(b) for b in viewable_babies]
-    }
+        "baby": baby,
+        "viewable_babies": viewable_babies,
+    })
 
 
 @router.post("/start", response_model=ContractionResponse)
-async def start_contraction(
+def start_contraction(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
     baby: Baby = Depends(get_current_baby),
@@ -97,7 +97,7 @@ async def start_contraction(
 
 
 @router.post("/{contraction_id}/end", response_model=ContractionResponse)
-async def end_contraction(
+def end_contraction(
     contraction_id: int,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -133,8 +133,8 @@ async def end_contraction(
     return ContractionResponse.model_validate(contraction)
 
 
-@router.get("/list", response_model=dict)
-async def contraction_list(
+@router.get("/list", response_model=ContractionListResponse)
+def contraction_list(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
     baby: Baby = Depends(get_current_baby),
@@ -147,14 +147,11 @@ async def contraction_list(
 
     stats = ContractionService.get_statistics(db, baby.id, hours=1)
 
-    return {
-        "items": [ContractionResponse.model_validate(c) for c in contractions],
-        "stats": stats
-    }
+    return validated_response(ContractionListResponse, {"items": contractions, "stats": stats})
 
 
 @router.post("", response_model=ContractionResponse)
-async def create_contraction(
+def create_contraction(
     data: ContractionCreate,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -181,7 +178,7 @@ async def create_contraction(
 
 
 @router.put("/{contraction_id}", response_model=ContractionResponse)
-async def update_contraction(
+def update_contraction(
     contraction_id: int,
     data: ContractionUpdate,
     db: Session = Depends(get_db),
@@ -234,7 +231,7 @@ async def update_contraction(
 
 
 @router.delete("/{contraction_id}", response_model=dict)
-async def delete_contraction(
+def delete_contraction(
     contraction_id: int,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
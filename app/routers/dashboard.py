@@ -1,8 +1,9 @@
 """ダッシュボードルーター（JSON API専用）"""
 from fastapi import APIRouter, Depends, Query, HTTPException
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 from datetime import date
-from typing import Optional, Any
+from typing import Optional, Any, List
 from pydantic import BaseModel
 
 from app.database import get_db
@@ -11,7 +12,13 @@ from app.models.user import User
 from app.models.family import Family
 from app.models.baby import Baby
 from app.services.statistics_service import StatisticsService
-from app.services.permission_service import PermissionService
+from app.schemas.diaper import DiaperResponse
+from app.schemas.feeding import FeedingResponse
+from app.schemas.growth import GrowthResponse
+from app.schemas.sleep import SleepResponse
+from app.services.dashboard_cache import dashboard_cache, permission_signature
+from app.services.permission_service import RECORD_TYPES, PermissionService
+from app.utils.serialization import get_type_adapter, validated_response
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
@@ -36,14 +43,21 @@ class PrenatalInfo(BaseModel):
     days: int
 
 
+class RecentRecords(BaseModel):
+    """最新記録（権限のない種類は空）"""
+    feedings: List[FeedingResponse] = []
+    sleeps: List[SleepResponse] = []
+    diapers: List[DiaperResponse] = []
+
+
 class DashboardDataResponse(BaseModel):
     """ダッシュボードデータレスポンス"""
     baby: Optional[BabyBasicInfo] = None
     feeding_stats: Optional[dict[str, Any]] = None
     sleep_stats: Optional[dict[str, Any]] = None
     diaper_stats: Optional[dict[str, Any]] = None
-    latest_growth: Optional[dict[str, Any]] = None
-    recent_records: Optional[dict[str, Any]] = None
+    latest_growth: Optional[GrowthResponse] = None
+    recent_records: Optional[RecentRecords] = None
     prenatal_info: Optional[PrenatalInfo] = None
     perms: dict[str, bool]
 
@@ -51,6 +65,21 @@ class DashboardDataResponse(BaseModel):
         from_attributes = True
 
 
+class FamilyBabyDashboard(BaseModel):
+    """家族ダッシュボードの赤ちゃん1人分（権限のない項目は null）"""
+    baby: BabyBasicInfo
+    feeding_stats: Optional[dict[str, Any]] = None
+    sleep_stats: Optional[dict[str, Any]] = None
+    diaper_stats: Optional[dict[str, Any]] = None
+    latest_growth: Optional[GrowthResponse] = None
+    perms: dict[str, bool]
+
+
+class FamilyDashboardResponse(BaseModel):
+    """家族ダッシュボードレスポンス"""
+    babies: List[FamilyBabyDashboard]
+
+
 # ===== JSON API エンドポイント =====
 
 @router.get("/data", response_model=DashboardDataResponse)
@@ -90,6 +119,62 @@ def get_dashboard_data(
     # 現在の赤ちゃんの権限を取得
     perms = PermissionService.get_user_permissions(db, user.id, baby.id, family.id)
 
+    # 同じ赤ちゃん・同じ権限の組み立て結果を再利用（記録の変更でバージョンが進む）
+    cache_key = (baby.id, permission_signature(perms))
+    body = dashboard_cache.get(cache_key)
+    if body is None:
+        version = dashboard_cache.version(baby.id)
+        body = _build_dashboard(db, baby, perms)
+        dashboard_cache.put(cache_key, version, body)
+
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/family", response_model=FamilyDashboardResponse)
+def get_family_dashboard(
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    family: Family = Depends(get_current_family)
+):
+    """
+    家族ダッシュボードデータ取得（JSON専用）
+
+    閲覧可能な赤ちゃん全員の統計と最新の成長記録を返す。
+    統計は記録タイプごとに GROUP BY baby_id で1回ずつ集計するため、赤ちゃんの人数によらずクエリ数は一定
+    """
+    babies = sorted(family.babies, key=lambda b: b.id)
+    baby_ids = [b.id for b in babies]
+    perms_map = {
+        record_type: PermissionService.get_user_permissions_batch(db, user.id, baby_ids, family.id, record_type)
+        for record_type in RECORD_TYPES
+    }
+    viewable_babies = [b for b in babies if perms_map["basic_info"][b.id]]
+
+    def permitted(record_type: str) -> List[int]:
+        return [b.id for b in viewable_babies if perms_map[record_type][b.id]]
+
+    feeding_stats = StatisticsService.get_feeding_stats_by_baby(db, permitted("feeding"))
+    sleep_stats = StatisticsService.get_sleep_stats_by_baby(db, permitted("sleep"))
+    diaper_stats = StatisticsService.get_diaper_stats_by_baby(db, permitted("diaper"))
+    latest_growth = StatisticsService.get_latest_growth_by_baby(db, permitted("growth"))
+
+    return validated_response(FamilyDashboardResponse, {
+        "babies": [
+            {
+                "baby": baby,
+                "feeding_stats": feeding_stats.get(baby.id),
+                "sleep_stats": sleep_stats.get(baby.id),
+                "diaper_stats": diaper_stats.get(baby.id),
+                "latest_growth": latest_growth.get(baby.id),
+                "perms": {record_type: perms_map[record_type][baby.id] for record_type in RECORD_TYPES},
+            }
+            for baby in viewable_babies
+        ]
+    })
+
+
+def _build_dashboard(db: Session, baby: Baby, perms: dict) -> bytes:
+    """ダッシュボードデータを組み立ててJSONにする"""
     # 権限がある項目のみ統計を取得
     feeding_stats = StatisticsService.get_feeding_stats(db, baby.id) if perms['feeding'] else None
     sleep_stats = StatisticsService.get_sleep_stats(db, baby.id) if perms['sleep'] else None
@@ -123,13 +208,15 @@ def get_dashboard_data(
             days=current_day
         )
 
-    return DashboardDataResponse(
-        baby=BabyBasicInfo.model_validate(baby) if baby else None,
-        feeding_stats=feeding_stats,
-        sleep_stats=sleep_stats,
-        diaper_stats=diaper_stats,
-        latest_growth=latest_growth,
-        recent_records=recent_records,
-        prenatal_info=prenatal_info,
-        perms=perms
-    )
+    adapter = get_type_adapter(DashboardDataResponse)
+    value = adapter.validate_python({
+        "baby": baby,
+        "feeding_stats": feeding_stats,
+        "sleep_stats": sleep_stats,
+        "diaper_stats": diaper_stats,
+        "latest_growth": latest_growth,
+        "recent_records": recent_records,
+        "prenatal_info": prenatal_info,
+        "perms": perms,
+    }, from_attributes=True)
+    return adapter.dump_json(value)
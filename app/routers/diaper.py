@@ -1,6 +1,6 @@
 """おむつ交換記録ルーター（JSON API専用）"""
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.utils.time import get_now_naive
 
@@ -11,19 +11,21 @@ from app.models.baby import Baby
 from app.models.family import Family
 from app.models.diaper import Diaper, DiaperType
 from app.schemas.diaper import DiaperCreate, DiaperUpdate, DiaperResponse, QuickDiaperRequest
-from app.schemas.responses import ListResponse, BabyBasicInfo
-from app.services.permission_service import PermissionService
+from app.schemas.responses import ListResponse
+from app.services.viewable_babies import ViewableBabiesService
+from app.utils.serialization import validated_response
 
 router = APIRouter(prefix="/diapers", tags=["diapers"])
 
 
 @router.get("", response_model=ListResponse[DiaperResponse])
-async def list_diapers(
+def list_diapers(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
     family: Family = Depends(get_current_family),
     baby: Baby = Depends(get_current_baby),
-    _ = Depends(check_record_permission("diaper"))
+    _ = Depends(check_record_permission("diaper")),
+    include_viewable: bool = Query(True, description="false の場合 viewable_babies を省略"),
 ):
     """おむつ交換記録一覧（JSON専用）"""
     diapers = db.query(Diaper).filter(
@@ -31,21 +33,20 @@ async def list_diapers(
     ).order_by(Diaper.change_time.desc()).limit(50).all()
 
     # 閲覧可能な赤ちゃんリストを取得（グローバルナビゲーション用）
-    baby_ids = [b.id for b in family.babies]
-    perms_map = PermissionService.get_user_permissions_batch(
-        db, user.id, baby_ids, family.id, "basic_info"
+    viewable_babies = (
+        list(ViewableBabiesService.get(db, user.id, family).babies) if include_viewable else None
     )
-    viewable_babies = [b for b in family.babies if perms_map.get(b.id, False)]
 
-    return ListResponse(
-        items=[DiaperResponse.model_validate(d) for d in diapers],
-        baby=BabyBasicInfo.model_validate(baby),
-        viewable_babies=[BabyBasicInfo.model_validate(b) for b in viewable_babies]
-    )
+    # ORM 行を1回だけ検証してそのままJSONにする
+    return validated_response(ListResponse[DiaperResponse], {
+        "items": diapers,
+        "baby": baby,
+        "viewable_babies": viewable_babies,
+    })
 
 
 @router.post("/quick", response_model=DiaperResponse)
-async def quick_diaper(
+def quick_diaper(
     quick_data: QuickDiaperRequest,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -68,7 +69,7 @@ async def quick_diaper(
 
 
 @router.post("", response_model=DiaperResponse)
-async def create_diaper(
+def create_diaper(
     diaper_data: DiaperCreate,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -90,7 +91,7 @@ async def create_diaper(
 
 
 @router.get("/{diaper_id}", response_model=DiaperResponse)
-async def get_diaper(
+def get_diaper(
     diaper_id: int,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -110,7 +111,7 @@ async def get_diaper(
 
 
 @router.put("/{diaper_id}", response_model=DiaperResponse)
-async def update_diaper(
+def update_diaper(
     diaper_id: int,
     diaper_data: DiaperUpdate,
     db: Session = Depends(get_db),
@@ -139,7 +140,7 @@ async def update_diaper(
 
 
 @router.delete("/{diaper_id}", response_model=dict)
-async def delete_diaper(
+def delete_diaper(
     diaper_id: int,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
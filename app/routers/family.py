@@ -56,7 +56,7 @@ class PermissionUpdateRequest(BaseModel):
 # ===== JSON API エンドポイント =====
 
 @router.get("/me", response_model=FamilyResponse)
-async def get_my_family(
+def get_my_family(
     family: Family = Depends(get_current_family)
 ):
     """
@@ -68,7 +68,7 @@ async def get_my_family(
 
 
 @router.post("", response_model=FamilyResponse)
-async def create_family(
+def create_family(
     family_data: FamilyCreateRequest,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user)
@@ -79,7 +79,7 @@ async def create_family(
 
 
 @router.post("/join", response_model=FamilyResponse)
-async def join_family(
+def join_family(
     join_data: FamilyJoinRequest,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user)
@@ -93,7 +93,7 @@ async def join_family(
 
 
 @router.get("/members", response_model=List[MemberResponse])
-async def list_members(
+def list_members(
     db: Session = Depends(get_db),
     family: Family = Depends(get_current_family)
 ):
@@ -109,7 +109,7 @@ async def list_members(
 
 
 @router.post("/members/{target_user_id}/permissions", response_model=dict)
-async def update_member_permissions(
+def update_member_permissions(
     target_user_id: int,
     permissions_data: List[PermissionUpdateRequest],
     user: User = Depends(get_current_user),
@@ -129,17 +129,22 @@ async def update_member_permissions(
     if not target_fu:
         raise HTTPException(status_code=404, detail="メンバーが見つかりません")
 
-    # 更新実行
+    # 家族の赤ちゃん以外は更新させない
+    baby_ids = {baby.id for baby in family.babies}
+    if any(perm_data.baby_id not in baby_ids for perm_data in permissions_data):
+        raise HTTPException(status_code=404, detail="赤ちゃんが見つかりません")
+
+    # 一括更新（1回の UPSERT とコミット）
+    permissions_by_baby = {}
     for perm_data in permissions_data:
-        PermissionService.update_permissions(
-            db, target_user_id, perm_data.baby_id, perm_data.permissions
-        )
+        permissions_by_baby.setdefault(perm_data.baby_id, {}).update(perm_data.permissions)
+    PermissionService.update_permissions_bulk(db, target_user_id, family.id, permissions_by_baby)
 
     return {"success": True, "message": "権限を更新しました"}
 
 
 @router.get("/members/{target_user_id}/permissions", response_model=dict)
-async def get_member_permissions(
+def get_member_permissions(
     target_user_id: int,
     user: User = Depends(get_current_user),
     family: Family = Depends(get_current_family),
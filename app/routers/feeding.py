@@ -1,5 +1,5 @@
 """授乳記録ルーター（JSON API専用）"""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -9,19 +9,21 @@ from app.models.baby import Baby
 from app.models.family import Family
 from app.models.feeding import Feeding
 from app.schemas.feeding import FeedingResponse, FeedingCreate, FeedingUpdate
-from app.schemas.responses import ListResponse, BabyBasicInfo
-from app.services.permission_service import PermissionService
+from app.schemas.responses import ListResponse
+from app.services.viewable_babies import ViewableBabiesService
+from app.utils.serialization import validated_response
 
 router = APIRouter(prefix="/feedings", tags=["feedings"])
 
 
 @router.get("", response_model=ListResponse[FeedingResponse])
-async def list_feedings(
+def list_feedings(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
     family: Family = Depends(get_current_family),
     baby: Baby = Depends(get_current_baby),
-    _ = Depends(check_record_permission("feeding"))
+    _ = Depends(check_record_permission("feeding")),
+    include_viewable: bool = Query(True, description="false の場合 viewable_babies を省略"),
 ):
     """授乳記録一覧API"""
     feedings = db.query(Feeding).filter(
@@ -29,21 +31,20 @@ async def list_feedings(
     ).order_by(Feeding.feeding_time.desc()).limit(50).all()
 
     # 閲覧可能な赤ちゃんリストを取得
-    baby_ids = [b.id for b in family.babies]
-    perms_map = PermissionService.get_user_permissions_batch(
-        db, user.id, baby_ids, family.id, "basic_info"
+    viewable_babies = (
+        list(ViewableBabiesService.get(db, user.id, family).babies) if include_viewable else None
     )
-    viewable_babies = [b for b in family.babies if perms_map.get(b.id, False)]
 
-    return ListResponse(
-        items=[FeedingResponse.model_validate(f) for f in feedings],
-        baby=BabyBasicInfo.model_validate(baby),
-        viewable_babies=[BabyBasicInfo.model_validate(b) for b in viewable_babies]
-    )
+    # ORM 行を1回だけ検証してそのままJSONにする
+    return validated_response(ListResponse[FeedingResponse], {
+        "items": feedings,
+        "baby": baby,
+        "viewable_babies": viewable_babies,
+    })
 
 
 @router.post("", response_model=FeedingResponse)
-async def create_feeding(
+def create_feeding(
     data: FeedingCreate,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -65,7 +66,7 @@ async def create_feeding(
 
 
 @router.get("/{feeding_id}", response_model=FeedingResponse)
-async def get_feeding(
+def get_feeding(
     feeding_id: int,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -85,7 +86,7 @@ async def get_feeding(
 
 
 @router.put("/{feeding_id}", response_model=FeedingResponse)
-async def update_feeding(
+def update_feeding(
     feeding_id: int,
     data: FeedingUpdate,
     db: Session = Depends(get_db),
@@ -114,7 +115,7 @@ async def update_feeding(
 
 
 @router.delete("/{feeding_id}")
-async def delete_feeding(
+def delete_feeding(
     feeding_id: int,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
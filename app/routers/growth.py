@@ -1,6 +1,6 @@
 """成長記録ルーター（JSON API専用）"""
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -10,19 +10,21 @@ from app.models.baby import Baby
 from app.models.family import Family
 from app.models.growth import Growth
 from app.schemas.growth import GrowthCreate, GrowthUpdate, GrowthResponse
-from app.schemas.responses import ListResponse, BabyBasicInfo
-from app.services.permission_service import PermissionService
+from app.schemas.responses import ListResponse
+from app.services.viewable_babies import ViewableBabiesService
+from app.utils.serialization import validated_response
 
 router = APIRouter(prefix="/growths", tags=["growths"])
 
 
 @router.get("", response_model=ListResponse[GrowthResponse])
-async def list_growths(
+def list_growths(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
     family: Family = Depends(get_current_family),
     baby: Baby = Depends(get_current_baby),
-    _ = Depends(check_record_permission("growth"))
+    _ = Depends(check_record_permission("growth")),
+    include_viewable: bool = Query(True, description="false の場合 viewable_babies を省略"),
 ):
     """成長記録一覧（JSON専用）"""
     growths = db.query(Growth).filter(
@@ -30,21 +32,20 @@ async def list_growths(
     ).order_by(Growth.measurement_date.desc()).all()
 
     # 閲覧可能な赤ちゃんリストを取得（グローバルナビゲーション用）
-    baby_ids = [b.id for b in family.babies]
-    perms_map = PermissionService.get_user_permissions_batch(
-        db, user.id, baby_ids, family.id, "basic_info"
+    viewable_babies = (
+        list(ViewableBabiesService.get(db, user.id, family).babies) if include_viewable else None
     )
-    viewable_babies = [b for b in family.babies if perms_map.get(b.id, False)]
 
-    return ListResponse(
-        items=[GrowthResponse.model_validate(g) for g in growths],
-        baby=BabyBasicInfo.model_validate(baby),
-        viewable_babies=[BabyBasicInfo.model_validate(b) for b in viewable_babies]
-    )
+    # ORM 行を1回だけ検証してそのままJSONにする
+    return validated_response(ListResponse[GrowthResponse], {
+        "items": growths,
+        "baby": baby,
+        "viewable_babies": viewable_babies,
+    })
 
 
 @router.post("", response_model=GrowthResponse)
-async def create_growth(
+def create_growth(
     growth_data: GrowthCreate,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -66,7 +67,7 @@ async def create_growth(
 
 
 @router.get("/{growth_id}", response_model=GrowthResponse)
-async def get_growth(
+def get_growth(
     growth_id: int,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -86,7 +87,7 @@ async def get_growth(
 
 
 @router.put("/{growth_id}", response_model=GrowthResponse)
-async def update_growth(
+def update_growth(
     growth_id: int,
     growth_data: GrowthUpdate,
     db: Session = Depends(get_db),
@@ -115,7 +116,7 @@ async def update_growth(
 
 
 @router.delete("/{growth_id}", response_model=dict)
-async def delete_growth(
+def delete_growth(
     growth_id: int,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -1,6 +1,6 @@
 """スケジュール管理ルーター（JSON API専用）"""
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
 from app.database import get_db
@@ -10,19 +10,21 @@ from app.models.baby import Baby
 from app.models.family import Family
 from app.models.schedule import Schedule
 from app.schemas.schedule import ScheduleCreate, ScheduleUpdate, ScheduleResponse
-from app.schemas.responses import ListResponse, BabyBasicInfo
-from app.services.permission_service import PermissionService
+from app.schemas.responses import ListResponse
+from app.services.viewable_babies import ViewableBabiesService
+from app.utils.serialization import validated_response
 
 router = APIRouter(prefix="/schedules", tags=["schedules"])
 
 
 @router.get("", response_model=ListResponse[ScheduleResponse])
-async def list_schedules(
+def list_schedules(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
     family: Family = Depends(get_current_family),
     baby: Baby = Depends(get_current_baby),
-    _ = Depends(check_record_permission("schedule"))
+    _ = Depends(check_record_permission("schedule")),
+    include_viewable: bool = Query(True, description="false の場合 viewable_babies を省略"),
 ):
     """スケジュール一覧（JSON専用）"""
     schedules = db.query(Schedule).filter(
@@ -30,21 +32,20 @@ async def list_schedules(
     ).order_by(Schedule.scheduled_time.asc()).all()
 
     # 閲覧可能な赤ちゃんリストを取得（グローバルナビゲーション用）
-    baby_ids = [b.id for b in family.babies]
-    perms_map = PermissionService.get_user_permissions_batch(
-        db, user.id, baby_ids, family.id, "basic_info"
+    viewable_babies = (
+        list(ViewableBabiesService.get(db, user.id, family).babies) if include_viewable else None
     )
-    viewable_babies = [b for b in family.babies if perms_map.get(b.id, False)]
 
-    return ListResponse(
-        items=[ScheduleResponse.model_validate(s) for s in schedules],
-        baby=BabyBasicInfo.model_validate(baby),
-        viewable_babies=[BabyBasicInfo.model_validate(b) for b in viewable_babies]
-    )
+    # ORM 行を1回だけ検証してそのままJSONにする
+    return validated_response(ListResponse[ScheduleResponse], {
+        "items": schedules,
+        "baby": baby,
+        "viewable_babies": viewable_babies,
+    })
 
 
 @router.post("", response_model=ScheduleResponse)
-async def create_schedule(
+def create_schedule(
     schedule_data: ScheduleCreate,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -66,7 +67,7 @@ async def create_schedule(
 
 
 @router.post("/{schedule_id}/toggle", response_model=ScheduleResponse)
-async def toggle_schedule(
+def toggle_schedule(
     schedule_id: int,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -90,7 +91,7 @@ async def toggle_schedule(
 
 
 @router.put("/{schedule_id}", response_model=ScheduleResponse)
-async def update_schedule(
+def update_schedule(
     schedule_id: int,
     schedule_data: ScheduleUpdate,
     db: Session = Depends(get_db),
@@ -119,7 +120,7 @@ async def update_schedule(
 
 
 @router.delete("/{schedule_id}", response_model=dict)
-async def delete_schedule(
+def delete_schedule(
     schedule_id: int,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -1,7 +1,8 @@
 """睡眠記録ルーター（JSON API専用）"""
 from datetime import datetime
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from app.utils.time import get_now_naive
 
@@ -11,83 +12,93 @@ from app.models.user import User
 from app.models.baby import Baby
 from app.models.family import Family
 from app.models.sleep import Sleep
-from app.schemas.sleep import SleepCreate, SleepUpdate, SleepResponse
-from app.schemas.responses import ListResponse, BabyBasicInfo
-from app.services.permission_service import PermissionService
+from app.schemas.sleep import SleepCreate, SleepUpdate, SleepResponse, SleepListResponse
+from app.services.dashboard_cache import mark_dashboard_changed
+from app.services.viewable_babies import ViewableBabiesService
+from app.utils.serialization import validated_response
+from app.utils.sql import insert_or_ignore
 
 router = APIRouter(prefix="/sleeps", tags=["sleeps"])
 
+ONGOING_SLEEP_EXISTS = "既に睡眠が継続中です"
 
-@router.get("", response_model=ListResponse[SleepResponse])
-async def list_sleeps(
+
+def _commit_sleep(db: Session) -> None:
+    """コミット（継続中の睡眠が重複する場合は400）"""
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=ONGOING_SLEEP_EXISTS)
+
+
+@router.get("", response_model=SleepListResponse)
+def list_sleeps(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
     family: Family = Depends(get_current_family),
     baby: Baby = Depends(get_current_baby),
-    _ = Depends(check_record_permission("sleep"))
+    _ = Depends(check_record_permission("sleep")),
+    include_viewable: bool = Query(True, description="false の場合 viewable_babies を省略"),
 ):
     """睡眠記録一覧（JSON専用）"""
     sleeps = db.query(Sleep).filter(
         Sleep.baby_id == baby.id
     ).order_by(Sleep.start_time.desc()).limit(50).all()
 
-    # 継続中の睡眠を取得
+    # 継続中の睡眠を取得（部分インデックスによる1件の検索）
     ongoing_sleep = db.query(Sleep).filter(
         Sleep.baby_id == baby.id,
         Sleep.end_time == None
     ).first()
 
     # 閲覧可能な赤ちゃんリストを取得（グローバルナビゲーション用）
-    baby_ids = [b.id for b in family.babies]
-    perms_map = PermissionService.get_user_permissions_batch(
-        db, user.id, baby_ids, family.id, "basic_info"
+    viewable_babies = (
+        list(ViewableBabiesService.get(db, user.id, family).babies) if include_viewable else None
     )
-    viewable_babies = [b for b in family.babies if perms_map.get(b.id, False)]
 
-    return ListResponse(
-        items=[SleepResponse.model_validate(s) for s in sleeps],
-        baby=BabyBasicInfo.model_validate(baby) if baby else None,
-        viewable_babies=[BabyBasicInfo.model_validate(b) for b in viewable_babies],
-        ongoing_sleep=SleepResponse.model_validate(ongoing_sleep) if ongoing_sleep else None,
-    )
+    # ORM 行を1回だけ検証してそのままJSONにする
+    return validated_response(SleepListResponse, {
+        "items": sleeps,
+        "baby": baby,
+        "viewable_babies": viewable_babies,
+        "ongoing_sleep": ongoing_sleep,
+    })
 
 
 @router.post("/start", response_model=SleepResponse)
-async def start_sleep(
+def start_sleep(
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
     baby: Baby = Depends(get_current_baby),
     _ = Depends(check_record_permission("sleep"))
 ):
-    """睡眠開始（JSON専用）"""
-    # 既に継続中の睡眠があるかチェック
-    ongoing_sleep = db.query(Sleep).filter(
-        Sleep.baby_id == baby.id,
-        Sleep.end_time == None
-    ).first()
-
-    if ongoing_sleep:
+    """睡眠開始（JSON専用）
+
+    継続中の睡眠は部分一意インデックスで赤ちゃんごとに1件に制限されるため、
+    確認と作成を1文（INSERT ... ON CONFLICT DO NOTHING RETURNING）で行い、同時押しでも重複しない。
+    """
+    row = insert_or_ignore(
+        db, Sleep,
+        {"baby_id": baby.id, "user_id": user.id, "start_time": get_now_naive()},
+        index_elements=["baby_id"],
+        index_where=Sleep.end_time.is_(None),
+    )
+    if row is None:
         raise HTTPException(
             status_code=400,
-            detail="既に睡眠が継続中です"
+            detail=ONGOING_SLEEP_EXISTS
         )
 
-    # 新しい睡眠記録を作成
-    new_sleep = Sleep(
-        baby_id=baby.id,
-        user_id=user.id,
-        start_time=get_now_naive()
-    )
-
-    db.add(new_sleep)
+    # ORM を経由しない挿入のため、ダッシュボードのバージョンは明示的に進める
+    mark_dashboard_changed(db, baby.id)
     db.commit()
-    db.refresh(new_sleep)
 
-    return SleepResponse.model_validate(new_sleep)
+    return SleepResponse.model_validate(Sleep(**row._mapping))
 
 
 @router.post("/{sleep_id}/end", response_model=SleepResponse)
-async def end_sleep(
+def end_sleep(
     sleep_id: int,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -117,7 +128,7 @@ async def end_sleep(
 
 
 @router.post("", response_model=SleepResponse)
-async def create_sleep(
+def create_sleep(
     sleep_data: SleepCreate,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -132,14 +143,14 @@ async def create_sleep(
     )
 
     db.add(new_sleep)
-    db.commit()
+    _commit_sleep(db)
     db.refresh(new_sleep)
 
     return SleepResponse.model_validate(new_sleep)
 
 
 @router.get("/{sleep_id}", response_model=SleepResponse)
-async def get_sleep(
+def get_sleep(
     sleep_id: int,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
@@ -159,7 +170,7 @@ async def get_sleep(
 
 
 @router.put("/{sleep_id}", response_model=SleepResponse)
-async def update_sleep(
+def update_sleep(
     sleep_id: int,
     sleep_data: SleepUpdate,
     db: Session = Depends(get_db),
@@ -181,14 +192,14 @@ async def update_sleep(
     for key, value in update_dict.items():
         setattr(sleep, key, value)
 
-    db.commit()
+    _commit_sleep(db)
     db.refresh(sleep)
 
     return SleepResponse.model_validate(sleep)
 
 
 @router.delete("/{sleep_id}", response_model=dict)
-async def delete_sleep(
+def delete_sleep(
     sleep_id: int,
     db: Session = Depends(get_db),
     user: User = Depends(get_current_user),
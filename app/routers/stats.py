@@ -0,0 +1,54 @@
+"""統計ルーター（JSON API専用）"""
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.dependencies import get_current_user, get_current_baby, get_current_family, PermissionDenied
+from app.models.user import User
+from app.models.baby import Baby
+from app.models.family import Family
+from app.schemas.stats import HistogramResponse, TrendResponse
+from app.services.permission_service import PermissionService
+from app.services.statistics_service import StatisticsService, HISTOGRAM_SLOTS
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/histogram", response_model=HistogramResponse)
+def get_histogram(
+    record_type: Literal["feeding", "diaper", "sleep"] = Query(..., alias="type"),
+    days: int = Query(7, ge=1, le=365),
+    slots: int = Query(24, description="24（1時間単位）または 48（30分単位）"),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    family: Family = Depends(get_current_family),
+    baby: Baby = Depends(get_current_baby),
+):
+    """時間帯ごとの記録件数API（授乳・おむつ・睡眠の「いつ多いか」）"""
+    if slots not in HISTOGRAM_SLOTS:
+        raise HTTPException(status_code=400, detail="slots は 24 または 48 を指定してください")
+    if not PermissionService.can_view_baby_record(db, user.id, family.id, baby.id, record_type):
+        raise PermissionDenied("この項目の閲覧権限がありません。")
+
+    buckets = StatisticsService.get_hourly_histogram(db, baby.id, record_type, days, slots)
+    return HistogramResponse(type=record_type, days=days, slots=slots, buckets=buckets)
+
+
+@router.get("/trends", response_model=TrendResponse)
+def get_trends(
+    days: int = Query(7, ge=1, le=182),
+    db: Session = Depends(get_db),
+    user: User = Depends(get_current_user),
+    family: Family = Depends(get_current_family),
+    baby: Baby = Depends(get_current_baby),
+):
+    """期間比較API（直近 days 日とその前の days 日の授乳・睡眠・おむつ）"""
+    perms = PermissionService.get_user_permissions(db, user.id, baby.id, family.id)
+    return TrendResponse(
+        days=days,
+        feeding=StatisticsService.get_feeding_trend(db, baby.id, days) if perms["feeding"] else None,
+        sleep=StatisticsService.get_sleep_trend(db, baby.id, days) if perms["sleep"] else None,
+        diaper=StatisticsService.get_diaper_trend(db, baby.id, days) if perms["diaper"] else None,
+    )
@@ -1,9 +1,11 @@
 """陣痛記録スキーマ"""
 from datetime import datetime
-from typing import Optional
+from typing import Any, List, Optional
 from fastapi import Form
 from pydantic import BaseModel
 
+from app.schemas.responses import BabyBasicInfo
+
 
 class ContractionCreate(BaseModel):
     """陣痛記録作成用スキーマ"""
@@ -52,3 +54,12 @@ class ContractionResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ContractionListResponse(BaseModel):
+    """陣痛記録一覧レスポンス"""
+    items: List[ContractionResponse]
+    stats: dict[str, Any]
+    ongoing: Optional[ContractionResponse] = None
+    baby: Optional[BabyBasicInfo] = None
+    viewable_babies: Optional[List[BabyBasicInfo]] = None
@@ -4,6 +4,8 @@ from typing import Optional
 from fastapi import Form, HTTPException
 from pydantic import BaseModel, Field
 
+from app.schemas.responses import ListResponse
+
 
 class SleepCreate(BaseModel):
     """睡眠記録作成用スキーマ"""
@@ -66,3 +68,8 @@ class SleepResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class SleepListResponse(ListResponse[SleepResponse]):
+    """睡眠記録一覧レスポンス（継続中の睡眠を含む）"""
+    ongoing_sleep: Optional[SleepResponse] = None
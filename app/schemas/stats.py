@@ -0,0 +1,26 @@
+"""統計スキーマ"""
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+
+
+class HistogramResponse(BaseModel):
+    """時間帯ヒストグラムレスポンス"""
+    type: str
+    days: int
+    slots: int  # 24（1時間単位）または 48（30分単位）
+    buckets: List[int]  # 0時から順に各時間帯の件数
+
+
+class TrendStats(BaseModel):
+    """今期・前期の集計値と差分（今期 - 前期）"""
+    current: Dict[str, Any]
+    previous: Dict[str, Any]
+    delta: Dict[str, Any]
+
+
+class TrendResponse(BaseModel):
+    """期間比較レスポンス（閲覧権限のない記録タイプは null）"""
+    days: int
+    feeding: Optional[TrendStats] = None
+    sleep: Optional[TrendStats] = None
+    diaper: Optional[TrendStats] = None
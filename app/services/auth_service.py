@@ -1,10 +1,18 @@
 """認証サービス"""
+import time
+from typing import Dict, Optional, Tuple
+
 import bcrypt
 
 
 class AuthService:
     """認証関連のビジネスロジック"""
 
+    # bcrypt のコスト（起動時に BcryptRoundsService で全プロセス共通の値に設定）
+    rounds: int = 12
+    # コストが確定するまでは再ハッシュしない（確定前の既定値で再ハッシュしないように）
+    rounds_settled: bool = True
+
     @staticmethod
     def _ensure_bytes(password: str) -> bytes:
         """パスワードをバイト列に変換し、72バイトに制限する。
@@ -22,8 +30,49 @@ class AuthService:
         return bcrypt.checkpw(password_bytes, hashed_password.encode("utf-8"))
 
     @staticmethod
-    def get_password_hash(password: str) -> str:
-        """パスワードハッシュ化"""
+    def get_password_hash(password: str, rounds: Optional[int] = None) -> str:
+        """パスワードハッシュ化
+
+        プロセスプールの子プロセスでは calibrate 結果が共有されないため、
+        呼び出し側から rounds を明示的に渡す。
+        """
         password_bytes = AuthService._ensure_bytes(password)
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds or AuthService.rounds)
         return bcrypt.hashpw(password_bytes, salt).decode("utf-8")
+
+    @staticmethod
+    def get_hash_rounds(hashed_password: str) -> int:
+        """ハッシュ文字列（$2b$12$...）からコストを取り出す"""
+        return int(hashed_password.split("$")[2])
+
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """現在のコストと異なるハッシュかどうか"""
+        if not AuthService.rounds_settled:
+            return False
+        try:
+            return AuthService.get_hash_rounds(hashed_password) != AuthService.rounds
+        except (IndexError, ValueError):
+            return False
+
+    @staticmethod
+    def calibrate_rounds(target_ms: int, min_rounds: int, max_rounds: int) -> Tuple[int, Dict[int, float]]:
+        """目標時間内に収まる最大のコストを計測して選ぶ
+
+        コストを1上げるごとに処理時間はほぼ倍になるため、
+        目標時間を超えた時点で計測を打ち切る。
+
+        Returns:
+            (選ばれたコスト, {コスト: 計測ミリ秒})
+        """
+        password_bytes = b"calibration-password"
+        timings: Dict[int, float] = {}
+        chosen = min_rounds
+        for rounds in range(min_rounds, max_rounds + 1):
+            started = time.perf_counter()
+            bcrypt.hashpw(password_bytes, bcrypt.gensalt(rounds))
+            timings[rounds] = round((time.perf_counter() - started) * 1000, 1)
+            if timings[rounds] > target_ms:
+                break
+            chosen = rounds
+        return chosen, timings
@@ -0,0 +1,84 @@
+"""bcrypt コストの共有
+
+キャリブレーション結果を app_settings に保存し、全ワーカー・インスタンスで同じコストを使う。
+ワーカーごとに計測すると選ばれるコストが揃わず、ログインのたびに異なるコストで
+再ハッシュし合うため、最初に保存された値を採用する。
+キーには目標時間とハードウェア（CPU の種類・数・cgroup の割り当て）を含め、保存から
+BCRYPT_CALIBRATION_MAX_AGE_DAYS 日を過ぎた値は次の起動で計測し直す。
+すぐに再計測するには app_settings の bcrypt_rounds: で始まる行を削除する。
+
+AuthService はパスワードハッシュ用の子プロセスでも読み込まれるため、DBへの依存はこちらに置く。
+"""
+import hashlib
+import os
+import platform
+from datetime import timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.app_setting import AppSetting
+from app.services.auth_service import AuthService
+from app.utils.sql import insert_or_ignore
+from app.utils.time import get_now_naive
+
+# cgroup v2 の CPU 割り当て（プラン変更で変わる）
+_CGROUP_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+
+
+class BcryptRoundsService:
+    """共有する bcrypt コストの決定"""
+
+    @staticmethod
+    def hardware_key() -> str:
+        """計測結果に影響するハードウェアの識別子"""
+        parts = [platform.machine(), str(os.cpu_count())]
+        try:
+            with open(_CGROUP_CPU_MAX) as f:
+                parts.append(f.read().strip())
+        except OSError:
+            pass
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:12]
+
+    @staticmethod
+    def setting_key(target_ms: int, hardware: Optional[str] = None) -> str:
+        """目標時間・ハードウェアごとの app_settings のキー（どちらかが変わると再計測される）"""
+        return f"bcrypt_rounds:{target_ms}ms:{hardware or BcryptRoundsService.hardware_key()}"
+
+    @staticmethod
+    def resolve(
+        db: Session,
+        target_ms: int,
+        min_rounds: int,
+        max_rounds: int,
+        max_age: Optional[timedelta] = None,
+    ) -> Tuple[int, Optional[Dict[int, float]]]:
+        """保存済みのコストを返す。なければ（または max_age を過ぎていれば）計測し、最初に保存された値を返す
+
+        Returns:
+            (コスト, このプロセスの計測結果が保存された場合はその計測結果、それ以外は None)
+        """
+        key = BcryptRoundsService.setting_key(target_ms)
+        stored = db.get(AppSetting, key)
+        if stored is not None and (max_age is None or stored.updated_at > get_now_naive() - max_age):
+            return int(stored.value), None
+
+        rounds, timings = AuthService.calibrate_rounds(target_ms, min_rounds, max_rounds)
+        if stored is None:
+            saved = insert_or_ignore(
+                db, AppSetting, {"key": key, "value": str(rounds)}, index_elements=["key"]
+            ) is not None
+        else:
+            # 期限切れの値を置き換える（同時に計測したプロセスのうち最初の1つだけが更新できる）
+            saved = db.execute(
+                update(AppSetting)
+                .where(AppSetting.key == key, AppSetting.updated_at == stored.updated_at)
+                .values(value=str(rounds), updated_at=get_now_naive())
+                .execution_options(synchronize_session=False)
+            ).rowcount == 1
+        db.commit()
+        if not saved:
+            # 他のプロセスが先に保存した
+            return int(db.get(AppSetting, key).value), None
+        return rounds, timings
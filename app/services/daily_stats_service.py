@@ -0,0 +1,73 @@
+"""日次集計サービス
+
+baby_daily_stats（app/models/daily_stats.py）の読み取りと再構築。
+"""
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, Optional, Sequence
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.models.daily_stats import (
+    STAT_COLUMNS, TRACKED_COLUMNS, BabyDailyStats, Deltas, accumulate, apply_deltas,
+)
+
+
+class DailyStatsService:
+    """日次集計ビジネスロジック"""
+
+    @staticmethod
+    def summarize(db: Session, baby_id: int, start_date: date) -> Dict[str, float]:
+        """start_date 以降の集計行を合計（1クエリ）"""
+        row = db.execute(
+            select(*(func.coalesce(func.sum(getattr(BabyDailyStats, c)), 0).label(c) for c in STAT_COLUMNS))
+            .where(BabyDailyStats.baby_id == baby_id, BabyDailyStats.stat_date >= start_date)
+        ).one()
+        return dict(row._mapping)
+
+    @staticmethod
+    def summarize_by_baby(
+        db: Session,
+        baby_ids: Iterable[int],
+        start_date: date,
+        columns: Sequence[str] = STAT_COLUMNS,
+    ) -> Dict[int, Dict[str, float]]:
+        """複数の赤ちゃんの start_date 以降の集計行を GROUP BY baby_id で合計（1クエリ）
+
+        集計行のない赤ちゃんは 0 を返す。
+        """
+        baby_ids = list(baby_ids)
+        if not baby_ids:
+            return {}
+        totals = {baby_id: {c: 0 for c in columns} for baby_id in baby_ids}
+        for row in db.execute(
+            select(BabyDailyStats.baby_id, *(func.sum(getattr(BabyDailyStats, c)).label(c) for c in columns))
+            .where(BabyDailyStats.baby_id.in_(baby_ids), BabyDailyStats.stat_date >= start_date)
+            .group_by(BabyDailyStats.baby_id)
+        ):
+            values = row._mapping
+            totals[row.baby_id] = {c: values[c] for c in columns}
+        return totals
+
+    @staticmethod
+    def rebuild(db: Session, baby_id: Optional[int] = None) -> int:
+        """記録から集計行を作り直し、作成した行数を返す（baby_id 省略時は全件）
+
+        フラッシュ時の差分更新で扱えない一括操作の後や、導入時のバックフィルに使う。
+        """
+        stmt = delete(BabyDailyStats)
+        if baby_id is not None:
+            stmt = stmt.where(BabyDailyStats.baby_id == baby_id)
+        db.execute(stmt)
+
+        deltas: Deltas = defaultdict(dict)
+        for model, columns in TRACKED_COLUMNS.items():
+            query = select(*columns)
+            if baby_id is not None:
+                query = query.where(model.baby_id == baby_id)
+            accumulate(deltas, model, db.execute(query), 1)
+
+        apply_deltas(db, deltas)
+        db.commit()
+        return sum(1 for values in deltas.values() if any(values.values()))
@@ -0,0 +1,165 @@
+"""ダッシュボードレスポンスのキャッシュ
+
+GET /api/dashboard/data の組み立て結果（シリアライズ済みJSON）を
+(赤ちゃん, 権限シグネチャ) 単位で保持する。同じ権限の家族メンバーは同じエントリを共有する。
+
+赤ちゃんごとにバージョンカウンタを持ち、授乳・睡眠・おむつ・成長記録と赤ちゃん情報の
+追加・更新・削除がコミットされるとカウンタを進める（全ルーターの更新系エンドポイントが対象）。
+統計は現在時刻に依存する（継続中の睡眠・集計期間）ため、エントリには TTL も設ける。
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.baby import Baby
+from app.models.diaper import Diaper
+from app.models.feeding import Feeding
+from app.models.growth import Growth
+from app.models.sleep import Sleep
+
+# Session.info に変更のあった赤ちゃんを保持するキー
+_DIRTY_KEY = "dashboard_dirty_babies"
+
+CacheKey = Tuple[int, Tuple[Tuple[str, bool], ...]]
+
+
+def permission_signature(perms: Dict[str, bool]) -> Tuple[Tuple[str, bool], ...]:
+    """権限の辞書をキャッシュキーに使える形にする"""
+    return tuple(sorted(perms.items()))
+
+
+class DashboardCache:
+    """バージョンと TTL で無効化する LRU キャッシュ"""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, Tuple[int, float, bytes]]" = OrderedDict()
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def version(self, baby_id: int) -> int:
+        """赤ちゃんの現在のバージョン（組み立て開始前に取得する）"""
+        with self._lock:
+            return self._versions.get(baby_id, 0)
+
+    def get(self, key: CacheKey) -> Optional[bytes]:
+        """現在のバージョンで組み立てられた、期限内のエントリを返す"""
+        if self.max_size <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if (
+                entry is None
+                or entry[0] != self._versions.get(key[0], 0)
+                or entry[1] <= time.monotonic()
+            ):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key: CacheKey, version: int, body: bytes) -> None:
+        """組み立て開始時点のバージョンとともに登録"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (version, time.monotonic() + self.ttl_seconds, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def bump(self, baby_ids: Iterable[int]) -> None:
+        """赤ちゃんのバージョンを進める"""
+        with self._lock:
+            for baby_id in set(baby_ids):
+                self._versions[baby_id] = self._versions.get(baby_id, 0) + 1
+
+    def clear(self) -> None:
+        """すべてのエントリとメトリクスを破棄"""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> dict:
+        """キャッシュのメトリクスを返す"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+dashboard_cache = DashboardCache(
+    max_size=settings.DASHBOARD_CACHE_MAX_SIZE,
+    ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS,
+)
+
+
+def mark_dashboard_changed(db: Session, baby_id: Optional[int]) -> None:
+    """コミット時にバージョンを進める赤ちゃんを記録"""
+    if baby_id is not None:
+        db.info.setdefault(_DIRTY_KEY, set()).add(baby_id)
+
+
+@event.listens_for(Feeding, "after_insert")
+@event.listens_for(Feeding, "after_update")
+@event.listens_for(Feeding, "after_delete")
+@event.listens_for(Sleep, "after_insert")
+@event.listens_for(Sleep, "after_update")
+@event.listens_for(Sleep, "after_delete")
+@event.listens_for(Diaper, "after_insert")
+@event.listens_for(Diaper, "after_update")
+@event.listens_for(Diaper, "after_delete")
+@event.listens_for(Growth, "after_insert")
+@event.listens_for(Growth, "after_update")
+@event.listens_for(Growth, "after_delete")
+def _record_changed(mapper, connection, target) -> None:
+    """ダッシュボードに表示する記録の変更（別の赤ちゃんへの付け替えは両方）"""
+    session = Session.object_session(target)
+    if session is None:
+        return
+    mark_dashboard_changed(session, target.baby_id)
+    for previous in inspect(target).attrs.baby_id.history.deleted:
+        mark_dashboard_changed(session, previous)
+
+
+@event.listens_for(Baby, "after_insert")
+@event.listens_for(Baby, "after_update")
+@event.listens_for(Baby, "after_delete")
+def _baby_changed(mapper, connection, target: Baby) -> None:
+    """赤ちゃん情報（名前・誕生日・出産予定日）の変更"""
+    session = Session.object_session(target)
+    if session is not None:
+        mark_dashboard_changed(session, target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_dashboard_versions(session: Session) -> None:
+    """コミットされた変更の赤ちゃんのバージョンを進める"""
+    dirty = session.info.pop(_DIRTY_KEY, None)
+    if dirty:
+        dashboard_cache.bump(dirty)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dashboard_changes(session: Session) -> None:
+    """ロールバックされた変更は反映しない"""
+    session.info.pop(_DIRTY_KEY, None)
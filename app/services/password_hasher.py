@@ -0,0 +1,103 @@
+"""パスワードハッシュ実行サービス
+
+bcrypt は1回あたり数百ミリ秒CPUを占有するため、anyio のスレッドプールで
+実行すると他の同期エンドポイントが枯渇する。専用のプロセスプールに
+オフロードし、待ち行列の上限を超えた場合は即座に失敗させる。
+"""
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.services.auth_service import AuthService
+
+
+class PasswordHasherBusy(Exception):
+    """ハッシュ処理の待ち行列が上限に達した場合に発生する例外"""
+    pass
+
+
+class PasswordHasher:
+    """プロセスプールでbcryptを実行する非同期ハッシュサービス"""
+
+    def __init__(self, max_workers: int, max_pending: int):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        # メトリクス
+        self.completed = 0
+        self.rejected = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """プロセスプールを遅延生成（spawnでスレッド状態を引き継がない）"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    async def _run(self, func: Callable, *args):
+        """待ち行列の上限を確認してから処理を投入し、所要時間を記録"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy()
+            self._pending += 1
+
+        started = time.perf_counter()
+        try:
+            if self.max_workers > 0:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+            # ワーカー数0の場合はスレッドプールで実行（テスト・単一CPU環境向け）
+            return await run_in_threadpool(func, *args)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._pending -= 1
+                self.completed += 1
+                self.total_seconds += elapsed
+                self.max_seconds = max(self.max_seconds, elapsed)
+
+    async def hash(self, password: str) -> str:
+        """パスワードハッシュ化"""
+        return await self._run(AuthService.get_password_hash, password, AuthService.rounds)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """パスワード検証"""
+        return await self._run(AuthService.verify_password, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        """ハッシュ処理のメトリクスを返す"""
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "avg_ms": round(self.total_seconds / self.completed * 1000, 1) if self.completed else 0.0,
+                "max_ms": round(self.max_seconds * 1000, 1),
+            }
+
+    def shutdown(self) -> None:
+        """プロセスプールを停止"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -1,93 +1,300 @@
 """権限サービス"""
-from typing import Dict, List
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import event, select, update
 from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.baby import Baby
 from app.models.baby_permission import BabyPermission
+from app.models.family import Family
 from app.models.family_user import FamilyUser
+from app.utils.sql import upsert_rows
+
+# 権限を設定できる記録タイプ
+RECORD_TYPES = ['feeding', 'sleep', 'diaper', 'growth', 'schedule', 'contraction', 'basic_info']
+
+# 記録タイプごとのビット（赤ちゃん1人分の権限を1つの int で表す）
+RECORD_TYPE_BITS = {record_type: 1 << i for i, record_type in enumerate(RECORD_TYPES)}
+ALL_RECORD_TYPES_MASK = (1 << len(RECORD_TYPES)) - 1
+
+# Session.info に権限コンテキスト・変更のあった家族を保持するキー
+_CONTEXTS_KEY = "permission_contexts"
+_DIRTY_KEY = "permission_dirty_families"
+
+
+class PermissionContext:
+    """ユーザー・家族単位のコンパイル済み権限マトリクス
+
+    管理者ロールと BabyPermission をまとめて読み込み、赤ちゃんごとに
+    記録タイプのビットマスクとして保持する。権限チェックは辞書参照とビット演算のみ。
+    """
+
+    def __init__(self, is_admin: bool, masks: Dict[int, int]):
+        self.is_admin = is_admin
+        self._masks = masks
+
+    @classmethod
+    def from_rows(cls, is_admin: bool, rows: Iterable[Tuple[int, str, bool]]) -> "PermissionContext":
+        """(baby_id, record_type, can_view) の行からマトリクスを構築"""
+        masks: Dict[int, int] = {}
+        for baby_id, record_type, can_view in rows:
+            if can_view:
+                masks[baby_id] = masks.get(baby_id, 0) | RECORD_TYPE_BITS.get(record_type, 0)
+        return cls(is_admin, masks)
+
+    def mask(self, baby_id: int) -> int:
+        """赤ちゃん1人分の権限ビットマスク"""
+        if self.is_admin:
+            return ALL_RECORD_TYPES_MASK
+        return self._masks.get(baby_id, 0)
+
+    def can_view(self, baby_id: int, record_type: str) -> bool:
+        """閲覧権限（管理者はすべて許可、設定がない場合はデフォルト拒否）"""
+        return bool(self.mask(baby_id) & RECORD_TYPE_BITS.get(record_type, 0))
+
+    def get_permissions(self, baby_id: int) -> dict:
+        """赤ちゃん1人分の記録タイプ別権限"""
+        mask = self.mask(baby_id)
+        return {k: bool(mask & bit) for k, bit in RECORD_TYPE_BITS.items()}
+
+    def batch(self, baby_ids: List[int], record_type: str) -> Dict[int, bool]:
+        """複数の赤ちゃんの権限"""
+        return {baby_id: self.can_view(baby_id, record_type) for baby_id in baby_ids}
+
+
+class PermissionMatrixCache:
+    """リクエストをまたいで権限マトリクスを保持する LRU キャッシュ
+
+    エントリは構築時の家族の権限バージョン（families.permission_version）とともに保持する。
+    バージョンは権限・メンバー・赤ちゃんの変更と同じトランザクションでDB上で進めるため、
+    別のワーカー・インスタンスでコミットされた変更も、リクエストで読み込んだ家族の行と
+    比較するだけで検出できる。
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[int, int], Tuple[int, PermissionContext]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int, family_id: int, version: int) -> Optional[PermissionContext]:
+        """指定バージョンで構築されたマトリクスを返す"""
+        if self.max_size <= 0:
+            return None
+        key = (user_id, family_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, user_id: int, family_id: int, version: int, context: PermissionContext) -> None:
+        """読み込み開始時点のバージョンとともに登録"""
+        if self.max_size <= 0:
+            return
+        key = (user_id, family_id)
+        with self._lock:
+            self._entries[key] = (version, context)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """すべてのエントリを破棄"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """キャッシュのメトリクスを返す"""
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+permission_cache = PermissionMatrixCache(max_size=settings.PERMISSION_CACHE_MAX_SIZE)
+
+
+def family_permission_version(db: Session, family_id: Optional[int]) -> Optional[int]:
+    """家族の権限バージョン（認証コンテキストでロード済みの行を参照し、通常はクエリなし）"""
+    if family_id is None:
+        return None
+    family = db.get(Family, family_id)
+    return family.permission_version if family is not None else None
+
+
+def mark_permissions_changed(db: Session, family_id: Optional[int]) -> None:
+    """コミット時にバージョンを進める家族を記録"""
+    if family_id is not None:
+        db.info.setdefault(_DIRTY_KEY, set()).add(family_id)
+
+
+@event.listens_for(FamilyUser, "after_insert")
+@event.listens_for(FamilyUser, "after_update")
+@event.listens_for(FamilyUser, "after_delete")
+def _family_user_changed(mapper, connection, target: FamilyUser) -> None:
+    """メンバー追加・ロール変更"""
+    session = Session.object_session(target)
+    if session is not None:
+        mark_permissions_changed(session, target.family_id)
+
+
+@event.listens_for(BabyPermission, "after_insert")
+@event.listens_for(BabyPermission, "after_update")
+@event.listens_for(BabyPermission, "after_delete")
+def _baby_permission_changed(mapper, connection, target: BabyPermission) -> None:
+    """個別権限の変更"""
+    session = Session.object_session(target)
+    if session is not None:
+        family_id = connection.scalar(select(Baby.family_id).where(Baby.id == target.baby_id))
+        mark_permissions_changed(session, family_id)
+
+
+@event.listens_for(Baby, "after_insert")
+@event.listens_for(Baby, "after_update")
+@event.listens_for(Baby, "after_delete")
+def _baby_changed(mapper, connection, target: Baby) -> None:
+    """赤ちゃんの追加・削除・更新（閲覧可能な赤ちゃん一覧のキャッシュも無効化する）"""
+    session = Session.object_session(target)
+    if session is not None:
+        mark_permissions_changed(session, target.family_id)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_permission_versions(session: Session) -> None:
+    """変更のあった家族の権限バージョンを同じトランザクションで進める"""
+    # 未フラッシュの変更もマッパーイベントで記録されるよう先にフラッシュ
+    session.flush()
+    dirty = session.info.pop(_DIRTY_KEY, None)
+    if dirty:
+        session.execute(
+            update(Family)
+            .where(Family.id.in_(sorted(dirty)))
+            .values(permission_version=Family.permission_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_permission_contexts(session: Session) -> None:
+    """コミット後は権限が変わっている可能性があるため破棄"""
+    session.info.pop(_CONTEXTS_KEY, None)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_permission_changes(session: Session) -> None:
+    """ロールバックされた変更は反映しない"""
+    session.info.pop(_DIRTY_KEY, None)
 
 
 class PermissionService:
     """権限チェックと管理を行うサービス"""
 
     @staticmethod
-    def can_view_baby_record(db: Session, user_id: int, family_id: int, baby_id: int, record_type: str) -> bool:
-        """指定した赤ちゃん・記録タイプの閲覧権限があるか確認"""
-        
-        # 1. 管理者はすべて許可
-        fu = db.query(FamilyUser).filter(
-            FamilyUser.family_id == family_id,
-            FamilyUser.user_id == user_id
-        ).first()
-        if fu and fu.role == "admin":
-            return True
-
-        # 2. 個別設定を確認
-        permission = db.query(BabyPermission).filter(
-            BabyPermission.user_id == user_id,
-            BabyPermission.baby_id == baby_id,
-            BabyPermission.record_type == record_type
-        ).first()
-
-        if permission:
-            return permission.can_view
-
-        # 3. 設定がない場合はデフォルト拒否（ブラックリスト方式）
-        return False
+    def get_context(db: Session, user_id: int, family_id: Optional[int]) -> PermissionContext:
+        """ユーザー・家族単位の権限コンテキストを取得
 
-    @staticmethod
-    def get_user_permissions(db: Session, user_id: int, baby_id: int, family_id: int = None) -> dict:
-        """ユーザーの特定の赤ちゃんに対するすべての記録タイプの権限を取得"""
-        
-        # 管理者チェック（family_idが提供されている場合）
+        DBセッションはリクエストごとに生成されるため、Session.info に保持して
+        同一リクエスト内の権限チェックで再利用する。リクエストをまたいでは
+        家族の権限バージョンが一致する permission_cache のエントリを再利用する。
+        """
+        contexts = db.info.setdefault(_CONTEXTS_KEY, {})
+        key = (user_id, family_id)
+        context = contexts.get(key)
+        if context is not None:
+            return context
+
+        # 読み込み中に変更がコミットされた場合に古い結果を採用しないよう、先に取得
+        version = family_permission_version(db, family_id)
+        if version is not None:
+            context = permission_cache.get(user_id, family_id, version)
+            if context is not None:
+                contexts[key] = context
+                return context
+
+        # 1. 管理者はすべて許可（family_idが提供されている場合）
+        is_admin = False
         if family_id:
             fu = db.query(FamilyUser).filter(
                 FamilyUser.family_id == family_id,
                 FamilyUser.user_id == user_id
             ).first()
-            if fu and fu.role == "admin":
-                return {k: True for k in ['feeding', 'sleep', 'diaper', 'growth', 'schedule', 'contraction', 'basic_info']}
-
-        permissions = db.query(BabyPermission).filter(
-            BabyPermission.user_id == user_id,
-            BabyPermission.baby_id == baby_id
-        ).all()
-        
-        # デフォルトはすべてFalse
-        result = {
-            'feeding': False,
-            'sleep': False,
-            'diaper': False,
-            'growth': False,
-            'schedule': False,
-            'contraction': False,
-            'basic_info': False
-        }
-        
-        for p in permissions:
-            result[p.record_type] = p.can_view
-            
-        return result
+            is_admin = fu is not None and fu.role == "admin"
+
+        # 2. 個別設定を一括取得
+        rows = []
+        if not is_admin:
+            query = db.query(
+                BabyPermission.baby_id, BabyPermission.record_type, BabyPermission.can_view
+            ).filter(BabyPermission.user_id == user_id)
+            if family_id:
+                query = query.join(Baby, Baby.id == BabyPermission.baby_id).filter(
+                    Baby.family_id == family_id
+                )
+            rows = query.all()
+
+        context = PermissionContext.from_rows(is_admin, rows)
+        if version is not None:
+            permission_cache.put(user_id, family_id, version, context)
+        contexts[key] = context
+        return context
 
     @staticmethod
-    def update_permissions(db: Session, user_id: int, baby_id: int, permissions_dict: dict):
+    def can_view_baby_record(db: Session, user_id: int, family_id: int, baby_id: int, record_type: str) -> bool:
+        """指定した赤ちゃん・記録タイプの閲覧権限があるか確認"""
+        return PermissionService.get_context(db, user_id, family_id).can_view(baby_id, record_type)
+
+    @staticmethod
+    def get_user_permissions(db: Session, user_id: int, baby_id: int, family_id: int = None) -> dict:
+        """ユーザーの特定の赤ちゃんに対するすべての記録タイプの権限を取得"""
+        return PermissionService.get_context(db, user_id, family_id).get_permissions(baby_id)
+
+    @staticmethod
+    def update_permissions(
+        db: Session,
+        user_id: int,
+        baby_id: int,
+        permissions_dict: dict,
+        family_id: Optional[int] = None,
+    ):
         """権限設定を更新"""
-        for record_type, can_view in permissions_dict.items():
-            permission = db.query(BabyPermission).filter(
-                BabyPermission.user_id == user_id,
-                BabyPermission.baby_id == baby_id,
-                BabyPermission.record_type == record_type
-            ).first()
+        if family_id is None:
+            family_id = db.query(Baby.family_id).filter(Baby.id == baby_id).scalar()
+        PermissionService.update_permissions_bulk(db, user_id, family_id, {baby_id: permissions_dict})
 
-            if permission:
-                permission.can_view = can_view
-            else:
-                new_permission = BabyPermission(
-                    user_id=user_id,
-                    baby_id=baby_id,
-                    record_type=record_type,
-                    can_view=can_view
-                )
-                db.add(new_permission)
+    @staticmethod
+    def update_permissions_bulk(
+        db: Session,
+        user_id: int,
+        family_id: Optional[int],
+        permissions_by_baby: Dict[int, dict],
+    ) -> None:
+        """複数の赤ちゃんの権限設定を1回の UPSERT とコミットで更新
 
+        Args:
+            db: データベースセッション
+            user_id: 対象ユーザーID
+            family_id: 赤ちゃんが属する家族ID（権限キャッシュの無効化に使用）
+            permissions_by_baby: {baby_id: {record_type: can_view}} の辞書
+        """
+        rows = [
+            {"user_id": user_id, "baby_id": baby_id, "record_type": record_type, "can_view": can_view}
+            for baby_id, permissions_dict in permissions_by_baby.items()
+            for record_type, can_view in permissions_dict.items()
+        ]
+        # uix_baby_user_record_type 制約で衝突を判定
+        upsert_rows(
+            db, BabyPermission, rows,
+            index_elements=("baby_id", "user_id", "record_type"),
+            update_columns=("can_view",),
+        )
+        # Core 文はマッパーイベントを通らないため明示的に記録
+        mark_permissions_changed(db, family_id)
         db.commit()
 
     @staticmethod
@@ -113,24 +320,4 @@ class PermissionService:
         if not baby_ids:
             return {}
 
-        # 1. 管理者チェック（1回のクエリ）
-        fu = db.query(FamilyUser).filter(
-            FamilyUser.family_id == family_id,
-            FamilyUser.user_id == user_id
-        ).first()
-
-        if fu and fu.role == "admin":
-            return {baby_id: True for baby_id in baby_ids}
-
-        # 2. 複数の権限を1回のクエリで取得
-        permissions = db.query(BabyPermission).filter(
-            BabyPermission.user_id == user_id,
-            BabyPermission.baby_id.in_(baby_ids),
-            BabyPermission.record_type == record_type
-        ).all()
-
-        # 3. 辞書化
-        perm_map = {p.baby_id: p.can_view for p in permissions}
-
-        # 4. 権限設定がない赤ちゃんはデフォルトFalse
-        return {baby_id: perm_map.get(baby_id, False) for baby_id in baby_ids}
+        return PermissionService.get_context(db, user_id, family_id).batch(baby_ids, record_type)
@@ -0,0 +1,110 @@
+"""トークンバケット方式のレート制限
+
+ログイン・登録への総当たり攻撃が bcrypt のCPU消費に直結しないよう、
+DB検索やハッシュ計算の前にキー（ユーザー名・クライアントIP）単位で制限する。
+バケットの状態は array('d') に詰めて保持し、満杯に戻ったバケットは
+定期的に回収してスロットを再利用する。
+"""
+import threading
+import time
+from array import array
+from typing import Callable, Dict, List
+
+
+class TokenBucketLimiter:
+    """キーごとのトークンバケット（配列ベース）"""
+
+    def __init__(
+        self,
+        capacity: float,
+        refill_per_second: float,
+        evict_interval_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.evict_interval_seconds = evict_interval_seconds
+        self._clock = clock
+        self._slots: Dict[str, int] = {}
+        self._tokens = array("d")
+        self._updated = array("d")
+        self._free: List[int] = []
+        self._last_evict = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0 and self.refill_per_second > 0
+
+    def _refill(self, slot: int, now: float) -> float:
+        """経過時間分のトークンを補充して現在値を返す"""
+        tokens = min(
+            self.capacity,
+            self._tokens[slot] + (now - self._updated[slot]) * self.refill_per_second,
+        )
+        self._tokens[slot] = tokens
+        self._updated[slot] = now
+        return tokens
+
+    def _slot_for(self, key: str, now: float) -> int:
+        """キーに対応するスロットを取得（なければ満杯のバケットを割り当て）"""
+        slot = self._slots.get(key)
+        if slot is not None:
+            return slot
+        if self._free:
+            slot = self._free.pop()
+            self._tokens[slot] = self.capacity
+            self._updated[slot] = now
+        else:
+            slot = len(self._tokens)
+            self._tokens.append(self.capacity)
+            self._updated.append(now)
+        self._slots[key] = slot
+        return slot
+
+    def acquire(self, key: str) -> float:
+        """トークンを1つ消費する
+
+        Returns:
+            許可された場合は 0、拒否された場合は再試行までの秒数
+        """
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            now = self._clock()
+            if now - self._last_evict >= self.evict_interval_seconds:
+                self._evict(now)
+
+            slot = self._slot_for(key, now)
+            tokens = self._refill(slot, now)
+            if tokens >= 1:
+                self._tokens[slot] = tokens - 1
+                return 0.0
+            return (1 - tokens) / self.refill_per_second
+
+    def _evict(self, now: float) -> int:
+        """満杯まで回復したバケットを回収（ロック取得済みで呼ぶ）"""
+        self._last_evict = now
+        full = [
+            key for key, slot in self._slots.items()
+            if self._refill(slot, now) >= self.capacity
+        ]
+        for key in full:
+            self._free.append(self._slots.pop(key))
+        return len(full)
+
+    def evict(self) -> int:
+        """満杯まで回復したバケットを回収し、回収数を返す"""
+        with self._lock:
+            return self._evict(self._clock())
+
+    def reset(self) -> None:
+        """すべてのバケットを破棄"""
+        with self._lock:
+            self._slots.clear()
+            self._tokens = array("d")
+            self._updated = array("d")
+            self._free.clear()
+
+    def __len__(self) -> int:
+        return len(self._slots)
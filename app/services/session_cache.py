@@ -0,0 +1,138 @@
+"""セッションキャッシュ
+
+認証済みリクエストごとに発生する UserSession / User の2クエリを削減するため、
+セッショントークンのハッシュをキーとして解決済みユーザーとセッション有効期限を
+プロセス内に LRU + TTL でキャッシュする。
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.config import settings
+from app.models.user import User
+from app.utils.time import get_now_naive
+
+
+@dataclass(frozen=True)
+class CachedSession:
+    """キャッシュエントリ"""
+    user: User  # どのセッションにも属さない detached なスナップショット
+    expires_at: datetime  # セッション自体の有効期限
+    cached_until: float  # キャッシュの有効期限（time.monotonic 基準）
+
+
+class SessionCache:
+    """スレッドセーフな LRU + TTL セッションキャッシュ"""
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, CachedSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl_seconds > 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        """生トークンを保持しないようハッシュ化したキーを返す"""
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    @staticmethod
+    def _snapshot(user: User) -> User:
+        """カラム属性のみをコピーした detached なユーザーを作成"""
+        values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        snapshot = User(**values)
+        make_transient_to_detached(snapshot)
+        return snapshot
+
+    def get(self, token: str) -> Optional[CachedSession]:
+        """有効なエントリを返す（期限切れ・未登録なら None）"""
+        if not self.enabled:
+            return None
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.cached_until <= time.monotonic() or entry.expires_at < get_now_naive():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, token: str, user: User, expires_at: datetime) -> None:
+        """解決済みユーザーを登録"""
+        if not self.enabled:
+            return
+        entry = CachedSession(
+            user=self._snapshot(user),
+            expires_at=expires_at,
+            cached_until=time.monotonic() + self.ttl_seconds,
+        )
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str) -> None:
+        """特定トークンのエントリを削除（ログアウト時）"""
+        with self._lock:
+            self._entries.pop(self._key(token), None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """特定ユーザーの全エントリを削除（ユーザー削除時）"""
+        with self._lock:
+            stale = [k for k, e in self._entries.items() if e.user.id == user_id]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """全エントリとカウンタをリセット"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """ヒット/ミスのカウンタを返す"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+            }
+
+    @staticmethod
+    def attach(db: Session, entry: CachedSession) -> User:
+        """スナップショットをクエリなしで現在のセッションに関連付ける"""
+        return db.merge(entry.user, load=False)
+
+
+session_cache = SessionCache(
+    max_size=settings.SESSION_CACHE_MAX_SIZE,
+    ttl_seconds=settings.SESSION_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(User, "after_delete")
+def _invalidate_deleted_user(mapper, connection, target: User) -> None:
+    """ユーザー削除時にキャッシュを無効化"""
+    session_cache.invalidate_user(target.id)
@@ -0,0 +1,80 @@
+"""期限切れセッション削除サービス
+
+認証の読み取り経路で削除を行わず、定期的なバックグラウンド処理で
+期限切れセッション（と署名付きセッションの失効記録）をバッチ単位で削除する。
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.revoked_session import RevokedSession
+from app.models.session import UserSession
+from app.utils.time import get_now_naive
+
+logger = logging.getLogger(__name__)
+
+
+class SessionReaper:
+    """期限切れセッションの定期削除"""
+
+    @staticmethod
+    def purge_expired(db: Session, batch_size: int = 500, now: Optional[datetime] = None) -> int:
+        """期限切れのセッションと失効記録を batch_size 件ずつ削除し、削除件数を返す
+
+        DELETE ... LIMIT は PostgreSQL で使えないため、
+        LIMIT 付きサブクエリで対象の主キーを絞り込んで削除する。
+        """
+        now = now or get_now_naive()
+        return sum(
+            SessionReaper._purge_table(db, key, expires_at, batch_size, now)
+            for key, expires_at in (
+                (UserSession.id, UserSession.expires_at),
+                (RevokedSession.digest, RevokedSession.expires_at),
+            )
+        )
+
+    @staticmethod
+    def _purge_table(db: Session, key, expires_at, batch_size: int, now: datetime) -> int:
+        """1テーブル分の期限切れ行を削除"""
+        total = 0
+        while True:
+            expired_keys = select(key).where(expires_at < now).limit(batch_size).scalar_subquery()
+
+            result = db.execute(
+                delete(key.class_)
+                .where(key.in_(expired_keys))
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+
+            total += result.rowcount
+            if result.rowcount < batch_size:
+                return total
+
+    @staticmethod
+    def _purge_with_new_session() -> int:
+        """専用のDBセッションで削除を実行"""
+        db = SessionLocal()
+        try:
+            return SessionReaper.purge_expired(db, batch_size=settings.SESSION_REAP_BATCH_SIZE)
+        finally:
+            db.close()
+
+    @staticmethod
+    async def run_forever(interval_seconds: int) -> None:
+        """interval_seconds ごとに削除を繰り返す（lifespan でタスクとして起動）"""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                deleted = await run_in_threadpool(SessionReaper._purge_with_new_session)
+                if deleted:
+                    logger.info("Purged %d expired sessions", deleted)
+            except Exception:
+                logger.exception("Expired session purge failed")
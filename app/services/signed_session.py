@@ -0,0 +1,129 @@
+"""署名付きステートレスセッション
+
+SESSION_MODE=signed の場合、セッショントークン自体にユーザーIDと有効期限を
+含めて SECRET_KEY で署名し、リクエストごとのセッション検索を不要にする。
+ログアウトによる失効はメモリ上の拒否リストで判定し、他プロセスとは
+revoked_sessions テーブルに記録した失効レコードを定期的に同期して共有する。
+
+トークンの検証（署名・有効期限・拒否リスト）はDBにアクセスしない。get_current_user は
+セッションキャッシュにユーザーがあればクエリなしで返す。家族・赤ちゃんが必要な依存関係
+（get_current_family など）では、ユーザー起点の1クエリで読み込む。
+"""
+import asyncio
+import hashlib
+import logging
+import secrets
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Optional
+
+from itsdangerous import BadSignature, TimestampSigner
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.revoked_session import RevokedSession
+from app.models.session import UserSession, SESSION_MAX_AGE_DAYS
+from app.utils.time import get_now_naive
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass(frozen=True)
+class SessionClaims:
+    """署名済みトークンから取り出した情報"""
+    user_id: int
+    expires_at: datetime
+
+
+class SignedSessionService:
+    """署名付きトークンの発行・検証・失効"""
+
+    def __init__(self, secret_key: str):
+        self._signer = TimestampSigner(secret_key, salt="baby-app.session")
+        self._denylist: set = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        """拒否リスト用の短いダイジェスト"""
+        return hashlib.sha256(token.encode("utf-8")).digest()[:16]
+
+    def issue(self, user_id: int, expires_at: Optional[datetime] = None) -> str:
+        """ユーザーIDと有効期限を含む署名付きトークンを発行"""
+        expires_at = expires_at or UserSession.default_expires_at()
+        expires_ts = int((expires_at - _EPOCH).total_seconds())
+        payload = f"{user_id}.{expires_ts}.{secrets.token_urlsafe(8)}"
+        return self._signer.sign(payload).decode("utf-8")
+
+    def verify(self, token: str) -> Optional[SessionClaims]:
+        """DBにアクセスせずにトークンを検証（不正・期限切れ・失効済みなら None）"""
+        try:
+            payload = self._signer.unsign(
+                token, max_age=SESSION_MAX_AGE_DAYS * 86400
+            ).decode("utf-8")
+            user_id, expires_ts, _ = payload.split(".", 2)
+            claims = SessionClaims(
+                user_id=int(user_id),
+                expires_at=_EPOCH + timedelta(seconds=int(expires_ts)),
+            )
+        except (BadSignature, ValueError):
+            return None
+
+        if claims.expires_at < get_now_naive():
+            return None
+        if self._digest(token) in self._denylist:
+            return None
+        return claims
+
+    def revoke(self, db: Session, token: str) -> None:
+        """トークンを失効させ、他プロセス向けに失効レコードを保存"""
+        claims = self.verify(token)
+        if claims is None:
+            return
+
+        digest = self._digest(token)
+        with self._lock:
+            self._denylist.add(digest)
+
+        # 有効期限を引き継ぐため、期限後は SessionReaper により削除される
+        db.merge(RevokedSession(
+            digest=digest.hex(),
+            user_id=claims.user_id,
+            expires_at=claims.expires_at,
+        ))
+        db.commit()
+
+    def sync_denylist(self, db: Session) -> int:
+        """revoked_sessions の有効な失効レコードで拒否リストを置き換える"""
+        rows = db.query(RevokedSession.digest).filter(
+            RevokedSession.expires_at > get_now_naive(),
+        ).all()
+        denylist = {bytes.fromhex(row.digest) for row in rows}
+        with self._lock:
+            self._denylist = denylist
+        return len(denylist)
+
+    def _sync_with_new_session(self) -> int:
+        """専用のDBセッションで同期を実行"""
+        db = SessionLocal()
+        try:
+            return self.sync_denylist(db)
+        finally:
+            db.close()
+
+    async def run_sync_forever(self, interval_seconds: int) -> None:
+        """起動時と interval_seconds ごとに拒否リストを同期（lifespan でタスクとして起動）"""
+        while True:
+            try:
+                await run_in_threadpool(self._sync_with_new_session)
+            except Exception:
+                logger.exception("Session denylist sync failed")
+            await asyncio.sleep(interval_seconds)
+
+
+signed_sessions = SignedSessionService(settings.SECRET_KEY)
@@ -1,96 +1,294 @@
 """統計計算サービス"""
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Tuple
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import case, func, select
 from app.utils.time import get_now_naive
 
 from app.models.feeding import Feeding
 from app.models.sleep import Sleep
-from app.models.diaper import Diaper
+from app.models.diaper import Diaper, DiaperType
 from app.models.growth import Growth
+from app.services.daily_stats_service import DailyStatsService
+
+try:
+    import numpy as np
+except ImportError:  # requirements.txt に含むが、未インストールの環境では Python で集計する
+    np = None
+
+# 時間帯ヒストグラムの対象（記録タイプ → 記録時刻の列）
+HISTOGRAM_TIME_COLUMNS = {
+    "feeding": Feeding.feeding_time,
+    "sleep": Sleep.start_time,  # 寝付いた時刻
+    "diaper": Diaper.change_time,
+}
+HISTOGRAM_SLOTS = (24, 48)
+
+# 記録タイプごとに合計する日次集計の列
+FEEDING_STAT_COLUMNS = ("feeding_count", "feeding_amount_count", "feeding_amount_ml")
+SLEEP_STAT_COLUMNS = ("sleep_count", "sleep_seconds")
+DIAPER_STAT_COLUMNS = ("diaper_wet", "diaper_dirty", "diaper_both")
+
+
+def _count_if(condition):
+    """条件に一致する行数（CASE による条件付き集計）"""
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _sum_if(condition, value):
+    """条件に一致する行の value の合計（NULL は除く）"""
+    return func.coalesce(func.sum(case((condition, value), else_=None)), 0)
+
+
+def _count_value_if(condition, value):
+    """条件に一致し value が NULL でない行数"""
+    return func.count(case((condition, value), else_=None))
+
+
+def _trend(current: dict, previous: dict) -> dict:
+    """今期・前期と、その差分（今期 - 前期）"""
+    return {
+        "current": current,
+        "previous": previous,
+        "delta": {key: round(current[key] - previous[key], 1) for key in current},
+    }
 
 
 class StatisticsService:
     """統計計算ビジネスロジック"""
 
+    @staticmethod
+    def window_start(days: int) -> date:
+        """集計期間の開始日
+
+        期間は暦日単位で、今日を含む直近 days 日（days=7 なら6日前の0時から現在まで）。
+        日次集計は日付単位のため、「現在から days×24 時間」ではなくこの定義に揃える。
+        """
+        return get_now_naive().date() - timedelta(days=days - 1)
+
     @staticmethod
     def get_feeding_stats(db: Session, baby_id: int, days: int = 7) -> dict:
-        """授乳統計を取得（SQL最適化版）"""
-        start_date = get_now_naive() - timedelta(days=days)
-
-        # 1回のクエリで授乳回数と平均授乳量を取得
-        result = db.query(
-            func.count(Feeding.id).label('count'),
-            func.avg(Feeding.amount_ml).label('avg_amount')
-        ).filter(
-            Feeding.baby_id == baby_id,
-            Feeding.feeding_time >= start_date
-        ).first()
+        """授乳統計を取得（日次集計から）"""
+        return StatisticsService.get_feeding_stats_by_baby(db, [baby_id], days)[baby_id]
 
-        return {
-            "count": result.count or 0,
-            "avg_amount_ml": round(result.avg_amount, 1) if result.avg_amount else 0,
-            "period_days": days
-        }
+    @staticmethod
+    def get_feeding_stats_by_baby(db: Session, baby_ids: List[int], days: int = 7) -> Dict[int, dict]:
+        """複数の赤ちゃんの授乳統計（日次集計を GROUP BY baby_id で1クエリ）"""
+        totals_by_baby = DailyStatsService.summarize_by_baby(
+            db, baby_ids, StatisticsService.window_start(days), FEEDING_STAT_COLUMNS
+        )
+        result = {}
+        for baby_id, totals in totals_by_baby.items():
+            amount_count = totals["feeding_amount_count"]
+            result[baby_id] = {
+                "count": totals["feeding_count"],
+                "avg_amount_ml": round(totals["feeding_amount_ml"] / amount_count, 1) if amount_count else 0,
+                "period_days": days
+            }
+        return result
 
     @staticmethod
     def get_sleep_stats(db: Session, baby_id: int, days: int = 7) -> dict:
-        """睡眠統計を取得（SQL最適化版）"""
-        start_date = get_now_naive() - timedelta(days=days)
+        """睡眠統計を取得（完了分は日次集計から）"""
+        return StatisticsService.get_sleep_stats_by_baby(db, [baby_id], days)[baby_id]
+
+    @staticmethod
+    def get_sleep_stats_by_baby(db: Session, baby_ids: List[int], days: int = 7) -> Dict[int, dict]:
+        """複数の赤ちゃんの睡眠統計（完了分の日次集計と継続中の睡眠をそれぞれ1クエリ）"""
+        start_day = StatisticsService.window_start(days)
         now = get_now_naive()
 
-        # 1. 完了した睡眠記録の統計（SQLで集計）
-        # duration_minutes はプロパティなのでSQL計算式で代替
-        completed_stats = db.query(
-            func.count(Sleep.id).label('count'),
-            func.sum(
-                func.extract('epoch', Sleep.end_time - Sleep.start_time) / 60
-            ).label('total_minutes')
-        ).filter(
-            Sleep.baby_id == baby_id,
-            Sleep.start_time >= start_date,
-            Sleep.end_time.isnot(None)
-        ).first()
-
-        # 2. 進行中の睡眠記録（少数のみメモリにロード）
-        ongoing_sleeps = db.query(Sleep).filter(
-            Sleep.baby_id == baby_id,
-            Sleep.start_time >= start_date,
-            Sleep.end_time.is_(None)
-        ).all()
+        # 1. 完了した睡眠記録の統計（日次集計の合計）
+        totals_by_baby = DailyStatsService.summarize_by_baby(db, baby_ids, start_day, SLEEP_STAT_COLUMNS)
+
+        # 2. 進行中の睡眠記録（赤ちゃんごとに最大1件、部分一意インデックスで検索）
+        ongoing_sleeps = db.execute(
+            select(Sleep.baby_id, Sleep.start_time).where(
+                Sleep.baby_id.in_(baby_ids),
+                Sleep.start_time >= datetime.combine(start_day, time.min),
+                Sleep.end_time.is_(None)
+            )
+        ).all() if baby_ids else []
 
         # 3. 集計
-        total_minutes = completed_stats.total_minutes or 0
-        count = completed_stats.count or 0
+        minutes = {baby_id: totals["sleep_seconds"] / 60 for baby_id, totals in totals_by_baby.items()}
+        counts = {baby_id: totals["sleep_count"] for baby_id, totals in totals_by_baby.items()}
+        for baby_id, start_time in ongoing_sleeps:
+            delta = now - start_time
+            minutes[baby_id] += int(delta.total_seconds() / 60)
+            counts[baby_id] += 1
 
-        for sleep in ongoing_sleeps:
-            delta = now - sleep.start_time
-            total_minutes += int(delta.total_seconds() / 60)
-            count += 1
+        result = {}
+        for baby_id in totals_by_baby:
+            total_minutes, count = minutes[baby_id], counts[baby_id]
+            avg_hours = (total_minutes / count / 60) if count > 0 else 0
+            result[baby_id] = {
+                "count": count,
+                "total_hours": round(total_minutes / 60, 1),
+                "avg_hours": round(avg_hours, 1),
+                "period_days": days
+            }
+        return result
 
-        avg_hours = (total_minutes / count / 60) if count > 0 else 0
+    @staticmethod
+    def get_diaper_stats(db: Session, baby_id: int, days: int = 7) -> dict:
+        """おむつ交換統計を取得（日次集計から）"""
+        return StatisticsService.get_diaper_stats_by_baby(db, [baby_id], days)[baby_id]
 
-        return {
-            "count": count,
-            "total_hours": round(total_minutes / 60, 1),
-            "avg_hours": round(avg_hours, 1),
-            "period_days": days
-        }
+    @staticmethod
+    def get_diaper_stats_by_baby(db: Session, baby_ids: List[int], days: int = 7) -> Dict[int, dict]:
+        """複数の赤ちゃんのおむつ交換統計（日次集計を GROUP BY baby_id で1クエリ）"""
+        totals_by_baby = DailyStatsService.summarize_by_baby(
+            db, baby_ids, StatisticsService.window_start(days), DIAPER_STAT_COLUMNS
+        )
+        result = {}
+        for baby_id, totals in totals_by_baby.items():
+            by_type = {
+                "wet": totals["diaper_wet"],
+                "dirty": totals["diaper_dirty"],
+                "both": totals["diaper_both"],
+            }
+            result[baby_id] = {
+                "count": sum(by_type.values()),
+                "by_type": by_type,
+                "period_days": days
+            }
+        return result
 
     @staticmethod
-    def get_diaper_stats(db: Session, baby_id: int, days: int = 7) -> dict:
-        """おむつ交換統計を取得"""
-        start_date = get_now_naive() - timedelta(days=days)
+    def trend_windows(days: int) -> Tuple[datetime, datetime]:
+        """前期の開始時刻と今期の開始時刻
 
-        diaper_count = db.query(func.count(Diaper.id)).filter(
-            Diaper.baby_id == baby_id,
-            Diaper.change_time >= start_date
-        ).scalar()
+        今期はダッシュボード統計と同じ window_start からの暦日 days 日、前期はその前の days 日。
+        """
+        current_start = datetime.combine(StatisticsService.window_start(days), time.min)
+        return current_start - timedelta(days=days), current_start
 
-        return {
-            "count": diaper_count or 0,
-            "period_days": days
-        }
+    @staticmethod
+    def get_feeding_trend(db: Session, baby_id: int, days: int = 7) -> dict:
+        """授乳の今期・前期・差分
+
+        期間は get_feeding_stats と共通（trend_windows）。記録から直接集計する。
+        (baby_id, feeding_time DESC) インデックスの範囲走査1回と、CASE による条件付き集計の1クエリ。
+        """
+        previous_start, current_start = StatisticsService.trend_windows(days)
+        column = Feeding.feeding_time
+        windows = {"current": column >= current_start, "previous": column < current_start}
+        row = db.execute(
+            select(*(
+                expr.label(f"{name}_{key}")
+                for name, condition in windows.items()
+                for key, expr in (
+                    ("count", _count_if(condition)),
+                    ("amount_count", _count_value_if(condition, Feeding.amount_ml)),
+                    ("amount_ml", _sum_if(condition, Feeding.amount_ml)),
+                )
+            )).where(Feeding.baby_id == baby_id, column >= previous_start)
+        ).one()._mapping
+
+        def summary(name: str) -> dict:
+            amount_count = row[f"{name}_amount_count"]
+            return {
+                "count": row[f"{name}_count"],
+                "avg_amount_ml": round(row[f"{name}_amount_ml"] / amount_count, 1) if amount_count else 0,
+            }
+
+        return _trend(summary("current"), summary("previous"))
+
+    @staticmethod
+    def get_sleep_trend(db: Session, baby_id: int, days: int = 7) -> dict:
+        """睡眠の今期・前期・差分（寝付いた時刻で振り分け、継続中の睡眠は現在までの時間を計上）
+
+        完了分は duration_seconds の条件付き合計。継続中の睡眠（最大1件）の開始時刻も同じクエリで取得する。
+        """
+        previous_start, current_start = StatisticsService.trend_windows(days)
+        now = get_now_naive()
+        column = Sleep.start_time
+        completed = Sleep.duration_seconds.isnot(None)
+        windows = {"current": column >= current_start, "previous": column < current_start}
+        row = db.execute(
+            select(
+                *(
+                    expr.label(f"{name}_{key}")
+                    for name, condition in windows.items()
+                    for key, expr in (
+                        ("count", _count_if(condition & completed)),
+                        ("seconds", _sum_if(condition, Sleep.duration_seconds)),
+                    )
+                ),
+                func.max(case((Sleep.end_time.is_(None), column), else_=None)).label("ongoing_start"),
+            ).where(Sleep.baby_id == baby_id, column >= previous_start)
+        ).one()._mapping
+
+        totals = {name: [row[f"{name}_count"], row[f"{name}_seconds"]] for name in windows}
+        ongoing_start = row["ongoing_start"]
+        if ongoing_start is not None:
+            name = "current" if ongoing_start >= current_start else "previous"
+            totals[name][0] += 1
+            totals[name][1] += int((now - ongoing_start).total_seconds() // 60) * 60
+
+        def summary(name: str) -> dict:
+            count, seconds = totals[name]
+            return {
+                "count": count,
+                "total_hours": round(seconds / 3600, 1),
+                "avg_hours": round(seconds / count / 3600, 1) if count else 0,
+            }
+
+        return _trend(summary("current"), summary("previous"))
+
+    @staticmethod
+    def get_diaper_trend(db: Session, baby_id: int, days: int = 7) -> dict:
+        """おむつ交換の今期・前期・差分（種類別）"""
+        previous_start, current_start = StatisticsService.trend_windows(days)
+        column = Diaper.change_time
+        windows = {"current": column >= current_start, "previous": column < current_start}
+        types = {"wet": DiaperType.WET, "dirty": DiaperType.DIRTY, "both": DiaperType.BOTH}
+        row = db.execute(
+            select(*(
+                _count_if(condition & (Diaper.diaper_type == diaper_type)).label(f"{name}_{key}")
+                for name, condition in windows.items()
+                for key, diaper_type in types.items()
+            )).where(Diaper.baby_id == baby_id, column >= previous_start)
+        ).one()._mapping
+
+        def summary(name: str) -> dict:
+            by_type = {key: row[f"{name}_{key}"] for key in types}
+            return {"count": sum(by_type.values()), **by_type}
+
+        return _trend(summary("current"), summary("previous"))
+
+    @staticmethod
+    def get_hourly_histogram(db: Session, baby_id: int, record_type: str, days: int = 7, slots: int = 24) -> List[int]:
+        """時間帯ごとの記録件数（slots=24 は1時間、48 は30分単位）
+
+        PostgreSQL では extract で時間帯に振り分けてSQLで集計し、件数の配列のみ受け取る。
+        それ以外では記録時刻のみ読み込み、NumPy の bincount（未インストールなら Python）で集計する。
+        """
+        column = HISTOGRAM_TIME_COLUMNS[record_type]
+        model = column.class_
+        per_hour = slots // 24
+        # ダッシュボード・期間比較と同じ暦日単位の期間
+        since = datetime.combine(StatisticsService.window_start(days), time.min)
+        conditions = (model.baby_id == baby_id, column >= since)
+
+        if db.get_bind().dialect.name == "postgresql":
+            slot = func.extract("hour", column) * per_hour + func.floor(func.extract("minute", column) / (60 // per_hour))
+            buckets = [0] * slots
+            for index, count in db.execute(
+                select(slot.label("slot"), func.count()).where(*conditions).group_by("slot")
+            ):
+                buckets[int(index)] = count
+            return buckets
+
+        times = db.execute(select(column).where(*conditions)).scalars().all()
+        indexes = [t.hour * per_hour + t.minute // (60 // per_hour) for t in times]
+        if np is not None:
+            return np.bincount(np.asarray(indexes, dtype=np.intp), minlength=slots).tolist()
+        buckets = [0] * slots
+        for index in indexes:
+            buckets[index] += 1
+        return buckets
 
     @staticmethod
     def get_latest_growth(db: Session, baby_id: int) -> Growth:
@@ -99,6 +297,22 @@ class StatisticsService:
             Growth.baby_id == baby_id
         ).order_by(Growth.measurement_date.desc()).first()
 
+    @staticmethod
+    def get_latest_growth_by_baby(db: Session, baby_ids: List[int]) -> Dict[int, Growth]:
+        """複数の赤ちゃんの最新の成長記録（ROW_NUMBER で赤ちゃんごとの先頭を1クエリで取得）"""
+        if not baby_ids:
+            return {}
+        ranked = select(
+            Growth,
+            func.row_number().over(
+                partition_by=Growth.baby_id,
+                order_by=(Growth.measurement_date.desc(), Growth.id.desc())
+            ).label("rank")
+        ).where(Growth.baby_id.in_(baby_ids)).subquery()
+        latest = aliased(Growth, ranked)
+        growths = db.execute(select(latest).where(ranked.c.rank == 1)).scalars().all()
+        return {growth.baby_id: growth for growth in growths}
+
     @staticmethod
     def get_recent_records(db: Session, baby_id: int, limit: int = 10) -> dict:
         """最新記録を取得"""
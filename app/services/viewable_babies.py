@@ -0,0 +1,97 @@
+"""閲覧可能な赤ちゃん一覧のキャッシュ
+
+記録一覧の各APIが毎回計算していた viewable_babies（ナビゲーション用）を、
+ユーザー・家族・権限バージョン単位でシリアライズ済みの形で保持する。
+赤ちゃんの追加・削除・更新と権限変更は家族の権限バージョン（families.permission_version）を進めるため、
+バージョンの一致を確認するだけで無効化される。
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.family import Family
+from app.schemas.responses import BabyBasicInfo
+from app.services.permission_service import PermissionService
+
+
+@dataclass(frozen=True)
+class ViewableBabies:
+    """閲覧可能な赤ちゃん一覧（シリアライズ済み）"""
+    babies: Tuple[BabyBasicInfo, ...]
+    body: bytes  # GET /api/babies/viewable のレスポンスボディ
+    etag: str
+
+
+class ViewableBabiesCache:
+    """(ユーザー, 家族) 単位の LRU キャッシュ"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[int, int], Tuple[int, ViewableBabies]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, family_id: int, version: int) -> Optional[ViewableBabies]:
+        """指定バージョンで構築されたエントリを返す"""
+        with self._lock:
+            entry = self._entries.get((user_id, family_id))
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end((user_id, family_id))
+            return entry[1]
+
+    def put(self, user_id: int, family_id: int, version: int, value: ViewableBabies) -> None:
+        """エントリを登録"""
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[(user_id, family_id)] = (version, value)
+            self._entries.move_to_end((user_id, family_id))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """すべてのエントリを破棄"""
+        with self._lock:
+            self._entries.clear()
+
+
+viewable_babies_cache = ViewableBabiesCache(max_size=settings.PERMISSION_CACHE_MAX_SIZE)
+
+
+class ViewableBabiesService:
+    """閲覧可能な赤ちゃん一覧の取得"""
+
+    @staticmethod
+    def get(db: Session, user_id: int, family: Family) -> ViewableBabies:
+        """基本情報の閲覧権限がある家族の赤ちゃん一覧を取得"""
+        # 構築中に変更がコミットされた場合に古い結果を採用しないよう、先に取得
+        version = family.permission_version
+        cached = viewable_babies_cache.get(user_id, family.id, version)
+        if cached is not None:
+            return cached
+
+        baby_ids = [b.id for b in family.babies]
+        perms_map = PermissionService.get_user_permissions_batch(
+            db, user_id, baby_ids, family.id, "basic_info"
+        )
+        babies = tuple(
+            BabyBasicInfo.model_validate(b)
+            for b in sorted(family.babies, key=lambda b: b.id)
+            if perms_map.get(b.id, False)
+        )
+        body = json.dumps(
+            {"babies": [b.model_dump(mode="json") for b in babies]},
+            ensure_ascii=False, separators=(",", ":"),
+        ).encode("utf-8")
+        # 再起動でバージョンが戻っても衝突しないよう、内容から ETag を生成
+        etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+        value = ViewableBabies(babies=babies, body=body, etag=etag)
+        viewable_babies_cache.put(user_id, family.id, version, value)
+        return value
@@ -0,0 +1,51 @@
+"""レスポンスのシリアライズ
+
+FastAPI は response_model を指定したエンドポイントの戻り値を再検証してから
+jsonable_encoder → json.dumps と変換する。一覧APIでは ORM 行をキャッシュ済みの
+TypeAdapter で1回だけ検証し、pydantic-core で直接JSONにして返す。
+それ以外のレスポンスは orjson（未インストールなら標準の json）でエンコードする。
+"""
+import json
+from functools import lru_cache
+from typing import Any
+
+from pydantic import TypeAdapter
+from starlette.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # orjson は任意の依存
+    orjson = None
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(tp: Any) -> TypeAdapter:
+    """型ごとの TypeAdapter（スキーマ構築はコストが高いため再利用する）"""
+    return TypeAdapter(tp)
+
+
+def dumps(content: Any) -> bytes:
+    """JSON互換の値をUTF-8のJSONにエンコード"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson を使う JSONResponse（アプリの既定レスポンスクラス）"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def validated_response(tp: Any, data: Any, status_code: int = 200) -> Response:
+    """data を型 tp として1回だけ検証し、そのままJSONレスポンスにする
+
+    ORM オブジェクトは属性から読み取る。戻り値が Response のため、
+    FastAPI による response_model の再検証は行われない（スキーマ定義には引き続き使用）。
+    """
+    adapter = get_type_adapter(tp)
+    value = adapter.validate_python(data, from_attributes=True)
+    return Response(content=adapter.dump_json(value), status_code=status_code, media_type="application/json")
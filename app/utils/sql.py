@@ -0,0 +1,124 @@
+"""方言ごとのSQL補助関数"""
+from typing import Any, List, Optional, Sequence, Union
+
+from sqlalchemy import and_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Connection, Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+
+def _dialect(db: Union[Session, Connection]):
+    """セッション・接続の方言"""
+    return db.get_bind().dialect if isinstance(db, Session) else db.dialect
+
+
+def _dialect_insert(db: Union[Session, Connection]):
+    """ON CONFLICT 句を持つ方言ごとの insert"""
+    return postgresql.insert if _dialect(db).name == "postgresql" else sqlite.insert
+
+
+def supports_on_conflict(db: Union[Session, Connection]) -> bool:
+    """INSERT ... ON CONFLICT が使えるか（PostgreSQL、SQLite 3.24以降）"""
+    dialect = _dialect(db)
+    if dialect.name == "postgresql":
+        return True
+    if dialect.name == "sqlite":
+        return (dialect.server_version_info or (0,)) >= (3, 24)
+    return False
+
+
+def upsert_rows(
+    db: Session,
+    model,
+    rows: List[dict],
+    index_elements: Sequence[str],
+    update_columns: Sequence[str],
+) -> None:
+    """一意制約（index_elements）に基づいて複数行をまとめて挿入・更新する
+
+    ON CONFLICT に対応した方言では1文で実行し、それ以外では行ごとに
+    UPDATE して該当がなければ INSERT する。コミットは呼び出し側で行う。
+    """
+    if not rows:
+        return
+
+    table = model.__table__
+    if supports_on_conflict(db):
+        stmt = _dialect_insert(db)(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(index_elements),
+            set_={column: stmt.excluded[column] for column in update_columns},
+        )
+        db.execute(stmt)
+        return
+
+    for row in rows:
+        condition = and_(*(table.c[column] == row[column] for column in index_elements))
+        result = db.execute(
+            update(table).where(condition).values({column: row[column] for column in update_columns})
+        )
+        if result.rowcount == 0 and db.execute(select(table.c[index_elements[0]]).where(condition)).first() is None:
+            db.execute(table.insert().values(row))
+
+
+def increment_rows(
+    db: Union[Session, Connection],
+    model,
+    rows: List[dict],
+    index_elements: Sequence[str],
+    increment_columns: Sequence[str],
+) -> None:
+    """一意制約（index_elements）ごとに数値列へ差分を加算する（行がなければ差分の値で挿入）
+
+    rows のキーは一意であること。コミットは呼び出し側で行う。
+    """
+    if not rows:
+        return
+
+    table = model.__table__
+    if supports_on_conflict(db):
+        stmt = _dialect_insert(db)(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=list(index_elements),
+            set_={column: table.c[column] + stmt.excluded[column] for column in increment_columns},
+        )
+        db.execute(stmt)
+        return
+
+    for row in rows:
+        condition = and_(*(table.c[column] == row[column] for column in index_elements))
+        result = db.execute(
+            update(table).where(condition).values({column: table.c[column] + row[column] for column in increment_columns})
+        )
+        if result.rowcount == 0:
+            db.execute(table.insert().values(row))
+
+
+def insert_or_ignore(
+    db: Session,
+    model,
+    values: dict,
+    index_elements: Sequence[str],
+    index_where: Optional[Any] = None,
+) -> Optional[Row]:
+    """一意制約（index_elements、部分インデックスなら index_where）に衝突しなければ挿入し、挿入した行を返す
+
+    ON CONFLICT DO NOTHING と RETURNING に対応した方言では1文で実行する。
+    それ以外ではセーブポイント内で INSERT し、一意制約違反なら None を返す。
+    ORM を経由しないため、マッパーイベントは発生しない。コミットは呼び出し側で行う。
+    """
+    table = model.__table__
+    if supports_on_conflict(db) and _dialect(db).insert_returning:
+        stmt = _dialect_insert(db)(table).values(values).on_conflict_do_nothing(
+            index_elements=list(index_elements), index_where=index_where,
+        ).returning(*table.c)
+        return db.execute(stmt).first()
+
+    try:
+        with db.begin_nested():
+            result = db.execute(table.insert().values(values))
+    except IntegrityError:
+        return None
+    condition = and_(*(column == value for column, value in zip(table.primary_key.columns, result.inserted_primary_key)))
+    return db.execute(select(*table.c).where(condition)).first()
@@ -0,0 +1,95 @@
+"""CSRFミドルウェアのオーバーヘッド計測
+
+BaseHTTPMiddleware による旧実装と純粋なASGI実装を、最小のアプリに対して
+ASGIで直接呼び出し、1リクエストあたりの所要時間を比較する。
+
+使用例:
+  python -m benchmarks.bench_csrf_middleware [リクエスト数]
+"""
+import asyncio
+import secrets
+import sys
+import time
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+
+from app.middleware.csrf import CSRFCookieMiddleware
+
+
+class LegacyCSRFCookieMiddleware(BaseHTTPMiddleware):
+    """置き換え前の実装（比較用）"""
+
+    async def dispatch(self, request: Request, call_next):
+        csrf_token = request.cookies.get("csrf_token")
+        new_token = False
+        if not csrf_token:
+            csrf_token = secrets.token_urlsafe(32)
+            new_token = True
+
+        request.state.csrf_token = csrf_token
+
+        response = await call_next(request)
+
+        if new_token:
+            response.set_cookie(key="csrf_token", value=csrf_token, httponly=False, samesite="lax", secure=False)
+
+        return response
+
+
+async def endpoint(scope, receive, send):
+    """何もしないエンドポイント"""
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def make_scope(method: str) -> dict:
+    token = "benchmark-token"
+    headers = [(b"cookie", f"csrf_token={token}".encode()), (b"content-type", b"application/json")]
+    if method != "GET":
+        headers.append((b"x-csrf-token", token.encode()))
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method,
+        "scheme": "http", "path": "/api/health", "raw_path": b"/api/health", "query_string": b"",
+        "root_path": "", "headers": headers, "client": ("127.0.0.1", 1), "server": ("testserver", 80),
+    }
+
+
+async def run(app, method: str, requests: int) -> float:
+    """1リクエストあたりの平均マイクロ秒"""
+    async def send(message):
+        pass
+
+    async def call() -> None:
+        messages = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if messages:
+                return messages.pop()
+            await asyncio.Event().wait()  # 切断はレスポンス完了後にキャンセルされる
+
+        await app(make_scope(method), receive, send)
+
+    for _ in range(min(requests, 500)):  # ウォームアップ
+        await call()
+    started = time.perf_counter()
+    for _ in range(requests):
+        await call()
+    return (time.perf_counter() - started) / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    apps = {
+        "none": endpoint,
+        "BaseHTTPMiddleware (legacy)": LegacyCSRFCookieMiddleware(endpoint),
+        "pure ASGI": CSRFCookieMiddleware(endpoint),
+    }
+    print(f"{'middleware':<30}{'GET us/req':>12}{'POST us/req':>13}")
+    for name, app in apps.items():
+        get_us = await run(app, "GET", requests)
+        post_us = await run(app, "POST", requests)
+        print(f"{name:<30}{get_us:>12.1f}{post_us:>13.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000))
@@ -0,0 +1,117 @@
+"""一覧APIのシリアライズ計測
+
+記録一覧（授乳・睡眠・おむつ・成長・スケジュール・陣痛）の50件分のORM行について、
+従来の経路（model_validate → response_model で再検証 → jsonable_encoder → json.dumps）と
+validated_response（キャッシュ済み TypeAdapter で1回検証 → pydantic-core でJSON化）を比較する。
+
+使用例:
+  python -m benchmarks.bench_list_serialization [繰り返し回数]
+"""
+import asyncio
+import sys
+import time
+from datetime import date, timedelta
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.models.baby import Baby
+from app.models.contraction import Contraction
+from app.models.diaper import Diaper, DiaperType
+from app.models.feeding import Feeding, FeedingType
+from app.models.growth import Growth
+from app.models.schedule import Schedule
+from app.models.sleep import Sleep
+from app.schemas.contraction import ContractionListResponse, ContractionResponse
+from app.schemas.diaper import DiaperResponse
+from app.schemas.feeding import FeedingResponse
+from app.schemas.growth import GrowthResponse
+from app.schemas.responses import BabyBasicInfo, ListResponse
+from app.schemas.schedule import ScheduleResponse
+from app.schemas.sleep import SleepListResponse, SleepResponse
+from app.utils.serialization import validated_response
+from app.utils.time import get_now_naive
+
+ROWS = 50
+
+
+def build_rows():
+    """一覧ごとの (レスポンス型, 行のスキーマ, ORM行) を作成（DBは使わない）"""
+    now = get_now_naive()
+    times = [now - timedelta(hours=i) for i in range(ROWS)]
+    common = [{"id": i + 1, "baby_id": 1, "user_id": 1} for i in range(ROWS)]
+    return {
+        "feedings": (ListResponse[FeedingResponse], FeedingResponse, [
+            Feeding(**c, feeding_time=t, feeding_type=FeedingType.BOTTLE, amount_ml=120.0, notes="メモ")
+            for c, t in zip(common, times)
+        ]),
+        "sleeps": (SleepListResponse, SleepResponse, [
+            Sleep(**c, start_time=t - timedelta(minutes=30), end_time=t) for c, t in zip(common, times)
+        ]),
+        "diapers": (ListResponse[DiaperResponse], DiaperResponse, [
+            Diaper(**c, change_time=t, diaper_type=DiaperType.WET) for c, t in zip(common, times)
+        ]),
+        "growths": (ListResponse[GrowthResponse], GrowthResponse, [
+            Growth(**c, measurement_date=date.today() - timedelta(days=i), weight_kg=3.2, height_cm=50.1)
+            for i, c in enumerate(common)
+        ]),
+        "schedules": (ListResponse[ScheduleResponse], ScheduleResponse, [
+            Schedule(**c, title="健診", scheduled_time=t, is_completed=False, created_at=t)
+            for c, t in zip(common, times)
+        ]),
+        "contractions": (ContractionListResponse, ContractionResponse, [
+            Contraction(**c, start_time=t, end_time=t + timedelta(seconds=40), duration_seconds=40, interval_seconds=300)
+            for c, t in zip(common, times)
+        ]),
+    }
+
+
+async def legacy(response_type, item_type, rows, baby, babies) -> bytes:
+    """置き換え前の経路"""
+    content = {
+        "items": [item_type.model_validate(r) for r in rows],
+        "baby": BabyBasicInfo.model_validate(baby),
+        "viewable_babies": [BabyBasicInfo.model_validate(b) for b in babies],
+    }
+    if response_type is ContractionListResponse:
+        content["stats"] = {}
+    else:
+        content = response_type(**content)
+    field = create_response_field(name="response", type_=response_type)
+    encoded = await serialize_response(field=field, response_content=content)
+    return JSONResponse(encoded).body
+
+
+def single_pass(response_type, item_type, rows, baby, babies) -> bytes:
+    """validated_response の経路"""
+    data = {"items": rows, "baby": baby, "viewable_babies": babies}
+    if response_type is ContractionListResponse:
+        data["stats"] = {}
+    return validated_response(response_type, data).body
+
+
+async def main(iterations: int) -> None:
+    baby = Baby(id=1, family_id=1, name="テスト")
+    babies = [baby, Baby(id=2, family_id=1, name="テスト2")]
+    print(f"{'endpoint':<14}{'legacy ms':>11}{'single-pass ms':>16}{'speedup':>9}")
+    for name, (response_type, item_type, rows) in build_rows().items():
+        args = (response_type, item_type, rows, baby, babies)
+        await legacy(*args)
+        single_pass(*args)
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await legacy(*args)
+        legacy_ms = (time.perf_counter() - started) / iterations * 1000
+
+        started = time.perf_counter()
+        for _ in range(iterations):
+            single_pass(*args)
+        single_ms = (time.perf_counter() - started) / iterations * 1000
+
+        print(f"{name:<14}{legacy_ms:>11.3f}{single_ms:>16.3f}{legacy_ms / single_ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
@@ -0,0 +1,27 @@
+"""日次集計（baby_daily_stats）の再構築スクリプト
+
+使用例:
+  python rebuild_daily_stats.py            # 全ての赤ちゃん
+  python rebuild_daily_stats.py <baby_id>  # 指定した赤ちゃんのみ
+"""
+import sys
+import os
+
+# プロジェクトのルートディレクトリをパスに追加
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import SessionLocal
+from app.services.daily_stats_service import DailyStatsService
+
+
+def rebuild(baby_id=None):
+    db = SessionLocal()
+    try:
+        rows = DailyStatsService.rebuild(db, baby_id)
+        print(f"Rebuilt {rows} daily stats rows.")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild(int(sys.argv[1]) if len(sys.argv) > 1 else None)
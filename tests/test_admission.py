@@ -0,0 +1,87 @@
+"""受付制御ミドルウェアのテスト"""
+import asyncio
+
+import httpx
+import pytest
+from starlette.responses import JSONResponse
+
+from app.middleware.admission import AdmissionController, AdmissionControlMiddleware, Lane
+
+
+@pytest.mark.asyncio
+async def test_lane_rejects_when_queue_full():
+    """実行枠と待ち行列が埋まっていれば待たずに拒否する"""
+    lane = Lane("test", limit=1, max_queue=1, timeout=5)
+    assert await lane.acquire() == 0.0
+
+    queued = asyncio.create_task(lane.acquire())
+    await asyncio.sleep(0)
+    assert await lane.acquire() is None
+
+    lane.release()
+    assert await queued >= 0
+    assert lane.stats()["in_flight"] == 1
+    assert lane.stats()["rejected"] == 1
+    lane.release()
+    assert lane.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_lane_times_out_waiting():
+    """待ち時間が上限を超えれば拒否し、待ち行列から外す"""
+    lane = Lane("test", limit=1, max_queue=4, timeout=0.01)
+    await lane.acquire()
+
+    assert await lane.acquire() is None
+    stats = lane.stats()
+    assert stats["timed_out"] == 1
+    assert stats["waiting"] == 0
+
+    lane.release()
+    assert await lane.acquire() == 0.0
+
+
+@pytest.mark.asyncio
+async def test_cheap_lane_not_starved_by_heavy():
+    """重いレーンが混雑しても軽いレーンは即座に処理され、重いレーンは503になる"""
+    release = asyncio.Event()
+
+    async def app(scope, receive, send):
+        if scope["path"].startswith("/api/dashboard"):
+            await release.wait()
+        await JSONResponse({"path": scope["path"]})(scope, receive, send)
+
+    controller = AdmissionController({
+        "cheap": Lane("cheap", 0, 0, 1),
+        "heavy": Lane("heavy", 1, 0, 1),
+        "default": Lane("default", 1, 0, 1),
+    })
+    transport = httpx.ASGITransport(app=AdmissionControlMiddleware(app, controller))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        slow = asyncio.create_task(client.get("/api/dashboard/data"))
+        while controller.lanes["heavy"].in_flight == 0:
+            await asyncio.sleep(0)
+
+        busy = await client.get("/api/dashboard/data")
+        assert busy.status_code == 503
+        assert busy.headers["retry-after"] == "1"
+
+        health = await client.get("/api/health")
+        assert health.status_code == 200
+        assert health.headers["server-timing"].startswith("queue;dur=")
+
+        release.set()
+        assert (await slow).status_code == 200
+
+    assert controller.lanes["heavy"].stats()["in_flight"] == 0
+
+
+def test_lane_for_paths():
+    """集計系エンドポイントとバッチは heavy、軽いエンドポイントは cheap、API以外は対象外"""
+    controller = AdmissionController.from_settings()
+    assert controller.lane_for("/api/dashboard/family").name == "heavy"
+    assert controller.lane_for("/api/stats/trends").name == "heavy"
+    assert controller.lane_for("/api/batch").name == "heavy"
+    assert controller.lane_for("/api/feedings").name == "default"
+    assert controller.lane_for("/api/ready").name == "cheap"
+    assert controller.lane_for("/index.html") is None
@@ -120,3 +120,102 @@ async def test_logout(client):
     assert response.json()["message"] == "Logout successful"
     # Check that session_token is empty or expired in cookies if possible
     # (implementation dependent on how client handles cookies)
+
+def test_calibrate_rounds_respects_budget():
+    """目標時間を超えない範囲のコストを選び、計測結果を返す"""
+    rounds, timings = AuthService.calibrate_rounds(target_ms=0, min_rounds=4, max_rounds=6)
+    # どのコストも0msには収まらないため最小値にフォールバック
+    assert rounds == 4
+    assert list(timings) == [4]
+
+    rounds, timings = AuthService.calibrate_rounds(target_ms=10_000, min_rounds=4, max_rounds=5)
+    assert rounds == 5
+    assert set(timings) == {4, 5}
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_cost(client, db, monkeypatch):
+    """現在と異なるコストのハッシュはログイン時に再ハッシュされる"""
+    password = "password123"
+    user = User(
+        username="rehash_user",
+        hashed_password=AuthService.get_password_hash(password, rounds=4),
+    )
+    db.add(user)
+    db.commit()
+
+    monkeypatch.setattr(AuthService, "rounds", 5)
+    assert AuthService.needs_rehash(user.hashed_password)
+
+    csrf_token = await get_csrf_token(client)
+    response = await client.post(
+        "/api/login",
+        json={"username": "rehash_user", "password": password},
+        headers={"X-CSRF-Token": csrf_token},
+    )
+    assert response.status_code == 200
+
+    db.refresh(user)
+    assert AuthService.get_hash_rounds(user.hashed_password) == 5
+    assert AuthService.verify_password(password, user.hashed_password)
+
+
+def test_bcrypt_rounds_shared_between_processes(db, monkeypatch):
+    """最初に保存されたコストを全プロセスが使い、計測結果は保存したプロセスのみ返す"""
+    from app.models.app_setting import AppSetting
+    from app.services.bcrypt_rounds import BcryptRoundsService
+
+    monkeypatch.setattr(AuthService, "calibrate_rounds", staticmethod(lambda *args: (11, {10: 90.0, 11: 180.0})))
+    assert BcryptRoundsService.resolve(db, 250, 10, 14) == (11, {10: 90.0, 11: 180.0})
+
+    # 別のワーカーは計測せずに保存済みの値を使う
+    def _fail(*args):
+        raise AssertionError("calibrated twice")
+
+    monkeypatch.setattr(AuthService, "calibrate_rounds", staticmethod(_fail))
+    assert BcryptRoundsService.resolve(db, 250, 10, 14) == (11, None)
+
+    # 計測中に他のプロセスが先に保存した場合はその値に揃える
+    def _lose_race(*args):
+        db.add(AppSetting(key=BcryptRoundsService.setting_key(100), value="10"))
+        db.commit()
+        return 12, {12: 95.0}
+
+    monkeypatch.setattr(AuthService, "calibrate_rounds", staticmethod(_lose_race))
+    assert BcryptRoundsService.resolve(db, 100, 10, 14) == (10, None)
+
+
+def test_bcrypt_rounds_recalibrated_when_expired_or_hardware_changes(db, monkeypatch):
+    """保存から max_age を過ぎた値やハードウェアの異なる値は使わず、計測し直す"""
+    from datetime import timedelta
+    from app.models.app_setting import AppSetting
+    from app.services.bcrypt_rounds import BcryptRoundsService
+    from app.utils.time import get_now_naive
+
+    monkeypatch.setattr(BcryptRoundsService, "hardware_key", staticmethod(lambda: "small"))
+    monkeypatch.setattr(AuthService, "calibrate_rounds", staticmethod(lambda *args: (12, {12: 200.0})))
+    db.add(AppSetting(key=BcryptRoundsService.setting_key(250), value="10",
+                      updated_at=get_now_naive() - timedelta(days=31)))
+    db.commit()
+
+    assert BcryptRoundsService.resolve(db, 250, 10, 14, max_age=timedelta(days=60)) == (10, None)
+    assert BcryptRoundsService.resolve(db, 250, 10, 14, max_age=timedelta(days=30)) == (12, {12: 200.0})
+    assert db.get(AppSetting, BcryptRoundsService.setting_key(250)).value == "12"
+    # 置き換えた値は次の期限まで使う
+    assert BcryptRoundsService.resolve(db, 250, 10, 14, max_age=timedelta(days=30)) == (12, None)
+
+    # プラン変更などでハードウェアが変わると別のキーになり、計測し直す
+    monkeypatch.setattr(BcryptRoundsService, "hardware_key", staticmethod(lambda: "large"))
+    monkeypatch.setattr(AuthService, "calibrate_rounds", staticmethod(lambda *args: (13, {13: 240.0})))
+    assert BcryptRoundsService.resolve(db, 250, 10, 14) == (13, {13: 240.0})
+    assert db.query(AppSetting).count() == 2
+
+
+def test_no_rehash_until_rounds_settled(monkeypatch):
+    """共有のコストが確定するまでは再ハッシュしない"""
+    hashed = AuthService.get_password_hash("password123", rounds=4)
+    monkeypatch.setattr(AuthService, "rounds", 5)
+    monkeypatch.setattr(AuthService, "rounds_settled", False)
+    assert not AuthService.needs_rehash(hashed)
+    monkeypatch.setattr(AuthService, "rounds_settled", True)
+    assert AuthService.needs_rehash(hashed)
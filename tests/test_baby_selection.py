@@ -0,0 +1,55 @@
+"""赤ちゃん選択（ボディを読まない解決）のテスト"""
+import pytest
+
+from app.config import settings
+from app.middleware.baby_selection import BabySelection, resolve_baby_selection
+from app.models.baby import Baby
+from app.models.sleep import Sleep
+
+
+def _scope(headers=(), query=b""):
+    return {"type": "http", "method": "GET", "headers": list(headers), "query_string": query}
+
+
+def test_resolve_order_header_query_cookie():
+    """ヘッダー → クエリ → クッキーの順に解決し、不正な値は無視する"""
+    cookie = (b"cookie", b"session_token=x; selected_baby_id=3")
+
+    assert resolve_baby_selection(_scope([(b"x-baby-id", b"1"), cookie], b"baby_id=2")) == BabySelection(1, 3)
+    assert resolve_baby_selection(_scope([cookie], b"baby_id=2")) == BabySelection(2, 3)
+    assert resolve_baby_selection(_scope([(b"x-baby-id", b"abc"), cookie])) == BabySelection(None, 3)
+    assert resolve_baby_selection(_scope(query=b"baby_id=-1")) == BabySelection(None, None)
+
+
+@pytest.mark.asyncio
+async def test_json_post_selects_baby_by_header(auth_client, db, test_baby):
+    """JSON の書き込みは X-Baby-Id ヘッダーで対象を選択できる"""
+    twin = Baby(family_id=test_baby.family_id, name="Twin")
+    db.add(twin)
+    db.commit()
+    twin_id = twin.id
+    auth_client.cookies.set("selected_baby_id", str(test_baby.id))
+
+    response = await auth_client.post("/api/sleeps/start", json={}, headers={"X-Baby-Id": str(twin_id)})
+
+    assert response.status_code == 200
+    assert db.query(Sleep).one().baby_id == twin_id
+
+
+@pytest.mark.asyncio
+async def test_form_baby_id_requires_legacy_mode(auth_client, db, test_baby, monkeypatch):
+    """フォームの baby_id は互換モードを有効にした場合のみ参照する"""
+    twin = Baby(family_id=test_baby.family_id, name="Twin")
+    db.add(twin)
+    db.commit()
+    twin_id, baby_id = twin.id, test_baby.id
+    auth_client.cookies.set("selected_baby_id", str(baby_id))
+
+    response = await auth_client.post("/api/sleeps/start", data={"baby_id": str(twin_id)})
+    assert response.status_code == 200
+    assert db.query(Sleep).one().baby_id == baby_id
+
+    monkeypatch.setattr(settings, "BABY_SELECTION_FORM_FALLBACK", True)
+    response = await auth_client.post("/api/sleeps/start", data={"baby_id": str(twin_id)})
+    assert response.status_code == 200
+    assert {s.baby_id for s in db.query(Sleep).all()} == {baby_id, twin_id}
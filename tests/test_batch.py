@@ -0,0 +1,99 @@
+"""バッチAPIのテスト"""
+import pytest
+
+from app.models.feeding import Feeding, FeedingType
+from app.utils.time import get_now_naive
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_subrequests_with_one_session_lookup(auth_client, db, test_user, test_baby, count_queries):
+    """内部リクエストは認証コンテキストを共有し、セッション検索は1回のみ"""
+    db.add(Feeding(baby_id=test_baby.id, user_id=test_user.id, feeding_time=get_now_naive(),
+                   feeding_type=FeedingType.BOTTLE, amount_ml=80))
+    db.commit()
+
+    with count_queries() as statements:
+        response = await auth_client.post("/api/batch", json={"requests": [
+            {"key": "family", "path": "/api/families/me"},
+            {"key": "babies", "path": "/api/babies/viewable"},
+            {"key": "feedings", "path": f"/api/feedings?baby_id={test_baby.id}&include_viewable=false"},
+            {"path": "/api/feedings/999999"},
+        ]})
+
+    assert response.status_code == 200
+    results = response.json()["responses"]
+    assert results["family"]["status"] == 200
+    assert results["family"]["body"]["name"] == "テスト家族"
+    assert [b["id"] for b in results["babies"]["body"]["babies"]] == [test_baby.id]
+    assert results["feedings"]["body"]["items"][0]["amount_ml"] == 80
+    assert results["/api/feedings/999999"]["status"] == 404
+    assert all(r["duration_ms"] >= 0 for r in results.values())
+    assert sum("user_sessions" in s for s in statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_invalid_paths(auth_client):
+    """許可リストにないパス（副作用のあるGET・バッチ自身など）・重複キーは拒否する"""
+    for requests in (
+        [{"path": "/static/app.js"}],
+        [{"path": "/api/batch"}],
+        [{"path": "/api/logout"}],
+        [{"path": "/api/health"}],
+        [{"path": "/api/sleeps/start"}],
+        [{"path": "/api/feedings/1/extra"}],
+        [{"key": "a", "path": "/api/me"}, {"key": "a", "path": "/api/families/me"}],
+    ):
+        response = await auth_client.post("/api/batch", json={"requests": requests})
+        assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_batch_uses_one_heavy_slot_and_parent_baby_selection(auth_client, db, test_user, test_baby):
+    """バッチは heavy レーンの1枠で実行し、内部リクエストはパスに指定がなければバッチの X-Baby-Id を使う"""
+    from app.middleware.admission import admission_controller
+    from app.models.baby import Baby
+
+    twin = Baby(family_id=test_baby.family_id, name="双子")
+    db.add(twin)
+    db.commit()
+    db.add(Feeding(baby_id=twin.id, user_id=test_user.id, feeding_time=get_now_naive(),
+                   feeding_type=FeedingType.BOTTLE, amount_ml=80))
+    db.commit()
+    twin_id = twin.id
+
+    heavy = admission_controller.lanes["heavy"]
+    default = admission_controller.lanes["default"]
+    heavy_before, default_before = heavy.admitted, default.admitted
+    response = await auth_client.post("/api/batch", json={"requests": [
+        {"key": "dashboard", "path": "/api/dashboard/data"},
+        {"key": "family", "path": "/api/dashboard/family"},
+        {"key": "histogram", "path": "/api/stats/histogram?type=feeding"},
+    ]}, headers={"X-Baby-Id": str(twin_id)})
+
+    assert response.status_code == 200
+    assert heavy.admitted - heavy_before == 1
+    assert default.admitted == default_before
+    results = response.json()["responses"]
+    assert results["dashboard"]["status"] == 200
+    assert sum(results["histogram"]["body"]["buckets"]) == 1
+    assert len(results["family"]["body"]["babies"]) == 2
+
+
+def test_get_db_reuses_shared_session():
+    """内部リクエストでは親のセッションを返し、クローズしない"""
+    from starlette.requests import Request
+    from app.database import SHARED_DB_STATE_KEY, get_db
+
+    class _Session:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    shared = _Session()
+    request = Request({"type": "http", "headers": [], "state": {SHARED_DB_STATE_KEY: shared}})
+    gen = get_db(request)
+    assert next(gen) is shared
+    with pytest.raises(StopIteration):
+        next(gen)
+    assert not shared.closed
@@ -0,0 +1,75 @@
+"""高速起動（app.boot）のテスト"""
+import pytest
+from alembic import command
+
+from app import boot
+from app.main import app
+
+
+def test_migrate_if_needed_skips_at_head(monkeypatch):
+    """DBが head ならマイグレーション処理を実行しない"""
+    heads = boot.get_head_revisions(boot._alembic_config())
+    assert heads
+    monkeypatch.setattr(boot, "get_current_revisions", lambda: set(heads))
+    monkeypatch.setattr(command, "upgrade", lambda *args: pytest.fail("upgrade should be skipped"))
+
+    assert boot.migrate_if_needed() is False
+
+
+def test_migrate_if_needed_upgrades_when_behind(monkeypatch):
+    """head でなければ alembic upgrade head を実行する"""
+    calls = []
+    monkeypatch.setattr(boot, "get_current_revisions", lambda: {"001"})
+    monkeypatch.setattr(command, "upgrade", lambda config, revision: calls.append(revision))
+
+    assert boot.migrate_if_needed() is True
+    assert calls == ["head"]
+
+
+def test_warm_up_times_each_phase():
+    """ウォームアップはフェーズごとの所要時間を返す"""
+    timings = boot.warm_up(app)
+    assert list(timings) == ["mappers", "schemas", "pool"]
+    assert all(ms >= 0 for ms in timings.values())
+
+
+@pytest.mark.asyncio
+async def test_ready_only_after_warm_up(client, monkeypatch):
+    """ウォームアップ完了までは503、完了後は200"""
+    monkeypatch.setattr(app.state, "ready", False, raising=False)
+    response = await client.get("/api/ready")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+    app.state.ready = True
+    response = await client.get("/api/ready")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ready"
+    assert set(data["admission"]) == {"cheap", "heavy", "default"}
+    assert "queue_ms_max" in data["admission"]["heavy"]
+
+
+@pytest.mark.asyncio
+async def test_ready_only_after_bcrypt_calibration(monkeypatch):
+    """bcrypt コストが確定してから ready にし、確定できなければ ready にしない"""
+    from app import main
+    from app.services.auth_service import AuthService
+
+    monkeypatch.setattr(app.state, "ready", False, raising=False)
+    monkeypatch.setattr(AuthService, "rounds", AuthService.rounds)
+    monkeypatch.setattr(AuthService, "rounds_settled", False)
+    monkeypatch.setattr(boot, "warm_up", lambda app: {"mappers": 0.0})
+
+    def _unavailable():
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(main, "_resolve_bcrypt_rounds", _unavailable)
+    with pytest.raises(RuntimeError):
+        await main._warm_up(app, retry=False)
+    assert not app.state.ready and not AuthService.rounds_settled
+
+    monkeypatch.setattr(main, "_resolve_bcrypt_rounds", lambda: (11, None))
+    await main._warm_up(app, retry=False)
+    assert app.state.ready
+    assert AuthService.rounds == 11 and AuthService.rounds_settled
@@ -43,3 +43,36 @@ async def test_csrf_protection_flow(client: AsyncClient):
     # It might be 400 if validation fails, or 401 if auth fails.
     # Accepting both as success for CSRF check purposes.
     assert response.status_code in (400, 401, 200, 303), f"Unexpected status: {response.status_code}"
+
+
+@pytest.mark.asyncio
+async def test_csrf_cookie_issued_only_when_missing(client: AsyncClient):
+    """クッキーがある場合は再発行しない"""
+    response = await client.get("/api/health")
+    csrf_token = response.cookies["csrf_token"]
+
+    client.cookies.set("csrf_token", csrf_token)
+    response = await client.get("/api/health")
+    assert "set-cookie" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_csrf_form_token_fallback(client: AsyncClient):
+    """ヘッダーのないフォーム送信はボディの csrf_token で照合する"""
+    csrf_token = (await client.get("/api/health")).cookies["csrf_token"]
+    client.cookies.set("csrf_token", csrf_token)
+
+    response = await client.post("/api/login", data={"username": "u", "password": "p", "csrf_token": "wrong"})
+    assert response.status_code == 403
+
+    response = await client.post("/api/login", data={"username": "u", "password": "p", "csrf_token": csrf_token})
+    assert response.status_code != 403
+
+
+@pytest.mark.asyncio
+async def test_csrf_rejects_before_routing(client: AsyncClient):
+    """ヘッダーのない JSON 送信はミドルウェアで拒否され、新しいトークンが発行される"""
+    response = await client.post("/api/login", json={"username": "u", "password": "p"})
+    assert response.status_code == 403
+    assert response.json()["detail"] == "CSRF token missing or incorrect"
+    assert "csrf_token" in response.cookies
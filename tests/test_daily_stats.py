@@ -0,0 +1,134 @@
+"""日次集計（baby_daily_stats）のテスト"""
+from datetime import timedelta
+
+from sqlalchemy import select
+
+from app.models.baby import Baby
+from app.models.daily_stats import STAT_COLUMNS, BabyDailyStats
+from app.models.diaper import Diaper, DiaperType
+from app.models.feeding import Feeding, FeedingType
+from app.models.sleep import Sleep
+from app.services.daily_stats_service import DailyStatsService
+from app.services.statistics_service import StatisticsService
+from app.utils import sql
+from app.utils.time import get_now_naive
+
+
+def _snapshot(db, baby_id):
+    """集計行を {日付: 値} で取得（全て0の行は除く）"""
+    rows = db.execute(select(BabyDailyStats).where(BabyDailyStats.baby_id == baby_id)).scalars()
+    result = {}
+    for row in rows:
+        values = {c: getattr(row, c) for c in STAT_COLUMNS}
+        if any(values.values()):
+            result[row.stat_date] = values
+    return result
+
+
+def test_rollup_follows_create_update_delete(db, test_user, test_baby):
+    """追加・更新・削除の差分が集計に反映され、再構築の結果と一致する"""
+    now = get_now_naive().replace(hour=12, minute=0)
+    yesterday = now - timedelta(days=1)
+    feeding = Feeding(baby_id=test_baby.id, user_id=test_user.id, feeding_time=now,
+                      feeding_type=FeedingType.BOTTLE, amount_ml=100)
+    sleep = Sleep(baby_id=test_baby.id, user_id=test_user.id, start_time=now - timedelta(hours=2))
+    diaper = Diaper(baby_id=test_baby.id, user_id=test_user.id, change_time=now, diaper_type=DiaperType.WET)
+    db.add_all([feeding, sleep, diaper])
+    db.commit()
+
+    today = _snapshot(db, test_baby.id)[now.date()]
+    assert today["feeding_count"] == 1 and today["feeding_amount_ml"] == 100
+    assert today["sleep_count"] == 0  # 継続中の睡眠は含めない
+    assert today["diaper_wet"] == 1
+
+    # 睡眠の終了、授乳の日付変更、おむつの種類変更
+    sleep.end_time = now - timedelta(minutes=30)
+    feeding.feeding_time = yesterday
+    feeding.amount_ml = 80
+    diaper.diaper_type = DiaperType.BOTH
+    db.commit()
+
+    snapshot = _snapshot(db, test_baby.id)
+    assert snapshot[now.date()]["sleep_seconds"] == 90 * 60
+    assert snapshot[now.date()]["feeding_count"] == 0
+    assert snapshot[now.date()]["diaper_wet"] == 0 and snapshot[now.date()]["diaper_both"] == 1
+    assert snapshot[yesterday.date()]["feeding_amount_ml"] == 80
+
+    db.delete(diaper)
+    db.commit()
+    assert _snapshot(db, test_baby.id)[now.date()]["diaper_both"] == 0
+
+    incremental = _snapshot(db, test_baby.id)
+    DailyStatsService.rebuild(db, test_baby.id)
+    assert _snapshot(db, test_baby.id) == incremental
+
+
+def test_stats_read_rollup(db, test_user, test_baby):
+    """統計は日次集計の合計から計算する"""
+    now = get_now_naive()
+    db.add_all([
+        Feeding(baby_id=test_baby.id, user_id=test_user.id, feeding_time=now - timedelta(hours=1),
+                feeding_type=FeedingType.BOTTLE, amount_ml=120),
+        Feeding(baby_id=test_baby.id, user_id=test_user.id, feeding_time=now - timedelta(hours=2),
+                feeding_type=FeedingType.BREAST),
+        Feeding(baby_id=test_baby.id, user_id=test_user.id, feeding_time=now - timedelta(days=10),
+                feeding_type=FeedingType.BOTTLE, amount_ml=500),
+        Diaper(baby_id=test_baby.id, user_id=test_user.id, change_time=now, diaper_type=DiaperType.DIRTY),
+    ])
+    db.commit()
+
+    feeding = StatisticsService.get_feeding_stats(db, test_baby.id)
+    assert feeding["count"] == 2
+    assert feeding["avg_amount_ml"] == 120.0
+    diaper = StatisticsService.get_diaper_stats(db, test_baby.id)
+    assert diaper["count"] == 1
+    assert diaper["by_type"] == {"wet": 0, "dirty": 1, "both": 0}
+
+
+def test_baby_deletion_removes_rollup(db, test_user, test_family):
+    """赤ちゃんを削除すると集計行も削除される"""
+    baby = Baby(name="削除", family_id=test_family.id)
+    db.add(baby)
+    db.commit()
+    db.add(Feeding(baby_id=baby.id, user_id=test_user.id, feeding_time=get_now_naive(),
+                   feeding_type=FeedingType.BREAST))
+    db.commit()
+    baby_id = baby.id
+    assert _snapshot(db, baby_id)
+
+    db.delete(baby)
+    db.commit()
+    assert db.execute(select(BabyDailyStats).where(BabyDailyStats.baby_id == baby_id)).first() is None
+
+
+def test_rollup_without_on_conflict(db, test_user, test_baby, monkeypatch):
+    """ON CONFLICT 非対応の方言では UPDATE / INSERT で加算する"""
+    monkeypatch.setattr(sql, "supports_on_conflict", lambda db: False)
+    now = get_now_naive()
+    for _ in range(2):
+        db.add(Feeding(baby_id=test_baby.id, user_id=test_user.id, feeding_time=now,
+                       feeding_type=FeedingType.BOTTLE, amount_ml=50))
+        db.commit()
+
+    assert _snapshot(db, test_baby.id)[now.date()]["feeding_count"] == 2
+
+
+def test_stats_window_is_calendar_days(db, test_user, test_baby):
+    """集計期間は今日を含む直近 days 日（その前日の記録は含めない）"""
+    from datetime import datetime, time
+
+    today = get_now_naive().date()
+    inside = datetime.combine(today - timedelta(days=6), time.min)
+    outside = datetime.combine(today - timedelta(days=7), time(23, 59))
+    for at in (inside, outside):
+        db.add(Feeding(baby_id=test_baby.id, user_id=test_user.id, feeding_time=at,
+                       feeding_type=FeedingType.BOTTLE, amount_ml=100))
+        db.add(Diaper(baby_id=test_baby.id, user_id=test_user.id, change_time=at, diaper_type=DiaperType.WET))
+        db.add(Sleep(baby_id=test_baby.id, user_id=test_user.id, start_time=at, end_time=at + timedelta(minutes=30)))
+    db.commit()
+
+    assert StatisticsService.window_start(7) == inside.date()
+    assert StatisticsService.get_feeding_stats(db, test_baby.id)["count"] == 1
+    assert StatisticsService.get_diaper_stats(db, test_baby.id)["count"] == 1
+    assert StatisticsService.get_sleep_stats(db, test_baby.id)["count"] == 1
+    assert StatisticsService.get_feeding_stats(db, test_baby.id, days=1)["count"] == 0
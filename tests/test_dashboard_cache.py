@@ -0,0 +1,70 @@
+"""ダッシュボードキャッシュのテスト"""
+from datetime import date
+
+import pytest
+
+from app.models.feeding import Feeding, FeedingType
+from app.models.growth import Growth
+from app.services.dashboard_cache import DashboardCache, dashboard_cache
+from app.utils.time import get_now_naive
+
+
+@pytest.mark.asyncio
+async def test_dashboard_cached_until_record_written(auth_client, db, test_user, test_baby):
+    """2回目はキャッシュから返し、記録の作成でバージョンが進むと組み立て直す"""
+    db.add(Growth(baby_id=test_baby.id, user_id=test_user.id, measurement_date=date.today(), weight_kg=3.5))
+    db.add(Feeding(baby_id=test_baby.id, user_id=test_user.id, feeding_time=get_now_naive(),
+                   feeding_type=FeedingType.BOTTLE, amount_ml=100))
+    db.commit()
+    url = f"/api/dashboard/data?baby_id={test_baby.id}"
+
+    first = await auth_client.get(url)
+    assert first.status_code == 200
+    data = first.json()
+    assert data["latest_growth"]["weight_kg"] == 3.5
+    assert data["recent_records"]["feedings"][0]["amount_ml"] == 100
+    assert data["feeding_stats"]["count"] == 1
+
+    second = await auth_client.get(url)
+    assert second.content == first.content
+    assert dashboard_cache.stats()["hits"] == 1
+
+    response = await auth_client.post("/api/feedings", json={
+        "feeding_time": get_now_naive().isoformat(), "feeding_type": "bottle", "amount_ml": 60,
+    }, headers={"X-Baby-Id": str(test_baby.id)})
+    assert response.status_code == 200
+
+    data = (await auth_client.get(url)).json()
+    assert data["feeding_stats"]["count"] == 2
+    assert dashboard_cache.stats()["misses"] == 2
+
+
+def test_rollback_does_not_bump(db, test_user, test_baby):
+    """ロールバックされた変更ではバージョンを進めない"""
+    version = dashboard_cache.version(test_baby.id)
+    db.add(Feeding(baby_id=test_baby.id, user_id=test_user.id, feeding_time=get_now_naive(),
+                   feeding_type=FeedingType.BREAST))
+    db.flush()
+    db.rollback()
+    assert dashboard_cache.version(test_baby.id) == version
+
+
+def test_cache_eviction_and_metrics():
+    """上限を超えると古いエントリから破棄し、ヒット率を記録する"""
+    cache = DashboardCache(max_size=2, ttl_seconds=60)
+    for baby_id in (1, 2, 3):
+        cache.put((baby_id, ()), cache.version(baby_id), b"{}")
+
+    assert cache.get((1, ())) is None
+    assert cache.get((3, ())) == b"{}"
+    cache.bump([3])
+    assert cache.get((3, ())) is None
+
+    assert cache.stats() == {"size": 2, "hits": 1, "misses": 2, "evictions": 1, "hit_ratio": 0.333}
+
+
+def test_cache_entry_expires():
+    """TTL を過ぎたエントリは使わない"""
+    cache = DashboardCache(max_size=2, ttl_seconds=0)
+    cache.put((1, ()), 0, b"{}")
+    assert cache.get((1, ())) is None
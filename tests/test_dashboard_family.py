@@ -0,0 +1,86 @@
+"""家族ダッシュボードAPIのテスト"""
+from datetime import date, timedelta
+
+import pytest
+
+from app.models.baby import Baby
+from app.models.diaper import Diaper, DiaperType
+from app.models.family_user import FamilyUser
+from app.models.feeding import Feeding, FeedingType
+from app.models.growth import Growth
+from app.models.sleep import Sleep
+from app.models.user import User
+from app.services.permission_service import PermissionService
+from app.utils.time import get_now_naive
+
+
+def _add_twin(db, test_user, test_baby):
+    """双子のもう1人と、それぞれの記録を作成"""
+    twin = Baby(family_id=test_baby.family_id, name="双子")
+    db.add(twin)
+    db.commit()
+    now = get_now_naive()
+    for baby, amounts in ((test_baby, [100, 120]), (twin, [80])):
+        for amount in amounts:
+            db.add(Feeding(baby_id=baby.id, user_id=test_user.id, feeding_type=FeedingType.BOTTLE,
+                           feeding_time=now - timedelta(hours=1), amount_ml=amount))
+    db.add(Sleep(baby_id=test_baby.id, user_id=test_user.id,
+                 start_time=now - timedelta(hours=5), end_time=now - timedelta(hours=3)))
+    db.add(Sleep(baby_id=twin.id, user_id=test_user.id, start_time=now - timedelta(minutes=30)))
+    db.add(Diaper(baby_id=twin.id, user_id=test_user.id, diaper_type=DiaperType.WET, change_time=now))
+    db.add(Growth(baby_id=test_baby.id, user_id=test_user.id,
+                  measurement_date=date.today() - timedelta(days=7), weight_kg=3.0))
+    db.add(Growth(baby_id=test_baby.id, user_id=test_user.id, measurement_date=date.today(), weight_kg=3.4))
+    db.commit()
+    return twin
+
+
+@pytest.mark.asyncio
+async def test_family_dashboard_all_babies(auth_client, db, test_user, test_baby, count_queries):
+    """閲覧可能な赤ちゃん全員の統計を返し、クエリ数は赤ちゃんの人数に依存しない"""
+    twin = _add_twin(db, test_user, test_baby)
+
+    with count_queries() as statements:
+        response = await auth_client.get("/api/dashboard/family")
+
+    assert response.status_code == 200
+    babies = {item["baby"]["id"]: item for item in response.json()["babies"]}
+    assert list(babies) == [test_baby.id, twin.id]
+
+    first, second = babies[test_baby.id], babies[twin.id]
+    assert first["feeding_stats"]["count"] == 2 and first["feeding_stats"]["avg_amount_ml"] == 110
+    assert second["feeding_stats"]["count"] == 1
+    assert first["sleep_stats"]["count"] == 1 and first["sleep_stats"]["total_hours"] == 2
+    assert second["sleep_stats"]["count"] == 1 and second["sleep_stats"]["total_hours"] == 0.5
+    assert first["diaper_stats"]["count"] == 0
+    assert second["diaper_stats"]["by_type"] == {"wet": 1, "dirty": 0, "both": 0}
+    assert first["latest_growth"]["weight_kg"] == 3.4
+    assert second["latest_growth"] is None
+    assert all(first["perms"].values())
+
+    # 日次集計は記録タイプごとに1回（赤ちゃんごとではない）
+    assert sum("baby_daily_stats" in s for s in statements) == 3
+    assert sum("FROM growths" in s for s in statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_family_dashboard_filters_by_permission(client, login, db, test_user, test_baby):
+    """メンバーには閲覧権限のある赤ちゃん・記録タイプのみ返す"""
+    twin = _add_twin(db, test_user, test_baby)
+    member = User(username="member", hashed_password="hashed_password")
+    db.add(member)
+    db.commit()
+    db.add(FamilyUser(family_id=test_baby.family_id, user_id=member.id, role="member"))
+    db.commit()
+    PermissionService.update_permissions(db, member.id, twin.id, {"basic_info": True, "feeding": True})
+    await login(member.id)
+
+    response = await client.get("/api/dashboard/family")
+    assert response.status_code == 200
+    babies = response.json()["babies"]
+    assert [item["baby"]["id"] for item in babies] == [twin.id]
+    assert babies[0]["feeding_stats"]["count"] == 1
+    assert babies[0]["sleep_stats"] is None
+    assert babies[0]["diaper_stats"] is None
+    assert babies[0]["latest_growth"] is None
+    assert babies[0]["perms"]["feeding"] and not babies[0]["perms"]["growth"]
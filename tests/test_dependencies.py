@@ -46,13 +46,49 @@ async def test_get_current_baby_dependency_logic(db: Session):
     assert current_user.id == user.id
 
     # 2. get_current_baby (This is where the NameError was)
-    # Simulate FastAPI resolving the Query parameter
-    res_baby = await get_current_baby(
-        request=request,
+    # Simulate FastAPI resolving the selected baby id
+    res_baby = get_current_baby(
         user=current_user,
         family=family,
-        baby_id=None, # Passed as None, not Query(None)
-        selected_baby_id=None,
+        baby_id=None,
         db=db
     )
     assert res_baby.id == baby.id
+
+
+def test_auth_context_single_query(db: Session, test_user, test_baby, create_session, count_queries):
+    """セッション・ユーザー・家族・赤ちゃんを1クエリで解決する"""
+    from starlette.requests import Request as StarletteRequest
+    from app.dependencies import get_auth_context, get_current_family
+
+    token = create_session(test_user.id)
+    db.expire_all()
+
+    request = StarletteRequest({"type": "http", "method": "GET", "headers": []})
+    with count_queries() as statements:
+        context = get_auth_context(request=request, session_token=token, db=db)
+        family = get_current_family(context=get_auth_context(request=request, session_token=token, db=db))
+        babies = [b.name for b in family.babies]
+
+    assert context.user.id == test_user.id
+    assert context.family_user.role == "admin"
+    assert babies == [test_baby.name]
+    assert len(statements) == 1
+
+
+def test_record_routes_run_in_threadpool():
+    """同期DBアクセスを行うAPIはスレッドプールで実行される def で定義する"""
+    import inspect
+    from fastapi.routing import APIRoute
+    from app.main import app
+
+    # login/register は bcrypt をプロセスプールに渡すため、batch は内部リクエストを await するため async
+    allowed_async = {"/api/login", "/api/register", "/api/health", "/api/ready", "/api/batch"}
+    async_routes = [
+        route.path for route in app.routes
+        if isinstance(route, APIRoute)
+        and route.path.startswith("/api/")
+        and route.path not in allowed_async
+        and inspect.iscoroutinefunction(route.endpoint)
+    ]
+    assert async_routes == []
@@ -0,0 +1,42 @@
+"""パスワードハッシュ実行サービスのテスト"""
+import asyncio
+
+import pytest
+
+from app.services.auth_service import AuthService
+from app.services.password_hasher import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_in_process_pool():
+    """プロセスプールでハッシュ化・検証できる"""
+    hasher = PasswordHasher(max_workers=1, max_pending=4)
+    try:
+        hashed = await hasher.hash("password123")
+        assert AuthService.verify_password("password123", hashed)
+        assert await hasher.verify("password123", hashed) is True
+        assert await hasher.verify("wrong", hashed) is False
+    finally:
+        hasher.shutdown()
+
+    stats = hasher.stats()
+    assert stats["completed"] == 3
+    assert stats["pending"] == 0
+    assert stats["max_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_full():
+    """待ち行列が上限に達すると即座に失敗する"""
+    hasher = PasswordHasher(max_workers=0, max_pending=1)
+    hashed = AuthService.get_password_hash("password123")
+
+    results = await asyncio.gather(
+        hasher.verify("password123", hashed),
+        hasher.verify("password123", hashed),
+        return_exceptions=True,
+    )
+
+    assert results.count(True) == 1
+    assert sum(isinstance(r, PasswordHasherBusy) for r in results) == 1
+    assert hasher.stats()["rejected"] == 1
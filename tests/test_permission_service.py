@@ -1,8 +1,10 @@
 """権限サービスのテスト"""
+import pytest
+
 from app.models.family_user import FamilyUser
 from app.models.baby import Baby
 from app.models.baby_permission import BabyPermission
-from app.services.permission_service import PermissionService
+from app.services.permission_service import PermissionService, RECORD_TYPES
 
 
 def test_get_user_permissions_batch_admin(db, test_user, test_family):
@@ -147,3 +149,187 @@ def test_get_user_permissions_batch_query_count(db, test_user, test_family):
     # 全てTrue
     assert all(result[baby_id] for baby_id in baby_ids)
     assert len(result) == 10
+
+
+def test_permission_context_loaded_once_per_session(db, test_user, test_family, count_queries):
+    """同一セッション内の権限チェックは最初の読み込み以降クエリを発行しない"""
+    db.add(FamilyUser(family_id=test_family.id, user_id=test_user.id, role="member"))
+    baby1 = Baby(family_id=test_family.id, name="Baby1")
+    baby2 = Baby(family_id=test_family.id, name="Baby2")
+    db.add_all([baby1, baby2])
+    db.commit()
+    db.add(BabyPermission(user_id=test_user.id, baby_id=baby1.id, record_type="feeding", can_view=True))
+    db.commit()
+    baby1_id, baby2_id = baby1.id, baby2.id
+    user_id, family_id = test_user.id, test_family.id
+
+    with count_queries() as statements:
+        assert PermissionService.can_view_baby_record(db, user_id, family_id, baby1_id, "feeding")
+        assert not PermissionService.can_view_baby_record(db, user_id, family_id, baby2_id, "feeding")
+        perms = PermissionService.get_user_permissions(db, test_user.id, baby1_id, test_family.id)
+        batch = PermissionService.get_user_permissions_batch(
+            db, user_id, [baby1_id, baby2_id], family_id, "feeding"
+        )
+
+    assert perms["feeding"] is True and perms["sleep"] is False
+    assert batch == {baby1_id: True, baby2_id: False}
+    # FamilyUser と BabyPermission の2クエリのみ
+    assert len(statements) == 2
+
+    # 更新（コミット）後は読み直される
+    PermissionService.update_permissions(db, user_id, baby2_id, {"feeding": True})
+    assert PermissionService.can_view_baby_record(db, user_id, family_id, baby2_id, "feeding")
+
+
+def test_permission_matrix_cached_across_sessions(db, test_user, test_family, count_queries):
+    """別のDBセッションでもマトリクスを再利用し、権限変更のコミットで無効化される"""
+    from sqlalchemy.orm import Session
+    from app.models.family import Family
+    from app.services.permission_service import permission_cache
+
+    db.add(FamilyUser(family_id=test_family.id, user_id=test_user.id, role="member"))
+    baby = Baby(family_id=test_family.id, name="Baby1")
+    db.add(baby)
+    db.commit()
+    baby_id, user_id, family_id = baby.id, test_user.id, test_family.id
+
+    assert not PermissionService.can_view_baby_record(db, user_id, family_id, baby_id, "sleep")
+
+    other = Session(bind=db.get_bind())
+    try:
+        # リクエストでは家族は認証コンテキストでロード済み
+        family = other.get(Family, family_id)
+        with count_queries() as statements:
+            assert not PermissionService.can_view_baby_record(other, user_id, family_id, baby_id, "sleep")
+    finally:
+        other.close()
+    assert statements == []
+    assert family.permission_version == test_family.permission_version
+    assert permission_cache.stats()["hits"] == 1
+
+    # ORM経由で直接追加した権限もコミット時にバージョンが進む
+    db.add(BabyPermission(user_id=user_id, baby_id=baby_id, record_type="sleep", can_view=True))
+    db.commit()
+    assert PermissionService.can_view_baby_record(db, user_id, family_id, baby_id, "sleep")
+    assert PermissionService.get_context(db, user_id, family_id).mask(baby_id) == 1 << 1
+
+
+def test_permission_change_committed_by_other_process(db, test_user, test_family):
+    """別のワーカーでコミットされた権限変更も、DB上の家族の権限バージョンで検出する"""
+    from sqlalchemy import text
+    from sqlalchemy.orm import Session
+    from app.models.family import Family
+    from app.services.permission_service import permission_cache
+
+    db.add(FamilyUser(family_id=test_family.id, user_id=test_user.id, role="member"))
+    baby = Baby(family_id=test_family.id, name="Baby1")
+    db.add(baby)
+    db.commit()
+    baby_id, user_id, family_id = baby.id, test_user.id, test_family.id
+    version = db.get(Family, family_id).permission_version
+
+    # 権限の更新は同じトランザクションで家族の権限バージョンを進める
+    PermissionService.update_permissions(db, user_id, baby_id, {"feeding": True}, family_id)
+    assert db.get(Family, family_id).permission_version == version + 1
+    assert PermissionService.can_view_baby_record(db, user_id, family_id, baby_id, "feeding")
+
+    # 別プロセスのコミット（このプロセスのイベントリスナーは通らない）
+    with db.get_bind().begin() as conn:
+        conn.execute(text(
+            "UPDATE baby_permissions SET can_view = :can_view WHERE baby_id = :baby_id AND user_id = :user_id"
+        ), {"can_view": False, "baby_id": baby_id, "user_id": user_id})
+        conn.execute(text(
+            "UPDATE families SET permission_version = permission_version + 1 WHERE id = :id"
+        ), {"id": family_id})
+
+    # 次のリクエスト（新しいセッション）ではキャッシュ済みのマトリクスを使わない
+    other = Session(bind=db.get_bind())
+    try:
+        assert not PermissionService.can_view_baby_record(other, user_id, family_id, baby_id, "feeding")
+    finally:
+        other.close()
+    assert permission_cache.stats()["misses"] >= 2
+
+
+def test_update_permissions_bulk_single_statement(db, test_user, test_family, count_queries):
+    """複数の赤ちゃんの権限を1回の UPSERT とコミットで更新する"""
+    db.add(FamilyUser(family_id=test_family.id, user_id=test_user.id, role="member"))
+    baby1 = Baby(family_id=test_family.id, name="Twin1")
+    baby2 = Baby(family_id=test_family.id, name="Twin2")
+    db.add_all([baby1, baby2])
+    db.commit()
+    baby1_id, baby2_id = baby1.id, baby2.id
+    user_id, family_id = test_user.id, test_family.id
+    PermissionService.update_permissions(db, user_id, baby1_id, {"feeding": True}, family_id)
+
+    with count_queries() as statements:
+        PermissionService.update_permissions_bulk(db, user_id, family_id, {
+            baby1_id: {"feeding": False, "sleep": True},
+            baby2_id: {"feeding": True, "basic_info": True},
+        })
+
+    # UPSERT 1回と、同じトランザクションでの家族の権限バージョン更新
+    assert len(statements) == 2
+    assert statements[0].lstrip().upper().startswith("INSERT")
+    assert statements[1].lstrip().startswith("UPDATE families")
+    assert db.query(BabyPermission).count() == 4
+    assert PermissionService.get_user_permissions(db, user_id, baby1_id, family_id)["feeding"] is False
+    assert PermissionService.get_user_permissions(db, user_id, baby1_id, family_id)["sleep"] is True
+    assert PermissionService.can_view_baby_record(db, user_id, family_id, baby2_id, "basic_info")
+
+
+@pytest.mark.asyncio
+async def test_update_member_permissions_rejects_other_family_baby(auth_client, db, test_user, test_family):
+    """他の家族の赤ちゃんの権限は更新できない"""
+    from app.models.family import Family
+    from app.models.user import User
+
+    member = User(username="member_user", hashed_password="hashed_password")
+    other_family = Family(name="Other", invite_code="OTHER123")
+    db.add_all([member, other_family])
+    db.commit()
+    db.add_all([
+        FamilyUser(family_id=test_family.id, user_id=test_user.id, role="admin"),
+        FamilyUser(family_id=test_family.id, user_id=member.id, role="member"),
+    ])
+    own_baby = Baby(family_id=test_family.id, name="Own")
+    other_baby = Baby(family_id=other_family.id, name="Other")
+    db.add_all([own_baby, other_baby])
+    db.commit()
+    member_id, own_id, other_id = member.id, own_baby.id, other_baby.id
+
+    response = await auth_client.post(
+        f"/api/families/members/{member_id}/permissions",
+        json=[{"baby_id": other_id, "permissions": {"feeding": True}}],
+    )
+    assert response.status_code == 404
+
+    response = await auth_client.post(
+        f"/api/families/members/{member_id}/permissions",
+        json=[{"baby_id": own_id, "permissions": {"feeding": True, "basic_info": True}}],
+    )
+    assert response.status_code == 200
+    assert PermissionService.get_user_permissions(db, member_id, own_id, test_family.id) == {
+        **{k: False for k in RECORD_TYPES},
+        "feeding": True,
+        "basic_info": True,
+    }
+
+
+def test_update_permissions_bulk_fallback_without_on_conflict(db, test_user, test_family, monkeypatch):
+    """ON CONFLICT 非対応の方言では行ごとの UPDATE / INSERT で同じ結果になる"""
+    from app.utils import sql
+
+    monkeypatch.setattr(sql, "supports_on_conflict", lambda db: False)
+    db.add(FamilyUser(family_id=test_family.id, user_id=test_user.id, role="member"))
+    baby = Baby(family_id=test_family.id, name="Baby1")
+    db.add(baby)
+    db.commit()
+    baby_id, user_id, family_id = baby.id, test_user.id, test_family.id
+
+    PermissionService.update_permissions(db, user_id, baby_id, {"feeding": True, "sleep": True})
+    PermissionService.update_permissions(db, user_id, baby_id, {"feeding": False})
+
+    assert db.query(BabyPermission).count() == 2
+    perms = PermissionService.get_user_permissions(db, user_id, baby_id, family_id)
+    assert perms["feeding"] is False and perms["sleep"] is True
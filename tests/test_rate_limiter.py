@@ -0,0 +1,52 @@
+"""レート制限のテスト"""
+import pytest
+
+from app.routers.auth import login_rate_limiter
+from app.services.rate_limiter import TokenBucketLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refill_and_eviction():
+    """バースト分を使い切ると拒否され、時間経過で回復・回収される"""
+    clock = FakeClock()
+    limiter = TokenBucketLimiter(capacity=2, refill_per_second=1, evict_interval_seconds=10, clock=clock)
+
+    assert limiter.acquire("a") == 0
+    assert limiter.acquire("a") == 0
+    assert limiter.acquire("a") == pytest.approx(1.0)
+    assert limiter.acquire("b") == 0
+
+    clock.now = 1.0
+    assert limiter.acquire("a") == 0
+
+    clock.now = 20.0
+    assert limiter.evict() == 2
+    assert len(limiter) == 0
+
+    # 回収したスロットは再利用される
+    assert limiter.acquire("c") == 0
+    assert len(limiter._tokens) == 2
+
+
+@pytest.mark.asyncio
+async def test_login_rate_limited_before_lookup(client, monkeypatch):
+    """上限を超えたログインは 429 と Retry-After を返す"""
+    monkeypatch.setattr(login_rate_limiter, "capacity", 1)
+
+    response = await client.get("/api/health")
+    headers = {"X-CSRF-Token": response.cookies["csrf_token"]}
+    payload = {"username": "nobody", "password": "password"}
+
+    first = await client.post("/api/login", json=payload, headers=headers)
+    assert first.status_code == 401
+
+    second = await client.post("/api/login", json=payload, headers=headers)
+    assert second.status_code == 429
+    assert int(second.headers["Retry-After"]) >= 1
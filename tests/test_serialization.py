@@ -0,0 +1,52 @@
+"""レスポンスのシリアライズのテスト"""
+from datetime import timedelta
+
+import pytest
+
+from app.models.contraction import Contraction
+from app.models.feeding import Feeding, FeedingType
+from app.models.sleep import Sleep
+from app.schemas.feeding import FeedingResponse
+from app.schemas.responses import ListResponse
+from app.utils import serialization
+from app.utils.time import get_now_naive
+
+
+def test_type_adapter_is_cached():
+    """同じ型の TypeAdapter は再利用される"""
+    adapter = serialization.get_type_adapter(ListResponse[FeedingResponse])
+    assert serialization.get_type_adapter(ListResponse[FeedingResponse]) is adapter
+
+
+def test_dumps_stdlib_fallback(monkeypatch):
+    """orjson がない環境では標準の json で同じ内容を出力する"""
+    content = {"name": "赤ちゃん", "items": [1, None, True]}
+    with_orjson = serialization.dumps(content)
+    monkeypatch.setattr(serialization, "orjson", None)
+    assert serialization.dumps(content) == with_orjson == '{"name":"赤ちゃん","items":[1,null,true]}'.encode("utf-8")
+
+
+@pytest.mark.asyncio
+async def test_list_endpoints_single_pass_payload(auth_client, db, test_user, test_baby):
+    """一覧APIはORM行を1回の検証で同じ形のJSONにする"""
+    now = get_now_naive()
+    db.add(Feeding(baby_id=test_baby.id, user_id=test_user.id, feeding_time=now,
+                   feeding_type=FeedingType.BOTTLE, amount_ml=80))
+    db.add(Sleep(baby_id=test_baby.id, user_id=test_user.id, start_time=now - timedelta(hours=1)))
+    db.add(Contraction(baby_id=test_baby.id, user_id=test_user.id, start_time=now))
+    db.commit()
+
+    data = (await auth_client.get("/api/feedings")).json()
+    assert data["items"][0]["amount_ml"] == 80
+    assert data["baby"]["id"] == test_baby.id
+    assert [b["id"] for b in data["viewable_babies"]] == [test_baby.id]
+
+    # 以前は ListResponse に存在しないため落ちていた ongoing_sleep も返す
+    data = (await auth_client.get("/api/sleeps")).json()
+    assert data["ongoing_sleep"]["is_ongoing"] is True
+    assert data["items"][0]["id"] == data["ongoing_sleep"]["id"]
+
+    data = (await auth_client.get("/api/contractions")).json()
+    assert data["ongoing"]["is_ongoing"] is True
+    assert data["stats"] is not None
+    assert data["baby"]["name"] == test_baby.name
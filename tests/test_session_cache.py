@@ -0,0 +1,56 @@
+"""セッションキャッシュのテスト"""
+from datetime import timedelta
+
+from app.dependencies import get_current_user
+from app.services.session_cache import SessionCache, session_cache
+from app.utils.time import get_now_naive
+
+
+def test_cache_hit_skips_db(db, test_user, create_session, count_queries):
+    """2回目以降の認証はDBにアクセスしない"""
+    token = create_session(test_user.id)
+
+    first = get_current_user(request=None, session_token=token, db=db)
+    assert first.id == test_user.id
+
+    with count_queries() as queries:
+        second = get_current_user(request=None, session_token=token, db=db)
+
+    assert second.id == test_user.id
+    assert queries == []
+    assert session_cache.stats()["hits"] == 1
+
+
+def test_lru_eviction_and_invalidate(test_user):
+    """上限を超えると古いエントリから追い出される"""
+    cache = SessionCache(max_size=2, ttl_seconds=60)
+    expires = get_now_naive() + timedelta(days=1)
+    cache.put("a", test_user, expires)
+    cache.put("b", test_user, expires)
+    cache.get("a")
+    cache.put("c", test_user, expires)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+    cache.invalidate_user(test_user.id)
+    assert cache.get("c") is None
+    assert cache.stats()["misses"] == 3
+
+
+def test_expired_session_not_served(test_user):
+    """セッション自体の有効期限が切れたエントリは返さない"""
+    cache = SessionCache(max_size=10, ttl_seconds=60)
+    cache.put("old", test_user, get_now_naive() - timedelta(seconds=1))
+    assert cache.get("old") is None
+
+
+def test_user_delete_invalidates(db, test_user):
+    """ユーザー削除でキャッシュが無効化される"""
+    session_cache.put("deleted_token", test_user, get_now_naive() + timedelta(days=1))
+    db.delete(test_user)
+    db.commit()
+    assert session_cache.get("deleted_token") is None
@@ -0,0 +1,35 @@
+"""期限切れセッション削除のテスト"""
+from datetime import timedelta
+
+from app.dependencies import get_current_user_optional
+from app.models.session import UserSession
+from app.services.session_reaper import SessionReaper
+from app.utils.time import get_now_naive
+
+
+def test_purge_expired_in_batches(db, test_user):
+    """期限切れセッションのみをバッチ単位で全件削除する"""
+    past = get_now_naive() - timedelta(minutes=1)
+    db.add_all([
+        UserSession(token=f"expired_{i}", user_id=test_user.id, expires_at=past)
+        for i in range(5)
+    ])
+    db.add(UserSession(token="valid", user_id=test_user.id, expires_at=UserSession.default_expires_at()))
+    db.commit()
+
+    deleted = SessionReaper.purge_expired(db, batch_size=2)
+
+    assert deleted == 5
+    assert [s.token for s in db.query(UserSession).all()] == ["valid"]
+
+
+def test_expired_session_rejected_without_write(db, test_user):
+    """認証時に期限切れセッションを拒否するが削除はしない"""
+    db.add(UserSession(
+        token="stale", user_id=test_user.id,
+        expires_at=get_now_naive() - timedelta(minutes=1),
+    ))
+    db.commit()
+
+    assert get_current_user_optional(session_token="stale", db=db) is None
+    assert db.query(UserSession).filter(UserSession.token == "stale").count() == 1
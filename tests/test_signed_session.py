@@ -0,0 +1,89 @@
+"""署名付きステートレスセッションのテスト"""
+from datetime import timedelta
+
+from app.config import settings
+from app.dependencies import AuthenticationRequired, get_current_user
+from app.models.revoked_session import RevokedSession
+from app.models.session import UserSession
+from app.services.session_reaper import SessionReaper
+from app.services.signed_session import SignedSessionService
+from app.utils.time import get_now_naive
+
+
+def test_issue_and_verify(test_user):
+    """発行したトークンを検証でき、改ざん・期限切れは拒否される"""
+    service = SignedSessionService("test-secret")
+    token = service.issue(test_user.id)
+
+    claims = service.verify(token)
+    assert claims.user_id == test_user.id
+
+    assert service.verify(token + "x") is None
+    assert SignedSessionService("other-secret").verify(token) is None
+
+    expired = service.issue(test_user.id, get_now_naive() - timedelta(seconds=1))
+    assert service.verify(expired) is None
+
+
+def test_revoke_and_sync_denylist(db, test_user):
+    """失効したトークンは拒否され、他プロセスにもテーブル経由で共有される"""
+    service = SignedSessionService("test-secret")
+    token = service.issue(test_user.id)
+    service.revoke(db, token)
+    assert service.verify(token) is None
+
+    # 別プロセス相当のインスタンスは同期後に拒否する
+    other = SignedSessionService("test-secret")
+    assert other.verify(token) is not None
+    assert other.sync_denylist(db) == 1
+    assert other.verify(token) is None
+
+    # 失効記録は user_sessions に保存しない（db モードのトークンとして通らない）
+    assert db.query(UserSession).count() == 0
+    assert db.query(RevokedSession).one().user_id == test_user.id
+
+
+def test_expired_revocations_purged(db, test_user):
+    """期限切れの失効記録は SessionReaper が削除する"""
+    service = SignedSessionService("test-secret")
+    service.revoke(db, service.issue(test_user.id, get_now_naive() + timedelta(seconds=1)))
+    service.revoke(db, service.issue(test_user.id))
+
+    deleted = SessionReaper.purge_expired(db, now=get_now_naive() + timedelta(minutes=1))
+    assert deleted == 1
+    assert db.query(RevokedSession).count() == 1
+
+
+def test_signed_mode_skips_session_lookup(db, test_user, monkeypatch, count_queries):
+    """signed モードでは user_sessions を参照せずに認証する"""
+    from app.services.signed_session import signed_sessions
+
+    monkeypatch.setattr(settings, "SESSION_MODE", "signed")
+    token = signed_sessions.issue(test_user.id)
+
+    with count_queries() as statements:
+        user = get_current_user(request=None, session_token=token, db=db)
+
+    assert user.id == test_user.id
+    assert not any("user_sessions" in s for s in statements)
+
+
+def test_signed_mode_cached_user_without_queries(db, test_user, monkeypatch, count_queries):
+    """signed モードではキャッシュ済みのユーザーをDBアクセスなしで返し、失効後は拒否する"""
+    import pytest
+    from app.services.signed_session import signed_sessions
+
+    monkeypatch.setattr(settings, "SESSION_MODE", "signed")
+    token = signed_sessions.issue(test_user.id)
+    user_id = test_user.id
+    assert get_current_user(request=None, session_token=token, db=db).id == user_id
+
+    with count_queries() as statements:
+        user = get_current_user(request=None, session_token=token, db=db)
+
+    assert user.id == user_id
+    assert statements == []
+
+    signed_sessions.revoke(db, token)
+    with pytest.raises(AuthenticationRequired):
+        get_current_user(request=None, session_token=token, db=db)
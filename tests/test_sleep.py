@@ -40,3 +40,74 @@ async def test_start_sleep_while_ongoing(client, db, test_user, test_baby):
 
     finally:
         app.dependency_overrides.clear()
+
+
+def test_duration_seconds_maintained_on_write(db, test_user, test_baby):
+    """睡眠時間（秒）は終了・更新時に保存され、SQL の SUM で集計できる"""
+    from sqlalchemy import func
+
+    start = get_now_naive() - timedelta(hours=3)
+    sleep = Sleep(baby_id=test_baby.id, user_id=test_user.id, start_time=start)
+    db.add(sleep)
+    db.commit()
+    assert sleep.duration_seconds is None
+
+    sleep.end_time = start + timedelta(minutes=90)
+    db.commit()
+    assert sleep.duration_seconds == 90 * 60
+    assert sleep.duration_minutes == 90
+
+    sleep.start_time = start + timedelta(minutes=30)
+    db.add(Sleep(baby_id=test_baby.id, user_id=test_user.id,
+                 start_time=start, end_time=start + timedelta(minutes=20)))
+    db.commit()
+    assert sleep.duration_seconds == 60 * 60
+
+    total = db.query(func.sum(Sleep.duration_seconds)).filter(Sleep.baby_id == test_baby.id).scalar()
+    assert total == 80 * 60
+
+
+@pytest.mark.asyncio
+async def test_start_sleep_single_statement(client, db, test_user, test_baby):
+    """睡眠開始は1件だけ作成され、2回目は400になる（継続中の睡眠は部分一意インデックスで制限）"""
+    from app.models.session import UserSession
+
+    db.add(UserSession(user_id=test_user.id, token="sleep_start_token", expires_at=UserSession.default_expires_at()))
+    db.commit()
+    client.cookies.set("session_token", "sleep_start_token")
+    csrf_token = (await client.get("/api/health")).cookies.get("csrf_token") or client.cookies.get("csrf_token")
+    client.cookies.set("csrf_token", csrf_token)
+    headers = {"X-CSRF-Token": csrf_token}
+
+    response = await client.post(f"/api/sleeps/start?baby_id={test_baby.id}", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["end_time"] is None and data["is_ongoing"] is True
+
+    response = await client.post(f"/api/sleeps/start?baby_id={test_baby.id}", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "既に睡眠が継続中です"
+    assert db.query(Sleep).filter(Sleep.baby_id == test_baby.id, Sleep.end_time.is_(None)).count() == 1
+
+
+@pytest.mark.parametrize("on_conflict", [True, False])
+def test_insert_or_ignore_ongoing_sleep(db, test_user, test_baby, monkeypatch, on_conflict):
+    """ON CONFLICT を使えない場合もセーブポイント経由で同じ結果になる"""
+    from sqlalchemy.exc import IntegrityError
+    from app.utils import sql
+
+    monkeypatch.setattr(sql, "supports_on_conflict", lambda db: on_conflict)
+    values = {"baby_id": test_baby.id, "user_id": test_user.id, "start_time": get_now_naive()}
+    kwargs = dict(index_elements=["baby_id"], index_where=Sleep.end_time.is_(None))
+
+    row = sql.insert_or_ignore(db, Sleep, values, **kwargs)
+    assert row is not None and row.baby_id == test_baby.id and row.end_time is None
+    assert sql.insert_or_ignore(db, Sleep, values, **kwargs) is None
+    db.commit()
+    assert db.query(Sleep).filter(Sleep.baby_id == test_baby.id).count() == 1
+
+    # ORM 経由の追加も一意インデックスで拒否される
+    db.add(Sleep(baby_id=test_baby.id, user_id=test_user.id, start_time=get_now_naive()))
+    with pytest.raises(IntegrityError):
+        db.commit()
+    db.rollback()
@@ -0,0 +1,73 @@
+"""時間帯ヒストグラムAPIのテスト"""
+from datetime import datetime, time, timedelta
+
+import pytest
+
+from app.models.diaper import Diaper, DiaperType
+from app.models.feeding import Feeding, FeedingType
+from app.services import statistics_service
+from app.services.statistics_service import StatisticsService
+from app.utils.time import get_now_naive
+
+
+def _add_feedings(db, test_user, test_baby):
+    yesterday = get_now_naive() - timedelta(days=1)
+    for hour, minute in [(3, 10), (3, 40), (15, 0), (23, 59)]:
+        db.add(Feeding(baby_id=test_baby.id, user_id=test_user.id, feeding_type=FeedingType.BREAST,
+                       feeding_time=yesterday.replace(hour=hour, minute=minute)))
+    # 期間外
+    db.add(Feeding(baby_id=test_baby.id, user_id=test_user.id, feeding_type=FeedingType.BREAST,
+                   feeding_time=get_now_naive() - timedelta(days=30)))
+    db.commit()
+
+
+@pytest.mark.asyncio
+async def test_histogram_api_buckets(auth_client, db, test_user, test_baby):
+    """期間内の記録を時間帯ごとに数え、件数の配列のみ返す"""
+    _add_feedings(db, test_user, test_baby)
+
+    response = await auth_client.get(f"/api/stats/histogram?type=feeding&days=7&baby_id={test_baby.id}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["slots"] == 24 and len(data["buckets"]) == 24
+    assert data["buckets"][3] == 2 and data["buckets"][15] == 1 and data["buckets"][23] == 1
+    assert sum(data["buckets"]) == 4
+
+    data = (await auth_client.get(f"/api/stats/histogram?type=feeding&slots=48&baby_id={test_baby.id}")).json()
+    assert data["buckets"][6] == 1 and data["buckets"][7] == 1 and data["buckets"][47] == 1
+
+    response = await auth_client.get(f"/api/stats/histogram?type=feeding&slots=12&baby_id={test_baby.id}")
+    assert response.status_code == 400
+
+    data = (await auth_client.get(f"/api/stats/histogram?type=diaper&baby_id={test_baby.id}")).json()
+    assert data["buckets"] == [0] * 24
+
+
+def test_histogram_without_numpy(db, test_user, test_baby, monkeypatch):
+    """NumPy の bincount と、NumPy がない環境の Python 集計が同じ結果になる"""
+    pytest.importorskip("numpy")
+    assert statistics_service.np is not None
+    _add_feedings(db, test_user, test_baby)
+    db.add(Diaper(baby_id=test_baby.id, user_id=test_user.id, diaper_type=DiaperType.WET,
+                  change_time=get_now_naive().replace(hour=8, minute=0)))
+    db.commit()
+    expected = StatisticsService.get_hourly_histogram(db, test_baby.id, "feeding", 7, 48)
+
+    monkeypatch.setattr(statistics_service, "np", None)
+    assert StatisticsService.get_hourly_histogram(db, test_baby.id, "feeding", 7, 48) == expected
+    assert StatisticsService.get_hourly_histogram(db, test_baby.id, "diaper", 7)[8] == 1
+
+
+def test_histogram_window_is_calendar_days(db, test_user, test_baby):
+    """期間はダッシュボードと同じ暦日単位（初日の0時以降のみ数える）"""
+    first_day = StatisticsService.window_start(7)
+    assert first_day == get_now_naive().date() - timedelta(days=6)
+    # 期間初日の0時ちょうどと、その直前（前日の23:59）
+    for at in (datetime.combine(first_day, time.min), datetime.combine(first_day - timedelta(days=1), time(23, 59))):
+        db.add(Feeding(baby_id=test_baby.id, user_id=test_user.id, feeding_type=FeedingType.BREAST, feeding_time=at))
+    db.commit()
+
+    buckets = StatisticsService.get_hourly_histogram(db, test_baby.id, "feeding", 7)
+    assert buckets[0] == 1 and buckets[23] == 0
+    daily = StatisticsService.get_feeding_stats_by_baby(db, [test_baby.id], 7)[test_baby.id]
+    assert sum(buckets) == daily["count"] == 1
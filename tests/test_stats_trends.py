@@ -0,0 +1,97 @@
+"""期間比較（今期・前期）統計のテスト"""
+from datetime import timedelta
+
+import pytest
+
+from app.models.diaper import Diaper, DiaperType
+from app.models.feeding import Feeding, FeedingType
+from app.models.sleep import Sleep
+from app.services.statistics_service import StatisticsService
+from app.utils.time import get_now_naive
+
+
+def _add_records(db, test_user, test_baby):
+    now = get_now_naive()
+    # 今期（直近7日）: 授乳3回、前期（8〜14日前）: 授乳1回、期間外: 1回
+    for days_ago, amount in [(1, 100), (2, 140), (3, None), (10, 80), (20, 200)]:
+        db.add(Feeding(baby_id=test_baby.id, user_id=test_user.id, feeding_type=FeedingType.BOTTLE,
+                       feeding_time=now - timedelta(days=days_ago), amount_ml=amount))
+    for days_ago, diaper_type in [(1, DiaperType.WET), (2, DiaperType.DIRTY), (9, DiaperType.WET),
+                                  (9, DiaperType.WET), (10, DiaperType.BOTH)]:
+        db.add(Diaper(baby_id=test_baby.id, user_id=test_user.id, diaper_type=diaper_type,
+                      change_time=now - timedelta(days=days_ago)))
+    start = now - timedelta(days=9)
+    db.add(Sleep(baby_id=test_baby.id, user_id=test_user.id, start_time=start, end_time=start + timedelta(hours=3)))
+    start = now - timedelta(days=1)
+    db.add(Sleep(baby_id=test_baby.id, user_id=test_user.id, start_time=start, end_time=start + timedelta(hours=2)))
+    db.add(Sleep(baby_id=test_baby.id, user_id=test_user.id, start_time=now - timedelta(hours=1)))
+    db.commit()
+
+
+def test_trends_current_previous_and_delta(db, test_user, test_baby, count_queries):
+    """今期・前期と差分を記録タイプごとに1クエリで集計する"""
+    _add_records(db, test_user, test_baby)
+    baby_id = test_baby.id
+
+    with count_queries() as statements:
+        feeding = StatisticsService.get_feeding_trend(db, baby_id)
+        sleep = StatisticsService.get_sleep_trend(db, baby_id)
+        diaper = StatisticsService.get_diaper_trend(db, baby_id)
+    assert len(statements) == 3
+
+    assert feeding["current"] == {"count": 3, "avg_amount_ml": 120}
+    assert feeding["previous"] == {"count": 1, "avg_amount_ml": 80}
+    assert feeding["delta"] == {"count": 2, "avg_amount_ml": 40}
+
+    # 今期は完了した2時間と継続中の1時間
+    assert sleep["current"] == {"count": 2, "total_hours": 3, "avg_hours": 1.5}
+    assert sleep["previous"] == {"count": 1, "total_hours": 3, "avg_hours": 3}
+    assert sleep["delta"] == {"count": 1, "total_hours": 0, "avg_hours": -1.5}
+
+    assert diaper["current"] == {"count": 2, "wet": 1, "dirty": 1, "both": 0}
+    assert diaper["previous"] == {"count": 3, "wet": 2, "dirty": 0, "both": 1}
+    assert diaper["delta"]["count"] == -1
+
+
+@pytest.mark.asyncio
+async def test_trends_api(auth_client, test_baby):
+    """期間比較API（記録がなければすべて0）"""
+    response = await auth_client.get(f"/api/stats/trends?days=7&baby_id={test_baby.id}")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["days"] == 7
+    assert data["feeding"]["current"] == {"count": 0, "avg_amount_ml": 0}
+    assert data["sleep"]["delta"]["count"] == 0
+    assert data["diaper"]["previous"]["count"] == 0
+
+    response = await auth_client.get(f"/api/stats/trends?days=0&baby_id={test_baby.id}")
+    assert response.status_code == 400
+
+
+def test_trend_current_matches_dashboard_stats(db, test_user, test_baby):
+    """今期の値はダッシュボード統計（日次集計）と同じ期間・同じ値になる"""
+    from datetime import datetime, time
+
+    _add_records(db, test_user, test_baby)
+    today = get_now_naive().date()
+    # 期間の境界の前後（暦日 7 日の初日の0時と、その直前）
+    for at in (datetime.combine(today - timedelta(days=6), time.min),
+               datetime.combine(today - timedelta(days=7), time(23, 59))):
+        db.add(Feeding(baby_id=test_baby.id, user_id=test_user.id, feeding_type=FeedingType.BOTTLE,
+                       feeding_time=at, amount_ml=60))
+        db.add(Diaper(baby_id=test_baby.id, user_id=test_user.id, diaper_type=DiaperType.DIRTY, change_time=at))
+        db.add(Sleep(baby_id=test_baby.id, user_id=test_user.id, start_time=at, end_time=at + timedelta(minutes=45)))
+    db.commit()
+    baby_id = test_baby.id
+
+    for days in (1, 7, 14):
+        feeding = StatisticsService.get_feeding_stats_by_baby(db, [baby_id], days)[baby_id]
+        sleep = StatisticsService.get_sleep_stats_by_baby(db, [baby_id], days)[baby_id]
+        diaper = StatisticsService.get_diaper_stats_by_baby(db, [baby_id], days)[baby_id]
+
+        feeding_trend = StatisticsService.get_feeding_trend(db, baby_id, days)["current"]
+        assert feeding_trend == {k: feeding[k] for k in ("count", "avg_amount_ml")}
+        sleep_trend = StatisticsService.get_sleep_trend(db, baby_id, days)["current"]
+        assert sleep_trend == {k: sleep[k] for k in ("count", "total_hours", "avg_hours")}
+        diaper_trend = StatisticsService.get_diaper_trend(db, baby_id, days)["current"]
+        assert diaper_trend == {"count": diaper["count"], **diaper["by_type"]}
@@ -0,0 +1,53 @@
+"""閲覧可能な赤ちゃん一覧（キャッシュ・ETag）のテスト"""
+import pytest
+
+from app.models.baby import Baby
+from app.models.family_user import FamilyUser
+from app.models.user import User
+from app.services.permission_service import PermissionService
+
+
+@pytest.mark.asyncio
+async def test_viewable_babies_etag_and_invalidation(auth_client, db, test_baby):
+    """ETag が一致すれば 304、赤ちゃんの追加で内容と ETag が変わる"""
+    response = await auth_client.get("/api/babies/viewable")
+    assert response.status_code == 200
+    assert [b["name"] for b in response.json()["babies"]] == [test_baby.name]
+    etag = response.headers["etag"]
+
+    response = await auth_client.get("/api/babies/viewable", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    db.add(Baby(family_id=test_baby.family_id, name="Second"))
+    db.commit()
+
+    response = await auth_client.get("/api/babies/viewable", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert [b["name"] for b in response.json()["babies"]] == [test_baby.name, "Second"]
+
+
+@pytest.mark.asyncio
+async def test_viewable_babies_follows_permission_updates(client, login, db, test_baby):
+    """メンバーの一覧は権限更新で変わる"""
+    member = User(username="viewer", hashed_password="hashed_password")
+    db.add(member)
+    db.commit()
+    db.add(FamilyUser(family_id=test_baby.family_id, user_id=member.id, role="member"))
+    db.commit()
+    member_id, baby_id, family_id = member.id, test_baby.id, test_baby.family_id
+    await login(member_id)
+
+    response = await client.get("/api/babies/viewable")
+    assert response.json()["babies"] == []
+
+    PermissionService.update_permissions(db, member_id, baby_id, {"basic_info": True, "feeding": True}, family_id)
+
+    response = await client.get("/api/babies/viewable")
+    assert [b["id"] for b in response.json()["babies"]] == [baby_id]
+
+    response = await client.get("/api/feedings", params={"baby_id": baby_id})
+    assert [b["id"] for b in response.json()["viewable_babies"]] == [baby_id]
+
+    response = await client.get("/api/feedings", params={"baby_id": baby_id, "include_viewable": "false"})
+    assert response.json()["viewable_babies"] is None